@@ -1,41 +1,185 @@
+from django import forms
 from django.contrib import admin
-from .models import Exam, Question, Choice, Answer, Submission
+from django.db.models import Avg, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Exam, Question, Choice, Answer, Submission, GradingEvent
+from .services.audit import unpack_scores
+from .services.mcq import free_ordinals, refresh_correct_masks
+from .utils.pagination import EstimatedCountPaginator
 
 admin.site.site_header = "Acad AI Assessment Admin"
 admin.site.index_title = "Welcome to the Acad AI"
 
 
+def bump_exam_versions(exam_ids):
+    """ Invalidate the cached snapshots and ETags of exams whose questions were edited here. """
+    for exam_id in set(exam_ids):
+        Exam(pk=exam_id).bump_version()
+
+
 # Register models.
 @admin.register(Exam)
 class ExamAdmin(admin.ModelAdmin):
-    list_display = ('title', 'course', 'duration', 'start_at', 'end_at', 'created_by', 'created_at')
+    list_display = (
+        'title', 'course', 'duration', 'start_at', 'end_at', 'created_by', 'created_at',
+        'submission_count', 'graded_count', 'average_score',
+    )
+    list_select_related = ('created_by',)
     search_fields = ('title', 'course')
-    list_filter = ('course', 'start_at', 'end_at', 'created_at')    
-    
+    list_filter = ('course', 'start_at', 'end_at', 'created_at')
+    raw_id_fields = ('created_by',)
+
+    def get_queryset(self, request):
+        # correlated subqueries: evaluated only for the exams on the current page,
+        # using the submission exam_id index, instead of grouping the whole submissions table
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            submissions = Submission.objects.filter(exam=OuterRef('pk')).order_by().values('exam')
+            graded = submissions.filter(status=Submission.Status.GRADED)
+            queryset = queryset.annotate(
+                submission_count=Coalesce(Subquery(submissions.annotate(n=Count('pk')).values('n')), 0),
+                graded_count=Coalesce(Subquery(graded.annotate(n=Count('pk')).values('n')), 0),
+                average_score=Subquery(graded.annotate(avg=Avg('score')).values('avg')),
+            )
+        return queryset
+
+    @admin.display(description='Submissions', ordering='submission_count')
+    def submission_count(self, obj):
+        return obj.submission_count
+
+    @admin.display(description='Graded', ordering='graded_count')
+    def graded_count(self, obj):
+        return obj.graded_count
+
+    @admin.display(description='Avg score', ordering='average_score')
+    def average_score(self, obj):
+        return round(obj.average_score, 2) if obj.average_score is not None else None
+
+    def delete_queryset(self, request, queryset):
+        # a queryset delete skips Exam.delete(), which drops the cached metadata
+        exams = list(queryset.only('pk'))
+        super().delete_queryset(request, queryset)
+        for exam in exams:
+            exam.forget_meta()
+
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
-    list_display = ('exam', 'type', 'max_score', 'created_at')
+    list_display = ('exam', 'position', 'type', 'allow_multiple', 'max_score', 'created_at')
+    list_select_related = ('exam',)
     search_fields = ('text',)
-    list_filter = ('type', 'created_at')    
+    list_filter = ('type', 'created_at')
+    raw_id_fields = ('exam',)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # moved to another exam: both change
+        bump_exam_versions([obj.exam_id, form.initial.get('exam', obj.exam_id)])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_exam_versions([obj.exam_id])
+
+    def delete_queryset(self, request, queryset):
+        exam_ids = list(queryset.values_list('exam_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        bump_exam_versions(exam_ids)
+
+
+class ChoiceAdminForm(forms.ModelForm):
+    class Meta:
+        model = Choice
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        question = cleaned_data.get('question')
+        if self.instance.pk is None and question is not None:
+            # a new choice takes the lowest free ordinal, see services.mcq.free_ordinals
+            taken = set(question.choices.values_list('ordinal', flat=True))
+            free = free_ordinals({question.id: taken})[question.id]
+            if not free:
+                raise forms.ValidationError(
+                    "This question has no free choice slot left; deleted choices still "
+                    "selected in saved answers keep theirs."
+                )
+            self.instance.ordinal = free[0]
+        return cleaned_data
 
 
 @admin.register(Choice)
 class ChoiceAdmin(admin.ModelAdmin):
-    list_display = ('question', 'text', 'is_correct')
+    form = ChoiceAdminForm
+    list_display = ('question', 'ordinal', 'text', 'is_correct')
     search_fields = ('text',)
-    list_filter = ('is_correct',)   
+    list_filter = ('is_correct',)
+    raw_id_fields = ('question',)
+    readonly_fields = ('ordinal',)
+
+    def get_readonly_fields(self, request, obj=None):
+        # the ordinal is the choice's bit within its question's masks
+        return self.readonly_fields + (('question',) if obj else ())
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        refresh_correct_masks([obj.question_id])
+        bump_exam_versions([obj.question.exam_id])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_correct_masks([obj.question_id])
+        bump_exam_versions([obj.question.exam_id])
+
+    def delete_queryset(self, request, queryset):
+        pairs = list(queryset.values_list('question_id', 'question__exam_id').distinct())
+        super().delete_queryset(request, queryset)
+        refresh_correct_masks({question_id for question_id, _ in pairs})
+        bump_exam_versions(exam_id for _, exam_id in pairs)
 
 
 
 @admin.register(Answer)
 class AnswerAdmin(admin.ModelAdmin):
     list_display = ('submission', 'question', 'score', 'created_at')
+    list_select_related = ('submission', 'question')
     search_fields = ('answer_text',)
     list_filter = ('created_at',)
+    raw_id_fields = ('submission', 'question', 'selected_choice')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 @admin.register(Submission)
 class SubmissionAdmin(admin.ModelAdmin):
-    list_display = ('exam', 'student', 'score', 'started_at', 'submitted_at')
+    list_display = ('exam', 'student', 'status', 'score', 'started_at', 'submitted_at', 'graded_at')
+    list_select_related = ('exam', 'student')
     search_fields = ('student__username', 'student__email')
-    list_filter = ('started_at', 'submitted_at')
\ No newline at end of file
+    list_filter = ('status', 'started_at', 'submitted_at')
+    date_hierarchy = 'submitted_at'
+    raw_id_fields = ('student', 'exam')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(GradingEvent)
+class GradingEventAdmin(admin.ModelAdmin):
+    """ Read-only: the grading history is append-only. """
+    list_display = ('id', 'submission_id', 'exam_id', 'kind', 'grader', 'score', 'created_at')
+    list_filter = ('kind', 'created_at')
+    date_hierarchy = 'created_at'
+    fields = ('submission', 'exam', 'kind', 'grader', 'score', 'per_question', 'created_at')
+    readonly_fields = fields
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='Per-question scores')
+    def per_question(self, obj):
+        return ", ".join(f"Q{question_id}: {score:g}" for question_id, score in unpack_scores(obj.question_ids, obj.scores))
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from settings.PASSWORD_HASH_ITERATIONS.
+
+    Same algorithm name as Django's hasher, so existing hashes keep verifying.
+    Django's check_password() rehashes a password whose iteration count differs
+    from the configured one, so changing the setting migrates users as they log in.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,102 @@
+import gzip
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from acad_core.renderers import ORJSONRenderer, orjson
+from acad_core.utils.compression import brotli, compress
+
+
+VOCABULARY = (
+    "cell nucleus membrane protein enzyme energy light glucose division chromosome tissue "
+    "organ species gene mutation reaction acid base salt solution pressure volume force "
+    "mass velocity current voltage circuit market price demand supply policy trade history "
+    "empire treaty revolution climate river erosion sediment population model theory data"
+).split()
+
+
+def _synthetic_questions(count, choices):
+    rnd = random.Random(42)
+
+    def sentence(words):
+        return " ".join(rnd.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+    questions = []
+    for i in range(count):
+        q_type = "MCQ" if i % 3 else "SHORT"
+        questions.append({
+            "id": i + 1,
+            "text": " ".join(sentence(14) for _ in range(4)) + " Which statement is correct?",
+            "type": q_type,
+            "reference_answer": None if q_type == "MCQ" else sentence(25),
+            "max_score": "2.00",
+            "metadata": {"difficulty": rnd.choice(("easy", "medium", "hard"))},
+            "choices": [
+                {"id": i * choices + k + 1, "text": sentence(10), "is_correct": k == 0}
+                for k in range(choices)
+            ] if q_type == "MCQ" else [],
+            "created_at": "2026-01-03T15:28:00.123000+01:00",
+        })
+    return questions
+
+
+def _timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON rendering and response compression of a large exam payload (default: 500 questions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=int, default=500)
+        parser.add_argument("--choices", type=int, default=4)
+        parser.add_argument("--exam", type=int, help="Benchmark a real exam's admin snapshot instead of synthetic data.")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["exam"]:
+            from acad_core.services.snapshot import build_exam_snapshot
+            elapsed, snapshot = _timeit(lambda: build_exam_snapshot(options["exam"], kind="admin"), 3)
+            data = snapshot["questions"]
+            self.stdout.write(f"Serializing exam {options['exam']} from the database: {elapsed:.2f} ms")
+        else:
+            data = _synthetic_questions(options["questions"], options["choices"])
+
+        repeat = options["repeat"]
+        rows = []
+        stdlib_ms, body = _timeit(lambda: JSONRenderer().render(data), repeat)
+        rows.append(("render: DRF JSONRenderer", stdlib_ms, len(body)))
+        if orjson is not None:
+            fast_ms, fast_body = _timeit(lambda: ORJSONRenderer().render(data), repeat)
+            rows.append(("render: ORJSONRenderer", fast_ms, len(fast_body)))
+            if fast_body != body:
+                self.stderr.write("warning: orjson output differs from DRF output")
+        else:
+            self.stdout.write("orjson not installed; ORJSONRenderer falls back to DRF's renderer.")
+
+        gzip_ms, gzipped = _timeit(lambda: compress(body, "gzip"), repeat)
+        rows.append(("compress: gzip", gzip_ms, len(gzipped)))
+        if brotli is not None:
+            br_ms, br_body = _timeit(lambda: compress(body, "br"), repeat)
+            rows.append(("compress: brotli", br_ms, len(br_body)))
+        else:
+            self.stdout.write("brotli not installed; only gzip is negotiated.")
+
+        cached = {"gzip": gzipped}
+        reuse_ms, _ = _timeit(lambda: cached["gzip"], repeat)
+        rows.append(("pre-compressed snapshot reuse", reuse_ms, len(gzipped)))
+        if gzip.decompress(gzipped) != body:
+            raise CommandError("gzip round trip does not reproduce the rendered payload.")
+
+        self.stdout.write(f"\nPayload: {len(data)} questions, median of {repeat} runs\n")
+        self.stdout.write(f"{'step':<32}{'ms':>10}{'bytes':>12}")
+        for name, ms, size in rows:
+            self.stdout.write(f"{name:<32}{ms:>10.2f}{size:>12}")
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from acad_core.services import grade_submissions
+from acad_core.services.ingest import submission_log
+
+
+class Command(BaseCommand):
+    help = "Apply submissions queued in the local ingest log (SUBMISSION_INGEST_MODE=log) in batches, then grade them."
+
+    # long-running worker: skip the system checks, they import every URLconf and view
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Records per database transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep draining until interrupted.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between drains with --loop.")
+        parser.add_argument("--no-grade", action="store_true", help="Only persist submissions; grade them later.")
+
+    def handle(self, *args, **options):
+        # graded batch by batch, as each commits
+        on_batch = None if options["no_grade"] else grade_submissions
+        while True:
+            finalized = submission_log.drain(batch_size=options["batch_size"], on_batch=on_batch)
+            if finalized:
+                self.stdout.write(f"Applied {len(finalized)} submission(s).")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
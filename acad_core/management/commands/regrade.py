@@ -0,0 +1,115 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from acad_core.models import Exam, Question, Submission
+from acad_core.services.regrade import grading_fingerprint
+
+
+def _init_worker():
+    # every worker gets its own database connection instead of the parent's socket
+    import django
+    from django.apps import apps
+    from django.db import connections
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def _regrade_chunk(task):
+    from acad_core.services.regrade import regrade_question
+    question_ids, submission_ids = task
+    changed = sum(regrade_question(qid, submission_ids) for qid in question_ids)
+    return submission_ids[0], submission_ids[-1], changed
+
+
+class Command(BaseCommand):
+    help = (
+        "Regrade the answers to changed question(s) of an exam across a process pool. "
+        "Only those answers are rescored; submission totals are patched by the difference. "
+        "Progress is checkpointed, so an interrupted run resumes where it stopped."
+    )
+
+    # long-running worker: skip the system checks, they import every URLconf and view
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", type=int, required=True, help="Exam id.")
+        parser.add_argument(
+            "--question", type=int, action="append", dest="questions",
+            help="Changed question id (repeatable). Defaults to every question of the exam.",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Submissions per chunk.")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+
+    def handle(self, *args, **options):
+        try:
+            exam = Exam.objects.get(pk=options["exam"])
+        except Exam.DoesNotExist:
+            raise CommandError(f"Exam {options['exam']} does not exist.")
+
+        questions = Question.objects.filter(exam=exam).order_by("id")
+        if options["questions"]:
+            questions = questions.filter(id__in=options["questions"])
+            missing = set(options["questions"]) - set(questions.values_list("id", flat=True))
+            if missing:
+                raise CommandError(f"Question(s) {sorted(missing)} do not belong to exam {exam.id}.")
+        question_ids = list(questions.values_list("id", flat=True))
+
+        submission_ids = list(
+            Submission.objects
+            .filter(exam=exam, status=Submission.Status.GRADED)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        size = options["batch_size"]
+        chunks = [submission_ids[i:i + size] for i in range(0, len(submission_ids), size)]
+
+        checkpoint = self._checkpoint_path(exam, questions)
+        done = set()
+        if checkpoint.exists() and not options["restart"]:
+            done = {tuple(r) for r in json.loads(checkpoint.read_text())["done"]}
+            self.stdout.write(f"Resuming from checkpoint: {len(done)} chunk(s) already regraded.")
+        tasks = [(question_ids, chunk) for chunk in chunks if (chunk[0], chunk[-1]) not in done]
+
+        self.stdout.write(
+            f"Regrading {len(question_ids)} question(s) over {len(submission_ids)} graded submission(s) "
+            f"in {len(tasks)} chunk(s) with {options['workers']} worker(s)."
+        )
+
+        changed = 0
+        for first, last, chunk_changed in self._run(tasks, options["workers"]):
+            changed += chunk_changed
+            done.add((first, last))
+            self._save_checkpoint(checkpoint, done)
+
+        checkpoint.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(f"Done. {changed} answer score(s) changed."))
+
+    def _run(self, tasks, workers):
+        if workers <= 1 or len(tasks) <= 1:
+            yield from map(_regrade_chunk, tasks)
+            return
+        from django.db import connections
+        connections.close_all()  # don't hand the parent's connection to forked workers
+        with multiprocessing.Pool(min(workers, len(tasks)), initializer=_init_worker) as pool:
+            yield from pool.imap_unordered(_regrade_chunk, tasks)
+
+    def _checkpoint_path(self, exam, questions):
+        # keyed on the questions' current state, so a later edit never reuses a stale checkpoint
+        state = json.dumps([grading_fingerprint(q) for q in questions], default=str)
+        digest = hashlib.sha1(state.encode()).hexdigest()[:12]
+        directory = Path(settings.REGRADE_CHECKPOINT_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"exam-{exam.id}-{digest}.json"
+
+    def _save_checkpoint(self, path, done):
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"done": sorted(done)}))
+        os.replace(tmp, path)
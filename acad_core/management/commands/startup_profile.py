@@ -0,0 +1,87 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+# what a fresh web worker does before it can answer its first request
+WEB_WORKER_STARTUP = (
+    "from django.core.wsgi import get_wsgi_application\n"
+    "get_wsgi_application()\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a fresh interpreter with `python -X importtime` and report import time per module "
+        "(default: a web worker loading settings, apps and the URLconf)."
+    )
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--module", action="append", default=[],
+            help="Profile importing this module after django.setup() instead of a web worker start. Repeatable.",
+        )
+        parser.add_argument("--limit", type=int, default=25, help="Number of modules to list.")
+        parser.add_argument(
+            "--sort", choices=["cumulative", "self"], default="cumulative",
+            help="cumulative includes the module's own imports; self is the module body alone.",
+        )
+        parser.add_argument("--packages", action="store_true", help="Also total self time per top-level package.")
+
+    def handle(self, *args, **options):
+        if options["module"]:
+            code = "import django\ndjango.setup()\nimport importlib\n" + "".join(
+                f"importlib.import_module({module!r})\n" for module in options["module"]
+            )
+        else:
+            code = WEB_WORKER_STARTUP
+
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "acad_engine.settings")}
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        if proc.returncode:
+            lines = [line for line in proc.stderr.strip().splitlines() if not IMPORT_LINE.match(line)]
+            raise CommandError(f"Startup failed: {lines[-1] if lines else proc.returncode}")
+
+        rows = []  # (module, self_us, cumulative_us)
+        for line in proc.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+
+        total_ms = sum(r[1] for r in rows) / 1000
+        self.stdout.write(
+            f"{len(rows)} modules imported, {total_ms:.1f} ms of import time, {wall_ms:.1f} ms wall clock\n"
+        )
+
+        key = 2 if options["sort"] == "cumulative" else 1
+        self.stdout.write(f"{'self ms':>9}{'cumul. ms':>11}  module")
+        for module, self_us, cumulative_us in sorted(rows, key=lambda r: r[key], reverse=True)[:options["limit"]]:
+            self.stdout.write(f"{self_us / 1000:>9.1f}{cumulative_us / 1000:>11.1f}  {module}")
+
+        if options["packages"]:
+            packages = defaultdict(lambda: [0, 0])
+            for module, self_us, _ in rows:
+                entry = packages[module.split(".")[0]]
+                entry[0] += self_us
+                entry[1] += 1
+            self.stdout.write(f"\n{'self ms':>9}{'modules':>9}  package")
+            for package, (self_us, count) in sorted(packages.items(), key=lambda p: p[1][0], reverse=True)[:options["limit"]]:
+                self.stdout.write(f"{self_us / 1000:>9.1f}{count:>9}  {package}")
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from acad_core.services import grade_submissions
+from acad_core.services.deadlines import next_deadline, recover_ungraded_submissions, sweep_expired_submissions
+
+
+class Command(BaseCommand):
+    help = (
+        "Auto-submit PENDING submissions whose exam ended (end_at, or started_at + duration) "
+        "and grade them in batches per exam, and grade SUBMITTED ones whose grading job was lost. "
+        "With --loop, sleeps until the next deadline."
+    )
+
+    # long-running worker: skip the system checks, they import every URLconf and view
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Run as a scheduler until interrupted.")
+        parser.add_argument(
+            "--max-sleep", type=float, default=60.0,
+            help="Upper bound in seconds between checks with --loop (new exams may start meanwhile).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self._drain_ingest_log()
+            for exam_id, count in sweep_expired_submissions().items():
+                self.stdout.write(f"Exam {exam_id}: auto-submitted and graded {count} submission(s).")
+            recovered = recover_ungraded_submissions()
+            if recovered:
+                self.stdout.write(f"Graded {recovered} submission(s) left ungraded.")
+
+            if not options["loop"]:
+                break
+            wake_at = next_deadline()
+            sleep_for = options["max_sleep"]
+            if wake_at is not None:
+                sleep_for = min(sleep_for, max((wake_at - timezone.now()).total_seconds(), 0.5))
+            time.sleep(sleep_for)
+
+    def _drain_ingest_log(self):
+        # QUEUED submissions are not swept; apply and grade those logged on this host too
+        if getattr(settings, "SUBMISSION_INGEST_MODE", "direct") != "log":
+            return
+        from acad_core.services.ingest import submission_log
+        submission_log.drain(on_batch=grade_submissions)
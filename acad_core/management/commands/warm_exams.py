@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from acad_core.services.warmup import warm_upcoming_exams
+
+
+class Command(BaseCommand):
+    help = (
+        "Warm the caches of exams starting within the next --minutes, or in progress, that are not warm yet: "
+        "question snapshot, exam details, question/choice lookup maps and reference-answer vectors. "
+        "Only useful across processes when the default cache is shared (CACHE_URL)."
+    )
+
+    # long-running worker: skip the system checks, they import every URLconf and view
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--minutes", type=int, default=15, help="How far ahead to look for starting exams.")
+        parser.add_argument("--loop", action="store_true", help="Keep warming until interrupted.")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds between passes with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            warmed = warm_upcoming_exams(options["minutes"])
+            elapsed = time.perf_counter() - started
+            for exam_id, vectors in warmed.items():
+                self.stdout.write(f"Exam {exam_id}: warmed ({vectors} reference vector(s)).")
+            self.stdout.write(f"Warmed {len(warmed)} exam(s) in {elapsed:.2f}s.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .utils.compression import compress, negotiate_encoding
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip response compression, negotiated from Accept-Encoding.
+
+    Only bodies of at least COMPRESSION_MIN_SIZE bytes are compressed. A response
+    carrying a `precompressed` dict ({encoding: bytes}, e.g. from a cached exam
+    snapshot) is served from it without compressing again.
+    Like Django's GZipMiddleware, this must sit above any middleware that reads
+    or changes the response body.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+
+        precompressed = getattr(response, "precompressed", None) or {}
+        if not precompressed and len(response.content) < getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None:
+            return response
+
+        body = precompressed.get(encoding)
+        if body is None:
+            body = compress(response.content, encoding)
+            if len(body) >= len(response.content):
+                return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        # the compressed representation differs byte-wise, so a strong ETag must become weak
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
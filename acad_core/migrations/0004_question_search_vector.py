@@ -0,0 +1,72 @@
+# Generated by Django 6.0 on 2026-10-19 09:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE OR REPLACE FUNCTION acad_core_question_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.text, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.reference_answer, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS acad_core_question_search_vector_trg ON acad_core_question;
+CREATE TRIGGER acad_core_question_search_vector_trg
+    BEFORE INSERT OR UPDATE ON acad_core_question
+    FOR EACH ROW EXECUTE FUNCTION acad_core_question_search_vector();
+
+-- backfill existing rows (the trigger recomputes the vector)
+UPDATE acad_core_question SET text = text;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS acad_core_question_search_vector_trg ON acad_core_question;
+DROP FUNCTION IF EXISTS acad_core_question_search_vector();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    # tsvector triggers only exist on PostgreSQL
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_VECTOR_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_VECTOR_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0003_question_unique_exam_question_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('GRADED', 'Graded'), ('SUBMITTED', 'Submitted')], db_index=True, default='PENDING', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='question_search_vector_gin'),
+        ),
+        migrations.AddConstraint(
+            model_name='exam',
+            constraint=models.UniqueConstraint(fields=('created_by', 'title', 'course'), name='unique_exam_per_creator'),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+# submit could store several answers to one question; keep the latest of each
+DEDUPE_ANSWERS = """
+DELETE FROM acad_core_answer
+WHERE id NOT IN (
+    SELECT max_id FROM (
+        SELECT MAX(id) AS max_id FROM acad_core_answer GROUP BY submission_id, question_id
+    ) AS latest
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0004_question_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='answer',
+            name='acad_core_a_submiss_857b71_idx',
+        ),
+        migrations.RunSQL(DEDUPE_ANSWERS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('submission', 'question'), name='unique_submission_question'),
+        ),
+    ]
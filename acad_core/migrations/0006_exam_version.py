@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0005_answer_unique_submission_question'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0006_exam_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['submitted_at'], name='acad_core_s_submitt_7f3b50_idx'),
+        ),
+    ]
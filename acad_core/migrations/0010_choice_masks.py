@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+# ordinals follow the existing choice order (by id); masks are derived from them
+BACKFILL_MASKS = """
+UPDATE acad_core_choice
+SET ordinal = r.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY question_id ORDER BY id) - 1 AS position
+    FROM acad_core_choice
+) AS r
+WHERE acad_core_choice.id = r.id;
+
+UPDATE acad_core_question
+SET correct_mask = m.mask
+FROM (
+    SELECT question_id, sum(CAST(1 AS BIGINT) << ordinal) AS mask
+    FROM acad_core_choice
+    WHERE is_correct
+    GROUP BY question_id
+) AS m
+WHERE acad_core_question.id = m.question_id;
+
+UPDATE acad_core_answer
+SET selected_mask = CAST(1 AS BIGINT) << c.ordinal
+FROM acad_core_choice AS c
+WHERE c.id = acad_core_answer.selected_choice_id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0009_question_pools'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='selected_mask',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='choice',
+            name='ordinal',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='allow_multiple',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='correct_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_MASKS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='choice',
+            constraint=models.UniqueConstraint(fields=('question', 'ordinal'), name='unique_question_choice_ordinal'),
+        ),
+    ]
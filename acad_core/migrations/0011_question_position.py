@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-19 11:02
+
+from django.db import migrations, models
+
+
+# existing questions keep their current order (by id)
+BACKFILL_POSITIONS = """
+UPDATE acad_core_question
+SET position = r.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY exam_id ORDER BY id) - 1 AS position
+    FROM acad_core_question
+) AS r
+WHERE acad_core_question.id = r.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0010_choice_masks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_POSITIONS, migrations.RunSQL.noop),
+    ]
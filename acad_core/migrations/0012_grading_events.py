@@ -0,0 +1,62 @@
+# Generated by Django 6.0 on 2026-10-19 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# grading events are history: rows may be added, or go with their submission, never change
+APPEND_ONLY_TRIGGER = """
+CREATE OR REPLACE FUNCTION acad_core_gradingevent_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'acad_core_gradingevent is append-only';
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS acad_core_gradingevent_append_only_trg ON acad_core_gradingevent;
+CREATE TRIGGER acad_core_gradingevent_append_only_trg
+    BEFORE UPDATE ON acad_core_gradingevent
+    FOR EACH ROW EXECUTE FUNCTION acad_core_gradingevent_append_only();
+"""
+
+DROP_APPEND_ONLY_TRIGGER = """
+DROP TRIGGER IF EXISTS acad_core_gradingevent_append_only_trg ON acad_core_gradingevent;
+DROP FUNCTION IF EXISTS acad_core_gradingevent_append_only();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(APPEND_ONLY_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_APPEND_ONLY_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0011_question_position'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('GRADE', 'Grade'), ('REGRADE', 'Regrade')], max_length=10)),
+                ('grader', models.CharField(max_length=64)),
+                ('score', models.DecimalField(decimal_places=2, max_digits=8, null=True)),
+                ('question_ids', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('exam', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='grading_events', to='acad_core.exam')),
+                ('submission', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='grading_events', to='acad_core.submission')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['submission', 'created_at'], include=('kind', 'score'), name='grading_event_submission_idx'), models.Index(fields=['exam', 'created_at'], name='grading_event_exam_idx')],
+            },
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0012_grading_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('selected_mask', models.BigIntegerField(blank=True, null=True)),
+                ('answer_text', models.TextField(blank=True, null=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='drafts', to='acad_core.question')),
+                ('selected_choice', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='acad_core.choice')),
+                ('submission', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='drafts', to='acad_core.submission')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('submission', 'question'), name='unique_draft_submission_question')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acad_core', '0013_answer_drafts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('GRADED', 'Graded'), ('SUBMITTED', 'Submitted'), ('QUEUED', 'Queued')], db_index=True, default='PENDING', max_length=20),
+        ),
+    ]
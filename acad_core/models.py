@@ -32,6 +32,9 @@ class Exam(models.Model):
     end_at = models.DateTimeField(null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_exams')
     created_at = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=1, editable=False)  # bumped on any change to the exam or its questions
+    # draw this many questions per student (stratified by type and metadata.difficulty); empty = all
+    questions_per_paper = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         indexes = [
@@ -47,6 +50,44 @@ class Exam(models.Model):
 
     def __str__(self):
         return f"{self.title}_course_{self.course}"
+
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            previous = self.__dict__.get('version')
+            # incremented in the UPDATE itself, so a stale instance never writes an older version back
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            if bump:
+                if previous is None:
+                    del self.__dict__['version']
+                else:
+                    self.version = previous
+            raise
+        if bump:
+            # left deferred: read back on first access, so a save that never reads it costs one query
+            del self.__dict__['version']
+        self.forget_meta()
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        Exam(pk=pk).forget_meta()
+        return result
+
+    def forget_meta(self):
+        """ Drop the cached owner/window used by permission checks (see services.snapshot.get_exam_meta). """
+        from .services.snapshot import forget_exam_meta
+        forget_exam_meta(self.pk)
+
+    def bump_version(self):
+        """ Invalidate version-keyed representations (ETags, cached snapshots) of this exam. """
+        Exam.objects.filter(pk=self.pk).update(version=models.F('version') + 1)
+        self.forget_meta()
     
 
 
@@ -63,12 +104,23 @@ class Question(models.Model):
     reference_answer = models.TextField(null=True, blank=True)
     max_score = models.DecimalField(max_digits=5, decimal_places=2, default=1.0)
     metadata = models.JSONField(default=dict, blank=True)
+    # MCQ: several choices may be selected, scored with partial credit
+    allow_multiple = models.BooleanField(default=False)
+    # MCQ: bit i set when the choice with ordinal i is correct (see services.mcq.refresh_correct_masks)
+    correct_mask = models.BigIntegerField(default=0, editable=False)
+    # order within the exam (admin listing, student snapshots and papers); ties fall back to id
+    position = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # text + reference_answer tsvector, maintained by a database trigger (see migration 0004)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=['exam', 'type']),
+            # exam order, for keyset paging of questions (services.papers.page_exam_questions)
+            models.Index(fields=['exam', 'position', 'id'], name='question_exam_position_idx'),
             GinIndex(fields=['text'], name='question_text_gin', opclasses=['gin_trgm_ops']), 
+            GinIndex(fields=['search_vector'], name='question_search_vector_gin'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -88,6 +140,15 @@ class Choice(models.Model):
     question = models.ForeignKey(Question, related_name='choices', on_delete=models.CASCADE)
     text = models.CharField(max_length=1024)
     is_correct = models.BooleanField(default=False, db_index=True)
+    # position within the question, 0-62: the choice's bit in correct_mask / selected_mask
+    ordinal = models.PositiveSmallIntegerField(default=0)
+
+    MAX_PER_QUESTION = 63
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['question', 'ordinal'], name='unique_question_choice_ordinal')
+        ]
 
     def __str__(self):
         return f"Choice {self.pk} for Q{self.question_id}"
@@ -101,6 +162,8 @@ class Submission(models.Model):
         PENDING = "PENDING", "Pending"
         GRADED = "GRADED", "Graded"
         SUBMITTED = "SUBMITTED", "Submitted"
+        # claimed from the ingest log by the drainer (SUBMISSION_INGEST_MODE=log), answers not applied yet
+        QUEUED = "QUEUED", "Queued"
 
     student = models.ForeignKey(User, related_name='submissions', on_delete=models.CASCADE, db_index=True)
     exam = models.ForeignKey(Exam, related_name='submissions', on_delete=models.CASCADE, db_index=True)
@@ -110,6 +173,7 @@ class Submission(models.Model):
     score = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
     graded_at = models.DateTimeField(null=True, blank=True)
     grading_details = models.JSONField(default=dict, blank=True)  # per-question breakdown, grader metadata
+    question_ids = models.JSONField(null=True, blank=True)  # the student's paper when the exam draws from a pool
 
     class Meta:
         # Prevent duplicate submissions by same student to same exam (tunable)
@@ -119,10 +183,12 @@ class Submission(models.Model):
         indexes = [
             models.Index(fields=['student', 'exam']),
             models.Index(fields=['status', 'graded_at']),
+            models.Index(fields=['submitted_at']),  # admin date_hierarchy
         ]
 
     def __str__(self):
-        return f"Submission {self.pk} by {self.student.username} for {self.exam.title}"
+        # ids only: no student/exam lookups when listed in the admin
+        return f"Submission {self.pk} (student {self.student_id}, exam {self.exam_id})"
     
     
 
@@ -131,15 +197,75 @@ class Answer(models.Model):
     submission = models.ForeignKey(Submission, related_name='answers', on_delete=models.CASCADE)
     question = models.ForeignKey(Question, related_name='answers', on_delete=models.CASCADE)
     selected_choice = models.ForeignKey(Choice, null=True, blank=True, on_delete=models.SET_NULL)
+    # bit i set when the choice with ordinal i is selected; selected_choice is kept for single selections
+    selected_mask = models.BigIntegerField(null=True, blank=True)
     answer_text = models.TextField(null=True, blank=True)
     score = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
     feedback = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # one answer per question; also the conflict target when drafts and final answers are saved
+        constraints = [
+            models.UniqueConstraint(fields=['submission', 'question'], name='unique_submission_question')
+        ]
+
+    def __str__(self):
+        return f"Ans {self.pk} for Submission {self.submission_id}"
+
+
+
+
+class AnswerDraft(models.Model):
+    """
+    An autosaved answer of a PENDING submission. Drafts become Answer rows only when the
+    submission is finalized, in that transaction (see services.autosave), so a late
+    autosave can't overwrite the answers of a submitted or graded exam.
+    """
+    # covered by the unique constraint
+    submission = models.ForeignKey(Submission, related_name='drafts', on_delete=models.CASCADE, db_index=False)
+    question = models.ForeignKey(Question, related_name='drafts', on_delete=models.CASCADE)
+    selected_choice = models.ForeignKey(Choice, null=True, blank=True, on_delete=models.SET_NULL)
+    selected_mask = models.BigIntegerField(null=True, blank=True)
+    answer_text = models.TextField(null=True, blank=True)
+
+    class Meta:
+        # one draft per question; the conflict target of autosave upserts
+        constraints = [
+            models.UniqueConstraint(fields=['submission', 'question'], name='unique_draft_submission_question')
+        ]
+
+    def __str__(self):
+        return f"Draft {self.pk} for Submission {self.submission_id}"
+
+
+
+
+class GradingEvent(models.Model):
+    """
+    Append-only history of a submission's gradings and regrades (grading_details only keeps
+    the latest). Per-question scores are packed into two aligned arrays, see services.audit.
+    """
+    class Kinds(models.TextChoices):
+        GRADE = "GRADE", "Grade"
+        REGRADE = "REGRADE", "Regrade"
+
+    submission = models.ForeignKey(Submission, related_name='grading_events', on_delete=models.CASCADE, db_index=False)
+    # denormalized so exam-wide audits don't join submissions
+    exam = models.ForeignKey(Exam, related_name='grading_events', on_delete=models.CASCADE, db_index=False)
+    kind = models.CharField(max_length=10, choices=Kinds.choices)
+    grader = models.CharField(max_length=64)  # "name/version"
+    score = models.DecimalField(max_digits=8, decimal_places=2, null=True)  # submission total afterwards
+    question_ids = models.BinaryField()  # big-endian int64 per question
+    scores = models.BinaryField()  # big-endian int32 per question, in hundredths
+    created_at = models.DateTimeField(auto_now_add=True)
+
     class Meta:
         indexes = [
-            models.Index(fields=['submission', 'question']),
+            # a submission's history is listed from the index alone
+            models.Index(fields=['submission', 'created_at'], include=['kind', 'score'], name='grading_event_submission_idx'),
+            models.Index(fields=['exam', 'created_at'], name='grading_event_exam_idx'),
         ]
 
     def __str__(self):
-        return f"Ans {self.pk} for Submission {self.submission_id}"
\ No newline at end of file
+        return f"{self.kind} of Submission {self.submission_id} at {self.created_at:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,55 @@
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional dependency, fall back to the stdlib json path
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed.
+    Output matches DRF's compact JSON: datetimes, decimals, UUIDs and lazy strings
+    go through DRF's encoder, so only the serialization loop gets faster.
+    Indented output (?format=json; indent=4, browsable API) uses the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return render_json(data)
+
+
+class ORJSONParser(JSONParser):
+    """ JSONParser backed by orjson when it is installed. """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+_default = encoders.JSONEncoder().default
+
+
+def render_json(data):
+    """ Render `data` the way the API renderer does; used for cached snapshot bodies. """
+    if orjson is None:
+        return JSONRenderer().render(data)
+    body = orjson.dumps(
+        data,
+        default=_default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+    # same JavaScript-safe escaping as DRF's JSONRenderer
+    if b'\xe2\x80\xa8' in body or b'\xe2\x80\xa9' in body:
+        body = body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return body
@@ -6,7 +6,11 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.validators import validate_email
 from datetime import timedelta
 import uuid
-from .utils.helper import normalize_text
+from .utils.helper import normalize_text, users_by_email
+from .utils.permissions import check_exam_window
+from .services.mcq import choice_mask, free_ordinals, refresh_correct_masks
+from .services.ingest import is_logged
+from .services.rubric import compile_rubric
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
@@ -27,7 +31,7 @@ class RegisterSerializer(serializers.Serializer):
 
     def validate_email(self, value):
         validate_email(value)
-        if User.objects.filter(email__iexact=value).exists():
+        if users_by_email(value).exists():
             raise serializers.ValidationError("A user with that email already exists")
         return value.lower()
     
@@ -65,6 +69,7 @@ class LoginSerializer(serializers.Serializer):
 class LoginResponseSerializer(serializers.Serializer):
     token = serializers.CharField()
     expires_in_hours = serializers.IntegerField()
+    expires_at = serializers.DateTimeField()
 
 
 
@@ -79,7 +84,9 @@ class ExamCreateSerializer(serializers.ModelSerializer):
             "metadata",
             "start_at",
             "end_at",
+            "questions_per_paper",
         ]
+        extra_kwargs = {"questions_per_paper": {"min_value": 1}}
 
     def validate(self, attrs):
         user = self.context["request"].user
@@ -118,6 +125,107 @@ class QuestionChoiceSerializer(serializers.ModelSerializer):
 
 
 
+def validate_choice_count(q_type, choices, allow_multiple=False):
+    if q_type == Question.Types.MCQ and len(choices) > Choice.MAX_PER_QUESTION:
+        raise serializers.ValidationError(f"MCQ questions can have at most {Choice.MAX_PER_QUESTION} choices.")
+    if q_type != Question.Types.MCQ and allow_multiple:
+        raise serializers.ValidationError("Only MCQ questions can allow multiple choices.")
+
+
+
+def validate_question_metadata(value):
+    # a rubric is compiled when saved, so a bad regex is reported here instead of at grading time
+    rubric = (value or {}).get("rubric") if isinstance(value, dict) else None
+    if rubric:
+        try:
+            compile_rubric(rubric)
+        except (ValueError, TypeError, AttributeError) as exc:
+            raise serializers.ValidationError(f"Invalid rubric: {exc}")
+    return value
+
+
+
+def _choice_is_correct(item, existing):
+    if item.get("is_correct") is not None:
+        return item["is_correct"]
+    return existing[item["id"]].is_correct if item.get("id") is not None else False
+
+
+def resolve_choices(question, incoming):
+    """
+    A question's new choice list as unsaved Choices, checked against its current choices:
+    entries with an id keep that choice (omitted fields are kept), entries without one are new.
+    """
+    existing = {choice.id: choice for choice in question.choices.all()}
+    choice_ids = [item["id"] for item in incoming if item.get("id") is not None]
+    if len(set(choice_ids)) != len(choice_ids):
+        raise serializers.ValidationError("A choice can only be listed once.")
+    for item in incoming:
+        if item.get("id") is None and not item.get("text"):
+            raise serializers.ValidationError("New choices need a text.")
+        if item.get("id") is not None and item["id"] not in existing:
+            raise serializers.ValidationError(f"Choice {item['id']} does not belong to this question.")
+    return [
+        Choice(
+            text=item.get("text") or existing[item["id"]].text,
+            is_correct=_choice_is_correct(item, existing),
+        )
+        for item in incoming
+    ]
+
+
+def kept_choice_ordinals(question, incoming):
+    kept = {item["id"] for item in incoming if item.get("id") is not None}
+    return {choice.ordinal for choice in question.choices.all() if choice.id in kept}
+
+
+def diff_choices(question, incoming, free, created, updated, deleted):
+    """
+    Queue the writes that bring a question's choices to `incoming` (checked by
+    resolve_choices()): choices left out are deleted, new ones take the ordinals in
+    `free` (see services.mcq.free_ordinals). Unchanged rows are not written, so choice
+    ids, and the answers pointing at them, survive an edit.
+    Returns (number of rows to write, whether the choice set or correct flags changed).
+    """
+    existing = {choice.id: choice for choice in question.choices.all()}
+    kept = {item["id"] for item in incoming if item.get("id") is not None}
+    removed = [choice for choice in existing.values() if choice.id not in kept]
+    free = iter(free)
+
+    writes, grading = len(removed), bool(removed)
+    for item in incoming:
+        is_correct = _choice_is_correct(item, existing)
+        if item.get("id") is None:
+            ordinal = next(free, None)
+            if ordinal is None:
+                raise serializers.ValidationError(
+                    f"Question {question.id}: no free choice slot left; deleted choices still "
+                    "selected in saved answers keep theirs."
+                )
+            created.append(Choice(question=question, ordinal=ordinal, text=item["text"], is_correct=is_correct))
+            writes, grading = writes + 1, True
+            continue
+        choice = existing[item["id"]]
+        text = item.get("text") or choice.text
+        if (choice.text, choice.is_correct) != (text, is_correct):
+            grading = grading or choice.is_correct != is_correct
+            choice.text, choice.is_correct = text, is_correct
+            updated.append(choice)
+            writes += 1
+    deleted += removed
+    return writes, grading
+
+
+def save_choices(created, updated, deleted):
+    """ Apply the writes queued by diff_choices(). """
+    # deletes first: a new choice may take a removed choice's ordinal
+    if deleted:
+        Choice.objects.filter(pk__in=[choice.pk for choice in deleted]).delete()
+    Choice.objects.bulk_update(updated, ["text", "is_correct"], batch_size=500)
+    Choice.objects.bulk_create(created, batch_size=500)
+
+
+
 class QuestionBulkSerializer(serializers.ModelSerializer):
     choices = QuestionChoiceSerializer(many=True, required=False)
 
@@ -129,9 +237,13 @@ class QuestionBulkSerializer(serializers.ModelSerializer):
             "reference_answer",
             "max_score",
             "metadata",
+            "allow_multiple",
             "choices",
         ]
 
+    def validate_metadata(self, value):
+        return validate_question_metadata(value)
+
     def validate(self, attrs):
         q_type = attrs.get("type")
         choices = attrs.get("choices", [])
@@ -147,6 +259,8 @@ class QuestionBulkSerializer(serializers.ModelSerializer):
         if q_type != Question.Types.MCQ and choices:
             raise serializers.ValidationError("Only MCQ questions can have choices.")
 
+        validate_choice_count(q_type, choices, attrs.get("allow_multiple", False))
+
         return attrs
     
 
@@ -161,10 +275,13 @@ class BulkQuestionCreateSerializer(serializers.Serializer):
         questions_data = validated_data["questions"]
 
         # Existing questions map
+        existing_questions = Question.objects.filter(exam=exam).only("type", "text", "position")
         existing = {
             (q.type, normalize_text(q.text))
-            for q in Question.objects.filter(exam=exam)
+            for q in existing_questions
         }
+        # new questions go after the existing ones
+        position = max((q.position for q in existing_questions), default=-1) + 1
 
         created_questions = []
         choice_objects = []
@@ -176,13 +293,16 @@ class BulkQuestionCreateSerializer(serializers.Serializer):
                 continue  # skip duplicate
 
             choices = q.pop("choices", [])
-            question = Question.objects.create(exam=exam, **q)
+            # choice i gets ordinal i, i.e. bit i of the correct/selected masks
+            correct_mask = choice_mask(i for i, choice in enumerate(choices) if choice.get("is_correct"))
+            question = Question.objects.create(exam=exam, correct_mask=correct_mask, position=position, **q)
+            position += 1
             created_questions.append(question)
             existing.add(key)
 
-            for choice in choices:
+            for i, choice in enumerate(choices):
                 choice_objects.append(
-                    Choice(question=question, **choice)
+                    Choice(question=question, ordinal=i, **choice)
                 )
 
         Choice.objects.bulk_create(choice_objects)
@@ -200,6 +320,9 @@ class BulkQuestionCreateSerializer(serializers.Serializer):
 
 
 class ChoiceSerializer(serializers.ModelSerializer):
+    # on update: without id, a new choice
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = Choice
         fields = ["id", "text", "is_correct"]
@@ -217,9 +340,16 @@ class QuestionSerializer(serializers.ModelSerializer):
             "reference_answer",
             "max_score",
             "metadata",
+            "allow_multiple",
+            "position",
             "choices",
             "created_at",
         ]
+        # reordered with the bulk PATCH on the exam's questions
+        read_only_fields = ["position"]
+
+    def validate_metadata(self, value):
+        return validate_question_metadata(value)
 
     def validate(self, attrs):
         q_type = attrs.get("type", self.instance.type if self.instance else None)
@@ -230,65 +360,310 @@ class QuestionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "MCQ questions must have choices."
                 )
-            if not any(c.get("is_correct") for c in choices):
+            if self.instance is not None:
+                # an updated choice may leave is_correct out and keep its current value
+                correct = any(choice.is_correct for choice in resolve_choices(self.instance, choices))
+            else:
+                correct = any(c.get("is_correct") for c in choices)
+            if not correct:
                 raise serializers.ValidationError(
                     "At least one choice must be marked as correct."
                 )
 
+        allow_multiple = attrs.get("allow_multiple", self.instance.allow_multiple if self.instance else False)
+        validate_choice_count(q_type, choices, allow_multiple)
+
         return attrs
+
+    def update(self, instance, validated_data):
+        """ Choices are diffed by id, as in the bulk PATCH: students' selections stay attached. """
+        incoming = validated_data.pop("choices", None)
+        instance = super().update(instance, validated_data)
+        if instance.type == Question.Types.MCQ and incoming is not None:
+            created, updated, deleted = [], [], []
+            free = free_ordinals({instance.id: kept_choice_ordinals(instance, incoming)})[instance.id]
+            diff_choices(instance, incoming, free, created, updated, deleted)
+            save_choices(created, updated, deleted)
+            refresh_correct_masks([instance.id])
+            instance.refresh_from_db(fields=["correct_mask"])
+        return instance
     
     
 
 
 
 
+class QuestionBankSerializer(QuestionSerializer):
+    exam_id = serializers.IntegerField(read_only=True)
+    exam_title = serializers.CharField(source="exam.title", read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(QuestionSerializer.Meta):
+        fields = QuestionSerializer.Meta.fields + ["exam_id", "exam_title", "rank"]
+
+
+
+class ChoicePatchSerializer(serializers.ModelSerializer):
+    # without id: a new choice
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Choice
+        fields = ["id", "text", "is_correct"]
+        extra_kwargs = {"text": {"required": False}}
+
+
+class QuestionPatchSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField()
+    choices = ChoicePatchSerializer(many=True, required=False)
+
+    class Meta:
+        model = Question
+        fields = ["id", "text", "reference_answer", "max_score", "metadata", "allow_multiple", "choices"]
+        extra_kwargs = {"text": {"required": False}}
+
+    def validate_metadata(self, value):
+        return validate_question_metadata(value)
+
+
+class QuestionBulkUpdateSerializer(serializers.Serializer):
+    """
+    Edit many questions of an exam at once, and/or reorder them.
+
+    Only the fields given are changed. `choices`, when given, is the question's whole
+    list, diffed by id as in diff_choices(): omitted fields of a listed choice are kept.
+    `order` lists every question id of the exam in its new order.
+    """
+    questions = QuestionPatchSerializer(many=True, required=False)
+    order = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    QUESTION_FIELDS = ["text", "reference_answer", "max_score", "metadata", "allow_multiple"]
+    # the fields of services.regrade.grading_fingerprint
+    GRADING_FIELDS = {"reference_answer", "max_score", "metadata", "allow_multiple"}
+
+    def validate(self, attrs):
+        exam = self.context["exam"]
+        patches = attrs.get("questions", [])
+        if not patches and "order" not in attrs:
+            raise serializers.ValidationError("Nothing to update: send questions and/or order.")
+
+        ids = [patch["id"] for patch in patches]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("A question can only be listed once.")
+        # locked until the request's transaction ends, so concurrent edits of a question queue up
+        self._questions = {
+            question.id: question
+            for question in Question.objects.select_for_update().filter(exam=exam, id__in=ids).prefetch_related("choices")
+        }
+        for patch in patches:
+            self._validate_patch(patch)
+
+        if "order" in attrs:
+            self._positions = dict(Question.objects.filter(exam=exam).values_list("id", "position"))
+            order = attrs["order"]
+            if len(order) != len(self._positions) or set(order) != set(self._positions):
+                raise serializers.ValidationError("order must list every question of the exam exactly once.")
+        return attrs
+
+    def _validate_patch(self, patch):
+        question = self._questions.get(patch["id"])
+        if question is None:
+            raise serializers.ValidationError(f"Question {patch['id']} does not belong to this exam.")
+        allow_multiple = patch.get("allow_multiple", question.allow_multiple)
+        incoming = patch.get("choices")
+        if incoming is None:
+            choices = list(question.choices.all())
+        elif question.type != Question.Types.MCQ:
+            raise serializers.ValidationError(f"Question {question.id}: only MCQ questions can have choices.")
+        else:
+            try:
+                choices = resolve_choices(question, incoming)
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError(f"Question {question.id}: {exc.detail[0]}")
+
+        if question.type == Question.Types.MCQ:
+            if not choices:
+                raise serializers.ValidationError(f"Question {question.id}: MCQ questions must have choices.")
+            if not any(choice.is_correct for choice in choices):
+                raise serializers.ValidationError(
+                    f"Question {question.id}: at least one choice must be marked as correct."
+                )
+        try:
+            validate_choice_count(question.type, choices, allow_multiple)
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError(f"Question {question.id}: {exc.detail[0]}")
+
+    def create(self, validated_data):
+        edited, fields, changed, remask, regrade = [], set(), set(), set(), set()
+        created, updated, deleted = [], [], []
+        patches = validated_data.get("questions", [])
+        # looked up at once for every question getting new choices
+        free = free_ordinals({
+            patch["id"]: kept_choice_ordinals(self._questions[patch["id"]], patch["choices"])
+            for patch in patches
+            if any(item.get("id") is None for item in patch.get("choices", ()))
+        })
+
+        for patch in patches:
+            question = self._questions[patch["id"]]
+            dirty = {field for field in self.QUESTION_FIELDS if field in patch and getattr(question, field) != patch[field]}
+            for field in dirty:
+                setattr(question, field, patch[field])
+            if dirty:
+                edited.append(question)
+                fields |= dirty
+                changed.add(question.id)
+            if dirty & self.GRADING_FIELDS:
+                regrade.add(question.id)
+            if "choices" in patch:
+                writes, grading = diff_choices(
+                    question, patch["choices"], free.get(question.id, ()), created, updated, deleted,
+                )
+                if writes:
+                    changed.add(question.id)
+                if grading:
+                    remask.add(question.id)
+                    regrade.add(question.id)
+
+        save_choices(created, updated, deleted)
+        if edited:
+            Question.objects.bulk_update(edited, sorted(fields), batch_size=500)
+        if remask:
+            refresh_correct_masks(remask)
+
+        reordered = []
+        if "order" in validated_data:
+            reordered = [
+                Question(pk=question_id, position=position)
+                for position, question_id in enumerate(validated_data["order"])
+                if self._positions[question_id] != position
+            ]
+            Question.objects.bulk_update(reordered, ["position"], batch_size=500)
+
+        return {
+            "updated": len(changed),
+            "choices_created": len(created),
+            "choices_updated": len(updated),
+            "choices_deleted": len(deleted),
+            "reordered": len(reordered),
+            "regrade": sorted(regrade),
+        }
+
+
+
+
+
+
 class AnswerCreateSerializer(serializers.Serializer):
     question_id = serializers.IntegerField()
     selected_choice_id = serializers.IntegerField(required=False, allow_null=True)
+    # multi-select MCQs (allow_multiple); a single id may be sent either way
+    selected_choice_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=True)
     answer_text = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
 
 
-class SubmissionCreateSerializer(serializers.Serializer):
+class AnswerBatchMixin:
+    """
+    Validation shared by autosave and submit: every answer must target a question
+    of `exam` (of the student's paper, when the exam draws from a pool) and, for MCQ,
+    choices of that question (several only when the question allows multiple).
+    Each answer gets its `selected_mask`; `selected_choice_id` is kept for single selections.
+    """
+
+    def validate_answer_batch(self, exam, answers, paper=None):
+        # question/choice maps of the exam's current version, cached (see services.snapshot)
+        from .services.snapshot import get_exam_lookup
+        lookup = get_exam_lookup(exam.id, exam.version)
+        allowed = lookup['questions'] if paper is None else set(paper).intersection(lookup['questions'])
+
+        if any(a['question_id'] not in allowed for a in answers):
+            raise serializers.ValidationError("One or more questions invalid for this exam.")
+
+        for ans in answers:
+            selected = set(ans.pop('selected_choice_ids', None) or ())
+            if ans.get('selected_choice_id'):
+                selected.add(ans['selected_choice_id'])
+            for choice_id in selected:
+                if lookup['choices'].get(choice_id) != ans['question_id']:
+                    raise serializers.ValidationError(f"Choice {choice_id} not valid for question {ans['question_id']}")
+            if len(selected) > 1 and ans['question_id'] not in lookup['multiple']:
+                raise serializers.ValidationError(f"Question {ans['question_id']} accepts a single choice.")
+            ans['selected_choice_id'] = next(iter(selected)) if len(selected) == 1 else None
+            ans['selected_mask'] = choice_mask(lookup['ordinals'][c] for c in selected) if selected else None
+
+
+
+class AutosaveSerializer(AnswerBatchMixin, serializers.Serializer):
+    answers = AnswerCreateSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        request = self.context['request']
+        exam_id = self.context['exam_id']  # passed from view
+        submission = (
+            Submission.objects
+            .select_related('exam')
+            .filter(student=request.user, exam_id=exam_id)
+            .first()
+        )
+        if submission is None:
+            raise serializers.ValidationError("Exam has not been started.")
+        if submission.status != Submission.Status.PENDING or is_logged(request.user.id, exam_id):
+            raise serializers.ValidationError("This exam has already been submitted.")
+
+        # checked from cached metadata by CanSubmitExam, then here on the row itself
+        check_exam_window(submission.exam.start_at, submission.exam.end_at)
+        self.validate_answer_batch(submission.exam, data['answers'], submission.question_ids)
+
+        self.context['submission'] = submission
+        return data
+
+    def create(self, validated_data):
+        from .services.autosave import save_drafts
+        submission = self.context['submission']
+        if not save_drafts(submission.id, validated_data['answers']):
+            # submitted (or swept) since validate()
+            raise serializers.ValidationError("This exam has already been submitted.")
+        return submission
+
+
+
+class SubmissionCreateSerializer(AnswerBatchMixin, serializers.Serializer):
     started_at = serializers.DateTimeField(required=False)
-    answers = AnswerCreateSerializer(many=True)
+    answers = AnswerCreateSerializer(many=True, required=False)
 
     def validate(self, data):
         request = self.context['request']
         exam_id = self.context['exam_id']  # passed from view
-        try:
-            exam = Exam.objects.get(pk=exam_id)
-        except Exam.DoesNotExist:
-            raise serializers.ValidationError("Exam does not exist.")
-
-        # check exam availability
-        now = timezone.now()
-        if exam.start_at and exam.start_at > now:
-            raise serializers.ValidationError("Exam not yet available.")
-        if exam.end_at and exam.end_at < now:
-            raise serializers.ValidationError("Exam has ended.")
-    
 
-        # check duplicate submission
+        # check duplicate submission; a PENDING one (created by start) gets finalized.
+        # The exam window is checked by the CanSubmitExam permission, then on the row below.
         student = request.user
-        if Submission.objects.filter(student=student, exam=exam).exists():
+        submission = Submission.objects.select_related('exam').filter(student=student, exam_id=exam_id).first()
+        if submission is not None:
+            exam = submission.exam
+        else:
+            try:
+                exam = Exam.objects.get(pk=exam_id)
+            except Exam.DoesNotExist:
+                raise serializers.ValidationError("Exam does not exist.")
+        if (submission and submission.status != Submission.Status.PENDING) or is_logged(student.id, exam_id):
             raise serializers.ValidationError("This exam has already been submitted.")
+        check_exam_window(exam.start_at, exam.end_at)
 
-        question_ids = [q['question_id'] for q in data['answers']]
-        # ensure all question ids belong to the exam
-        qs_count = Question.objects.filter(exam=exam, id__in=question_ids).count()
-        if qs_count != len(set(question_ids)):
-            raise serializers.ValidationError("One or more questions invalid for this exam.")
+        # papers are drawn by start, there is nothing to answer without one
+        if submission is None and exam.questions_per_paper:
+            raise serializers.ValidationError("Exam has not been started.")
 
-        # validate choices
-        for ans in data['answers']:
-            choice_id = ans.get('selected_choice_id')
-            if choice_id:
-                if not Choice.objects.filter(pk=choice_id, question_id=ans['question_id']).exists():
-                    raise serializers.ValidationError(f"Choice {choice_id} not valid for question {ans['question_id']}")
+        answers = data.get('answers', [])
+        if not answers and submission is None:
+            raise serializers.ValidationError({"answers": "This field is required."})
+        if answers:
+            self.validate_answer_batch(exam, answers, submission.question_ids if submission else None)
 
-        # attach exam for create
+        # attach exam and pending submission for create
         self.context['exam'] = exam
+        self.context['submission'] = submission
         return data
     
 
@@ -296,28 +671,75 @@ class SubmissionCreateSerializer(serializers.Serializer):
     def create(self, validated_data):
         request = self.context['request']
         exam = self.context['exam']
+        submission = self.context.get('submission')
         student = request.user
 
         with transaction.atomic():
-            submission = Submission.objects.create(
-                student=student,
-                exam=exam,
-                started_at=validated_data.get('started_at'),
-                status=Submission.Status.SUBMITTED,
-                submitted_at=timezone.now()
-            )
-
-            answers_bulk = []
-            for ans in validated_data['answers']:
-                answer = Answer(
+            if submission is None:
+                submission = Submission.objects.create(
+                    student=student,
+                    exam=exam,
+                    started_at=validated_data.get('started_at'),
+                    status=Submission.Status.SUBMITTED,
+                    submitted_at=timezone.now()
+                )
+            else:
+                # locked and re-checked: a concurrent submit or the deadline sweep may have won
+                if not Submission.objects.select_for_update().filter(
+                    pk=submission.pk, status=Submission.Status.PENDING,
+                ).exists():
+                    raise serializers.ValidationError("This exam has already been submitted.")
+                from .services.autosave import apply_drafts
+                apply_drafts([submission.id])
+                submission.status = Submission.Status.SUBMITTED
+                submission.submitted_at = timezone.now()
+                submission.save(update_fields=['status', 'submitted_at'])
+
+            # one row per question (last one wins); final answers override autosaved ones
+            answers_bulk = {}
+            for ans in validated_data.get('answers', []):
+                answers_bulk[ans['question_id']] = Answer(
                     submission=submission,
                     question_id=ans['question_id'],
                     answer_text=ans.get('answer_text'),
-                    selected_choice_id=ans.get('selected_choice_id')
+                    selected_choice_id=ans.get('selected_choice_id'),
+                    selected_mask=ans.get('selected_mask'),
                 )
-                answers_bulk.append(answer)
-            Answer.objects.bulk_create(answers_bulk)
+            Answer.objects.bulk_create(
+                list(answers_bulk.values()),
+                update_conflicts=True,
+                unique_fields=['submission', 'question'],
+                update_fields=['selected_choice', 'selected_mask', 'answer_text'],
+            )
+
+        return submission
 
+
+    def enqueue(self):
+        """
+        Write-behind alternative to save(): append the validated submission to the local
+        ingest log and return without touching the database. The drain_submissions
+        command marks it QUEUED and applies it later, with the duplicate and
+        already-submitted checks. Until then the logged marker refuses autosave and
+        further submits (see services.ingest.mark_logged).
+        """
+        from .services.ingest import forget_logged, mark_logged, submission_log
+        submission = self.context.get('submission')
+        student_id, exam_id = self.context['request'].user.id, self.context['exam'].id
+        if not mark_logged(student_id, exam_id):
+            raise serializers.ValidationError("This exam has already been submitted.")
+        # autosaved drafts are applied by the drainer, under the same rules as submit
+        try:
+            submission_log.append({
+                'student_id': student_id,
+                'exam_id': exam_id,
+                'started_at': self.validated_data.get('started_at'),
+                'submitted_at': timezone.now(),
+                'answers': self.validated_data.get('answers', []),
+            })
+        except Exception:
+            forget_logged(student_id, exam_id)
+            raise
         return submission
 
 
@@ -341,6 +763,7 @@ class ExamPlayQuestionSerializer(serializers.ModelSerializer):
             "text",
             "type",
             "max_score",
+            "allow_multiple",
             "choices",
         ]
 
@@ -350,8 +773,7 @@ class ExamPlayQuestionSerializer(serializers.ModelSerializer):
 
 
 class ExamDetailsSerializer(serializers.ModelSerializer):
-    questions = QuestionSerializer(many=True, read_only=True)
-
+    # questions are served by the start endpoint, not with the details
     class Meta:
         model = Exam
         fields = [
@@ -362,7 +784,6 @@ class ExamDetailsSerializer(serializers.ModelSerializer):
             "metadata",
             "start_at",
             "end_at",
-            "questions",
         ]
 
 
@@ -1,19 +1,28 @@
 from django.conf import settings
 
 def _get_backend():
-    # backend = getattr(settings, 'GRADER_BACKEND', 'mock')
-    # return backend
-    return "mock" # for now, only mock is implemented
+    return getattr(settings, 'GRADER_BACKEND', 'mock')
+
+def _get_grader():
+    """
+    mock and llm both route by question type (settings.GRADER_ROUTES; llm only changes
+    where essays go). Any other value is a dotted path to a BaseGrader subclass, e.g.
+    acad_core.services.grader.MockGrader to score every type in one thread, unrouted.
+    """
+    from django.utils.module_loading import import_string
+    from .grader import RoutedGrader
+    backend = _get_backend()
+    if backend in ('mock', 'llm'):
+        return RoutedGrader()
+    return import_string(backend)()
 
 def grade_submission(submission_id):
-    from .grader import MockGrader, LLMGrader
     from ..models import Submission
     submission = Submission.objects.get(pk=submission_id)
-    backend = _get_backend()
-    if backend == 'mock':
-        grader = MockGrader()
-    elif backend == 'llm':
-        grader = LLMGrader()
-    else:
-        grader = MockGrader()
-    return grader.grade_submission(submission)
\ No newline at end of file
+    grader = _get_grader()
+    return grader.grade_submission(submission)
+
+def grade_submissions(submission_ids):
+    """ Grade many submissions as one job; returns {submission_id: grading_details}. """
+    grader = _get_grader()
+    return grader.grade_submissions(list(submission_ids))
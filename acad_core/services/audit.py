@@ -0,0 +1,79 @@
+import struct
+
+from django.db import connection
+
+
+# one GRADE event per submission, packed from its answers inside the database;
+# int8send/int4send are big-endian, as pack_scores() writes them
+RECORD_GRADED_SQL = """
+INSERT INTO acad_core_gradingevent (submission_id, exam_id, kind, grader, score, question_ids, scores, created_at)
+SELECT s.id, s.exam_id, 'GRADE', %(grader)s, s.score,
+       coalesce(string_agg(int8send(a.question_id), ''::bytea ORDER BY a.id), ''::bytea),
+       coalesce(string_agg(int4send(round(coalesce(a.score, 0) * 100)::int), ''::bytea ORDER BY a.id), ''::bytea),
+       %(created_at)s
+FROM acad_core_submission AS s
+LEFT JOIN acad_core_answer AS a ON a.submission_id = s.id
+WHERE s.id = ANY(%(submission_ids)s)
+GROUP BY s.id
+"""
+
+
+def grader_label(grader_info):
+    """ "name/version" of a grader_info() dict, as GradingEvent.grader stores it. """
+    return f"{grader_info['name']}/{grader_info['version']}"[:64]
+
+
+def pack_scores(scores):
+    """
+    GradingEvent.question_ids and GradingEvent.scores for [(question_id, score), ...]:
+    8 bytes per question id and 4 per score (in hundredths), instead of a JSON list.
+    """
+    return (
+        struct.pack(f">{len(scores)}q", *(question_id for question_id, _ in scores)),
+        struct.pack(f">{len(scores)}i", *(round(float(score or 0) * 100) for _, score in scores)),
+    )
+
+
+def unpack_scores(question_ids, scores):
+    """ [(question_id, score), ...] from a GradingEvent's packed arrays. """
+    question_ids, scores = bytes(question_ids), bytes(scores)
+    return [
+        (question_id, value / 100)
+        for question_id, value in zip(
+            struct.unpack(f">{len(question_ids) // 8}q", question_ids),
+            struct.unpack(f">{len(scores) // 4}i", scores),
+        )
+    ]
+
+
+def grading_event(submission_id, exam_id, kind, grader_info, score, scores):
+    """ An unsaved GradingEvent; `scores` is [(question_id, score), ...]. """
+    from ..models import GradingEvent
+
+    question_ids, packed = pack_scores(scores)
+    return GradingEvent(
+        submission_id=submission_id,
+        exam_id=exam_id,
+        kind=kind,
+        grader=grader_label(grader_info),
+        score=score,
+        question_ids=question_ids,
+        scores=packed,
+    )
+
+
+def record_events(events):
+    """ Append events in bulk; call it in the transaction that saves the grading. """
+    from ..models import GradingEvent
+
+    GradingEvent.objects.bulk_create(events, batch_size=1000)
+
+
+def record_graded_in_database(submission_ids, grader_info, created_at):
+    """ Append a GRADE event per submission from its saved answers, in one INSERT ... SELECT (PostgreSQL). """
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_GRADED_SQL, {
+            'submission_ids': list(submission_ids),
+            'grader': grader_label(grader_info),
+            'created_at': created_at,
+        })
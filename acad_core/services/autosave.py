@@ -0,0 +1,75 @@
+from django.db import transaction
+
+ANSWER_FIELDS = ["selected_choice", "selected_mask", "answer_text"]
+
+
+def save_drafts(submission_id, answers):
+    """
+    Upsert autosaved answers as AnswerDraft rows, one per question (the latest wins),
+    in a single statement. Drafts live in the database, so any worker finalizing the
+    submission sees them and a restart loses none.
+
+    Returns False, writing nothing, when the submission is no longer PENDING: the check
+    holds the submission row lock that apply_drafts() callers take, so no draft lands
+    after the submission was finalized.
+    """
+    from ..models import AnswerDraft, Submission
+
+    with transaction.atomic():
+        pending = (
+            Submission.objects
+            .select_for_update(no_key=True)
+            .filter(pk=submission_id, status=Submission.Status.PENDING)
+        )
+        if not pending.exists():
+            return False
+        drafts = {
+            ans["question_id"]: AnswerDraft(
+                submission_id=submission_id,
+                question_id=ans["question_id"],
+                selected_choice_id=ans.get("selected_choice_id"),
+                selected_mask=ans.get("selected_mask"),
+                answer_text=ans.get("answer_text"),
+            )
+            for ans in answers
+        }
+        AnswerDraft.objects.bulk_create(
+            list(drafts.values()),
+            update_conflicts=True,
+            unique_fields=["submission", "question"],
+            update_fields=ANSWER_FIELDS,
+        )
+    return True
+
+
+def apply_drafts(submission_ids):
+    """
+    Turn the drafts of submissions being finalized into Answer rows, then delete them.
+    Call it inside the finalizing transaction, with the submission rows locked and still
+    PENDING (or QUEUED, see services.ingest), and before writing the submitted answers, which override drafts.
+    Returns the number of drafts applied.
+    """
+    from ..models import Answer, AnswerDraft
+
+    drafts = AnswerDraft.objects.filter(submission_id__in=list(submission_ids))
+    answers = [
+        Answer(
+            submission_id=draft.submission_id,
+            question_id=draft.question_id,
+            selected_choice_id=draft.selected_choice_id,
+            selected_mask=draft.selected_mask,
+            answer_text=draft.answer_text,
+        )
+        for draft in drafts
+    ]
+    if not answers:
+        return 0
+    Answer.objects.bulk_create(
+        answers,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["submission", "question"],
+        update_fields=ANSWER_FIELDS,
+    )
+    drafts.delete()
+    return len(answers)
@@ -0,0 +1,41 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+def _columns(model, exclude):
+    return [field.column for field in model._meta.concrete_fields if field.name not in exclude]
+
+
+def clone_questions(source_exam_id, target_exam_id):
+    """
+    Copy every question of an exam, with its choices, into another (empty) exam:
+    one INSERT ... SELECT for the questions, one for the choices, whatever the size
+    of the exam. New questions are matched to their originals by (type, text), unique
+    within an exam, so no id mapping goes through Python. Positions, choice ordinals
+    and correct masks are copied as they are. Returns (questions copied, choices copied).
+    """
+    from ..models import Choice, Question
+
+    qn = connection.ops.quote_name
+    questions, choices = qn(Question._meta.db_table), qn(Choice._meta.db_table)
+    question_columns = ", ".join(qn(column) for column in _columns(Question, ("id", "exam", "created_at")))
+    choice_columns = _columns(Choice, ("id", "question"))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {questions} (exam_id, created_at, {question_columns}) "
+            f"SELECT %s, %s, {question_columns} FROM {questions} WHERE exam_id = %s",
+            [target_exam_id, timezone.now(), source_exam_id],
+        )
+        copied_questions = cursor.rowcount
+        cursor.execute(
+            f"INSERT INTO {choices} (question_id, {', '.join(qn(column) for column in choice_columns)}) "
+            f"SELECT n.id, {', '.join('c.' + qn(column) for column in choice_columns)} "
+            f"FROM {choices} AS c "
+            f"JOIN {questions} AS o ON o.id = c.question_id "
+            f"JOIN {questions} AS n ON n.exam_id = %s AND n.type = o.type AND n.text = o.text "
+            f"WHERE o.exam_id = %s",
+            [target_exam_id, source_exam_id],
+        )
+        copied_choices = cursor.rowcount
+    return copied_questions, copied_choices
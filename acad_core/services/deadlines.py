@@ -0,0 +1,126 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, ExpressionWrapper, F, Min, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _grace():
+    # leave time for autosave and submit requests still in flight at the deadline
+    return timedelta(seconds=getattr(settings, "DEADLINE_SWEEP_GRACE", 15))
+
+
+def _recovery_delay():
+    # grading normally starts within seconds; past this, its job is assumed lost
+    return timedelta(seconds=getattr(settings, "GRADING_RECOVERY_AFTER", 300))
+
+
+def _deadline_expression():
+    return ExpressionWrapper(F("started_at") + F("exam__duration"), output_field=DateTimeField())
+
+
+def expired_pending_submissions(now=None):
+    """
+    PENDING submissions whose exam window closed (exam.end_at) or whose own time
+    ran out (started_at + exam.duration) at least the grace period ago.
+    """
+    from ..models import Submission
+    cutoff = (now or timezone.now()) - _grace()
+    return (
+        Submission.objects
+        .filter(status=Submission.Status.PENDING)
+        .annotate(deadline=_deadline_expression())
+        .filter(Q(exam__end_at__lte=cutoff) | Q(deadline__lte=cutoff))
+    )
+
+
+def next_deadline(now=None):
+    """
+    When the sweep next has work: the earliest deadline + grace period of any PENDING
+    submission that is still ahead, including deadlines just passed but within the grace
+    period. None when there is none.
+    """
+    from ..models import Submission
+    now = now or timezone.now()
+    cutoff = now - _grace()
+    pending = Submission.objects.filter(status=Submission.Status.PENDING)
+    end_at = pending.filter(exam__end_at__gt=cutoff).aggregate(at=Min("exam__end_at"))["at"]
+    timed = (
+        pending.annotate(deadline=_deadline_expression())
+        .filter(deadline__gt=cutoff)
+        .aggregate(at=Min("deadline"))["at"]
+    )
+    candidates = [at for at in (end_at, timed) if at is not None]
+    return min(candidates) + _grace() if candidates else None
+
+
+def sweep_expired_submissions(now=None, batch_size=500):
+    """
+    Finalize every expired PENDING submission and grade them, per exam in slices of
+    `batch_size`: each slice is finalized by one bulk UPDATE, then graded as one job,
+    so a large exam never grades all of its answers in a single transaction.
+    Returns {exam_id: number of submissions finalized}.
+    """
+    from ..models import Submission
+    from . import grade_submissions
+    from .autosave import apply_drafts
+
+    now = now or timezone.now()
+    by_exam = {}
+    for exam_id, submission_id in expired_pending_submissions(now).order_by("id").values_list("exam_id", "id"):
+        by_exam.setdefault(exam_id, []).append(submission_id)
+
+    swept = {}
+    for exam_id, submission_ids in by_exam.items():
+        swept[exam_id] = 0
+        for i in range(0, len(submission_ids), batch_size):
+            with transaction.atomic():
+                # lock and re-check, so rows a concurrent submit is finalizing are left alone
+                finalized = list(
+                    Submission.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(pk__in=submission_ids[i:i + batch_size], status=Submission.Status.PENDING)
+                    .values_list("id", flat=True)
+                )
+                apply_drafts(finalized)
+                Submission.objects.filter(pk__in=finalized).update(
+                    status=Submission.Status.SUBMITTED,
+                    submitted_at=now,
+                )
+            if finalized:
+                grade_submissions(finalized)
+            swept[exam_id] += len(finalized)
+        logger.info("Auto-submitted %s submission(s) for exam %s", swept[exam_id], exam_id)
+    return swept
+
+
+def ungraded_submissions(now=None):
+    """ SUBMITTED submissions still ungraded GRADING_RECOVERY_AFTER after they were submitted. """
+    from ..models import Submission
+    cutoff = (now or timezone.now()) - _recovery_delay()
+    return Submission.objects.filter(
+        status=Submission.Status.SUBMITTED,
+        graded_at__isnull=True,
+        submitted_at__lte=cutoff,
+    )
+
+
+def recover_ungraded_submissions(now=None, batch_size=500):
+    """
+    Grade submissions whose grading job was lost: the dispatcher's queue lives in the
+    web process that accepted the submit, and a drain of the ingest log may stop between
+    committing a batch and grading it. Grading a submission that was merely slow again
+    is harmless, it is rescored from its answers. Returns the number graded.
+    """
+    from . import grade_submissions
+
+    submission_ids = list(ungraded_submissions(now).order_by("id").values_list("id", flat=True))
+    for i in range(0, len(submission_ids), batch_size):
+        grade_submissions(submission_ids[i:i + batch_size])
+    if submission_ids:
+        logger.warning("Graded %s submission(s) left ungraded by a lost grading job", len(submission_ids))
+    return len(submission_ids)
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class _ExamQueue:
+    __slots__ = ("items", "weight", "vtime")
+
+    def __init__(self, weight, vtime):
+        self.items = deque()  # (submission_id, enqueued_at)
+        self.weight = weight
+        self.vtime = vtime
+
+
+class GradingDispatcher:
+    """
+    In-process grading queue with strict priorities and per-exam fairness.
+
+    Priorities are served strictly in order (HIGH before NORMAL before LOW).
+    Within a priority, exams share the workers by weighted fair queuing: every exam
+    has a virtual time that advances by (submissions graded / weight), and the exam
+    with the smallest virtual time is served next, one batch at a time. A 30-student
+    quiz therefore waits for at most one batch of a 10,000-student exam instead of
+    the whole backlog. An exam (re)joining the queue starts at the current minimum
+    virtual time, so idle exams cannot bank credit.
+
+    The queue lives in memory: submissions still queued when the process stops are
+    graded later by `manage.py sweep_deadlines` (see deadlines.recover_ungraded_submissions).
+    """
+
+    def __init__(self, workers=None, batch_size=None):
+        self.workers = workers or getattr(settings, "GRADING_WORKERS", 2)
+        self.batch_size = batch_size or getattr(settings, "GRADING_BATCH_SIZE", 20)
+        self._tiers = {}  # priority -> {exam_id: _ExamQueue}
+        self._weights = {}
+        self._in_flight = {}  # exam_id -> submissions being graded
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def set_weight(self, exam_id, weight):
+        """ Give an exam a larger (or smaller) share of the grading workers. """
+        with self._cond:
+            self._weights[exam_id] = weight
+            for tier in self._tiers.values():
+                if exam_id in tier:
+                    tier[exam_id].weight = weight
+
+    def submit(self, submission_id, exam_id, priority=PRIORITY_NORMAL):
+        with self._cond:
+            tier = self._tiers.setdefault(priority, {})
+            queue = tier.get(exam_id)
+            if queue is None:
+                vtime = min((q.vtime for q in tier.values()), default=0.0)
+                queue = tier[exam_id] = _ExamQueue(self._weights.get(exam_id, 1), vtime)
+            queue.items.append((submission_id, time.monotonic()))
+            self._cond.notify()
+        self._ensure_workers()
+
+    def stats(self):
+        """ Queue depth and age of the oldest waiting submission, per exam. """
+        now = time.monotonic()
+        with self._cond:
+            result = {}
+            for priority, tier in self._tiers.items():
+                for exam_id, queue in tier.items():
+                    entry = result.setdefault(exam_id, {
+                        "depth": 0,
+                        "oldest_age_seconds": 0.0,
+                        "in_flight": self._in_flight.get(exam_id, 0),
+                        "weight": queue.weight,
+                        "priorities": [],
+                    })
+                    entry["depth"] += len(queue.items)
+                    entry["oldest_age_seconds"] = max(
+                        entry["oldest_age_seconds"], round(now - queue.items[0][1], 3)
+                    )
+                    entry["priorities"].append(priority)
+            for exam_id, count in self._in_flight.items():
+                result.setdefault(exam_id, {
+                    "depth": 0,
+                    "oldest_age_seconds": 0.0,
+                    "in_flight": count,
+                    "weight": self._weights.get(exam_id, 1),
+                    "priorities": [],
+                })
+            return result
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                for priority in sorted(self._tiers):
+                    tier = self._tiers[priority]
+                    if not tier:
+                        continue
+                    # ties go to the shorter queue, so small cohorts finish first
+                    exam_id, queue = min(tier.items(), key=lambda item: (item[1].vtime, len(item[1].items)))
+                    size = min(self.batch_size, len(queue.items))
+                    batch = [queue.items.popleft()[0] for _ in range(size)]
+                    queue.vtime += size / queue.weight
+                    if not queue.items:
+                        del tier[exam_id]
+                    self._in_flight[exam_id] = self._in_flight.get(exam_id, 0) + size
+                    return exam_id, batch
+                self._cond.wait()
+
+    def _done(self, exam_id, size):
+        with self._cond:
+            remaining = self._in_flight.get(exam_id, 0) - size
+            if remaining > 0:
+                self._in_flight[exam_id] = remaining
+            else:
+                self._in_flight.pop(exam_id, None)
+
+    def _ensure_workers(self):
+        if len(self._threads) >= self.workers:
+            return
+        with self._cond:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        from . import grade_submissions
+        while True:
+            exam_id, batch = self._next_batch()
+            try:
+                grade_submissions(batch)
+            except Exception:
+                logger.exception("Grading failed for submissions %s of exam %s", batch, exam_id)
+            finally:
+                self._done(exam_id, len(batch))
+                close_old_connections()
+
+
+dispatcher = GradingDispatcher()
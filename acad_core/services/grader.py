@@ -1,13 +1,24 @@
 # assessments/services/grader.py
 from abc import ABC, abstractmethod
 from typing import Dict, Any
-from ..models import Submission, Answer, Question, Choice
-from django.db import transaction
+from ..models import Submission, Answer, Question, Choice, GradingEvent
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.conf import settings
+import hashlib
+import json
 import math
 import re
 from collections import Counter
 from django.utils import timezone
+from django.utils.module_loading import import_string
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from .audit import grading_event, record_events
+from .mcq import score_mask
+from .rubric import question_rubric
+
+logger = logging.getLogger(__name__)
 
 
 # utility tokenizer
@@ -18,6 +29,78 @@ def tokenize(text: str):
     return [t for t in re.findall(r'\w+', text.lower()) if len(t) > 1]
 
 
+def text_vector(text: str):
+    """ Token counts of `text` and their euclidean norm, as used by the similarity score. """
+    counts = Counter(tokenize(text))
+    return counts, math.sqrt(sum(v*v for v in counts.values()))
+
+
+def reference_vectors(questions, refresh=False):
+    """
+    text_vector() of each question's reference answer, keyed by question id.
+    Cached by content in the default cache, so a grading batch, a regrade or the
+    warm_exams command tokenizes every reference answer once; refresh rebuilds them.
+    """
+    keys = {
+        q.id: 'ref-vector:' + hashlib.sha1((q.reference_answer or '').encode()).hexdigest()
+        for q in questions
+    }
+    cached = {} if refresh else cache.get_many(set(keys.values()))
+    vectors, missing = {}, {}
+    for q in questions:
+        key = keys[q.id]
+        if key not in cached:
+            cached[key] = missing[key] = text_vector(q.reference_answer)
+        vectors[q.id] = cached[key]
+    if missing:
+        cache.set_many(missing, getattr(settings, 'EXAM_SNAPSHOT_TTL', 3600))
+    return vectors
+
+
+
+def answer_mask(answer: Answer):
+    """ The answer's selection as a bitmask over choice ordinals. """
+    if answer.selected_mask is not None:
+        return answer.selected_mask
+    # rows written before selected_mask existed
+    return 1 << answer.selected_choice.ordinal if answer.selected_choice_id else 0
+
+
+def score_choice(answer: Answer, question: Question):
+    """ MCQ: popcounts of the selected and correct choice bitmasks, see mcq.score_mask(). """
+    return score_mask(answer_mask(answer), question.correct_mask, question.allow_multiple, question.max_score)
+
+
+def score_similarity(answer: Answer, question: Question, reference=None):
+    """ Token-overlap cosine similarity between the answer and the reference answer. """
+    ref_counts, ref_norm = reference or text_vector(question.reference_answer)
+    stu_counts, stu_norm = text_vector(answer.answer_text)
+    if not ref_counts or not stu_counts:
+        return 0.0, "No content to compare"
+
+    # compute cosine similarity
+    dot = sum(ref_counts[t] * n for t, n in stu_counts.items())
+    if ref_norm == 0 or stu_norm == 0:
+        sim = 0.0
+    else:
+        sim = dot / (ref_norm * stu_norm)
+    score = float(sim) * float(question.max_score)
+    feedback = f"Similarity {sim:.2f}"
+    return round(score, 2), feedback
+
+
+def score_rubric(answer: Answer, question: Question):
+    """ Keywords, synonyms and regex rules from metadata["rubric"]; None when there is none. """
+    try:
+        rubric = question_rubric(question)
+    except ValueError:
+        # invalid rubrics are rejected on save; anything older falls back to similarity
+        return None
+    if rubric is None:
+        return None
+    return rubric.score(answer.answer_text, question.max_score)
+
+
 
 class BaseGrader(ABC):
     name = 'base'
@@ -27,68 +110,66 @@ class BaseGrader(ABC):
     def grade_submission(self, submission: Submission) -> Dict[str, Any]:
         pass
 
+    def score_answer(self, answer: Answer, question: Question, reference=None):
+        """
+        Score a single answer; returns (score, feedback).
+        `reference` is the question's reference_vectors() entry when the caller has it.
+        """
+        raise NotImplementedError(f"{self.name} grader does not support per-answer scoring")
 
+    def score_answers(self, answers, questions):
+        """
+        Score many answers; returns {answer.pk: (score, feedback)}.
+        `questions` maps question id -> Question for every answer. Used for batches and regrades.
+        """
+        references = reference_vectors([q for q in questions.values() if q.type != Question.Types.MCQ])
+        return {
+            ans.pk: self.score_answer(ans, questions[ans.question_id], references.get(ans.question_id))
+            for ans in answers
+        }
 
-class MockGrader(BaseGrader):
-    name = 'mock'
-    version = '1.0'
-
-    def _score_mcq(self, answer: Answer, question: Question):
-        if answer.selected_choice_id is None:
-            return 0.0, "No choice selected"
-        # rely on Choice.is_correct
-        if answer.selected_choice and answer.selected_choice.is_correct:
-            return float(question.max_score), "Correct"
-        return 0.0, "Incorrect"
-
-
-
-    def _score_short_or_essay(self, answer: Answer, question: Question):
-        # simple token-overlap cosine similarity between student answer and reference_answer
-        ref = question.reference_answer or ""
-        student = answer.answer_text or ""
-        ref_tokens = tokenize(ref)
-        student_tokens = tokenize(student)
-        if not ref_tokens or not student_tokens:
-            return 0.0, "No content to compare"
-
-        ref_counts = Counter(ref_tokens)
-        stu_counts = Counter(student_tokens)
-
-        # compute cosine similarity
-        all_terms = set(ref_counts) | set(stu_counts)
-        dot = sum(ref_counts[t] * stu_counts.get(t, 0) for t in all_terms)
-        ref_norm = math.sqrt(sum(v*v for v in ref_counts.values()))
-        stu_norm = math.sqrt(sum(v*v for v in stu_counts.values()))
-        if ref_norm == 0 or stu_norm == 0:
-            sim = 0.0
-        else:
-            sim = dot / (ref_norm * stu_norm)
-        score = float(sim) * float(question.max_score)
-        feedback = f"Similarity {sim:.2f}"
-        return round(score, 2), feedback
-
+    def grader_info(self):
+        """ What grading_details['grader'] records. """
+        return {'name': self.name, 'version': self.version}
 
+    def grade_submissions(self, submission_ids) -> Dict[int, Dict[str, Any]]:
+        """
+        Grade many submissions as one job: every answer of the batch is fetched in one
+        query, scored with score_answers(), then answers and submissions are saved in
+        one transaction, with a GradingEvent per submission. Returns {submission_id: grading_details}.
+        """
+        submissions = Submission.objects.only('id', 'exam_id').in_bulk(submission_ids)
+        answers = (
+            Answer.objects
+            .filter(submission_id__in=submissions.keys())
+            .select_related('question', 'selected_choice')
+            .order_by('submission_id', 'id')
+        )
+        by_submission = {pk: [] for pk in submissions}
+        # one Question instance per question, so per-question state (compiled rubrics) is reused
+        questions = {}
+        for ans in answers:
+            by_submission[ans.submission_id].append(ans)
+            questions.setdefault(ans.question_id, ans.question)
+        scores = self.score_answers([ans for group in by_submission.values() for ans in group], questions)
 
-    def grade_submission(self, submission: Submission):
-        # fetch submission with answers and related questions & choices
-        submission = Submission.objects.select_related('exam', 'student').prefetch_related('answers__question', 'answers__selected_choice').get(pk=submission.pk)
-        total = 0.0
-        max_score = sum(float(ans.question.max_score) for ans in submission.answers.all())
-        per_question = []
-        with transaction.atomic():
-            for ans in submission.answers.all():
-                q = ans.question
-
-                if q.type == Question.Types.MCQ:
-                    score, fb = self._score_mcq(ans, q)
-                else:
-                    score, fb = self._score_short_or_essay(ans, q)
-                # persist per-answer score & feedback
+        results = {}
+        events = []
+        graded_at = timezone.now()
+        compact = getattr(settings, 'GRADING_DETAILS_MODE', 'full') == 'compact'
+        grader_info = self.grader_info()
+        for pk, submission in submissions.items():
+            total = 0.0
+            max_score = 0.0
+            per_question = []
+            for ans in by_submission[pk]:
+                q = questions[ans.question_id]
+                score, fb = scores[ans.pk]
+                # per-answer score & feedback, persisted in bulk below
                 ans.score = score
                 ans.feedback = {'feedback_text': fb}
-                ans.save(update_fields=['score', 'feedback'])
                 total += score
+                max_score += float(q.max_score)
                 per_question.append({
                     'question_id': q.id,
                     'score': score,
@@ -97,18 +178,234 @@ class MockGrader(BaseGrader):
                     'feedback': fb
                 })
 
-            # update submission
             submission.score = round(total, 2)
             submission.status = Submission.Status.GRADED
-            submission.graded_at = timezone.now()
+            submission.graded_at = graded_at
             submission.grading_details = {
                 'total_marks': round(max_score, 2),
-                'per_question': per_question,
-                'grader': {'name': self.name, 'version': self.version}
+                'grader': grader_info
             }
-            submission.save(update_fields=['score', 'status', 'graded_at', 'grading_details'])
+            if compact:
+                # breakdown stays on the Answer rows only, see per_question_breakdown()
+                submission.grading_details['answered'] = len(per_question)
+            else:
+                submission.grading_details['per_question'] = per_question
+            results[pk] = submission.grading_details
+            events.append(grading_event(
+                pk, submission.exam_id, GradingEvent.Kinds.GRADE, grader_info, submission.score,
+                [(entry['question_id'], entry['score']) for entry in per_question],
+            ))
+
+        with transaction.atomic():
+            Answer.objects.bulk_update(
+                [ans for group in by_submission.values() for ans in group],
+                ['score', 'feedback'],
+                batch_size=1000,
+            )
+            Submission.objects.bulk_update(
+                submissions.values(),
+                ['score', 'status', 'graded_at', 'grading_details'],
+                batch_size=500,
+            )
+            record_events(events)
+
+        return results
+
+
+
+class MockGrader(BaseGrader):
+    name = 'mock'
+    version = '1.0'
+
+    def score_answer(self, answer: Answer, question: Question, reference=None):
+        if question.type == Question.Types.MCQ:
+            return score_choice(answer, question)
+        return score_rubric(answer, question) or score_similarity(answer, question, reference)
+
+
+
+    def grade_submission(self, submission: Submission):
+        return self.grade_submissions([submission.pk])[submission.pk]
+
+
+
+# Answer scorers: the per-question-type strategies RoutedGrader dispatches to.
+# prepare() runs on the calling thread and may query the database; score() runs
+# on a worker thread and must not.
+SCORERS = {}
+
 
-        return submission.grading_details
+def register_scorer(name):
+    """ Class decorator making a scorer available to settings.GRADER_ROUTES under `name`. """
+    def decorator(cls):
+        cls.name = name
+        SCORERS[name] = cls
+        return cls
+    return decorator
+
+
+class AnswerScorer:
+    name = 'base'
+
+    def prepare(self, questions):
+        """ Load what score() needs for these questions; returns a context passed to score(). """
+        return None
+
+    def score(self, answers, questions, context):
+        """ Returns {answer.pk: (score, feedback)}. """
+        raise NotImplementedError
+
+
+@register_scorer('choice')
+class ChoiceScorer(AnswerScorer):
+    """ MCQ: selected vs correct choice bitmasks, no extra query. """
+
+    def score(self, answers, questions, context):
+        return {ans.pk: score_choice(ans, questions[ans.question_id]) for ans in answers}
+
+
+@register_scorer('similarity')
+class SimilarityScorer(AnswerScorer):
+    """ Cosine similarity to the reference answer. """
+
+    def prepare(self, questions):
+        return reference_vectors(questions)
+
+    def score(self, answers, questions, context):
+        return {
+            ans.pk: score_similarity(ans, questions[ans.question_id], context.get(ans.question_id))
+            for ans in answers
+        }
+
+
+@register_scorer('rubric')
+class RubricScorer(SimilarityScorer):
+    """ The question's rubric when it has one, similarity otherwise. """
+
+    def score(self, answers, questions, context):
+        return {
+            ans.pk: (
+                score_rubric(ans, questions[ans.question_id])
+                or score_similarity(ans, questions[ans.question_id], context.get(ans.question_id))
+            )
+            for ans in answers
+        }
+
+
+@register_scorer('llm')
+class LLMScorer(AnswerScorer):
+    """ Delegates to LLMGrader; RoutedGrader falls back to GRADER_FALLBACK when it fails. """
+
+    def prepare(self, questions):
+        return LLMGrader()
+
+    def score(self, answers, questions, context):
+        return {ans.pk: context.score_answer(ans, questions[ans.question_id]) for ans in answers}
+
+
+def get_scorer(name):
+    """ A registered scorer by name, or a dotted path to an AnswerScorer subclass. """
+    if name in SCORERS:
+        return SCORERS[name]()
+    return import_string(name)()
+
+
+
+class RoutedGrader(BaseGrader):
+    """
+    Routes each question type to its own scorer (settings.GRADER_ROUTES). The type groups
+    of a batch are scored concurrently, so cheap MCQ lookups never wait behind slow essay
+    grading, and the results are merged and saved in one transaction by grade_submissions().
+    A group whose scorer fails is scored again with settings.GRADER_FALLBACK.
+    """
+    name = 'routed'
+    version = '1.0'
+
+    def __init__(self, routes=None, fallback=None):
+        self.routes = routes or getattr(settings, 'GRADER_ROUTES', {})
+        self.fallback = fallback or getattr(settings, 'GRADER_FALLBACK', 'rubric')
+
+    def grader_info(self):
+        return {**super().grader_info(), 'routes': self.routes}
+
+    def grade_submission(self, submission: Submission):
+        return self.grade_submissions([submission.pk])[submission.pk]
+
+    def grade_submissions(self, submission_ids):
+        # MCQ-only submissions are graded inside the database when MCQs use the choice scorer
+        results = {}
+        if connection.vendor == 'postgresql' and self.routes.get(Question.Types.MCQ) == 'choice':
+            from .mcq import grade_objective_submissions, objective_submissions
+            results = grade_objective_submissions(objective_submissions(submission_ids), self.grader_info())
+        remaining = [pk for pk in submission_ids if pk not in results]
+        if remaining:
+            results.update(super().grade_submissions(remaining))
+        return results
+
+    def score_answer(self, answer: Answer, question: Question, reference=None):
+        return self.score_answers([answer], {question.id: question})[answer.pk]
+
+    def score_answers(self, answers, questions):
+        if not answers:
+            # e.g. a swept submission with nothing answered
+            return {}
+        groups = {}
+        for ans in answers:
+            q_type = questions[ans.question_id].type
+            groups.setdefault(self.routes.get(q_type, self.fallback), []).append(ans)
+
+        # database reads on this thread; worker threads only score
+        jobs = []
+        for name, group in groups.items():
+            scorer = get_scorer(name)
+            group_questions = {ans.question_id: questions[ans.question_id] for ans in group}
+            jobs.append((name, scorer, group, group_questions, scorer.prepare(group_questions.values())))
+
+        if len(jobs) == 1:
+            outcomes = [(jobs[0], self._run(*jobs[0][1:]))]
+        else:
+            with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix='grader') as executor:
+                futures = [(job, executor.submit(self._run, *job[1:])) for job in jobs]
+                outcomes = [(job, future.result()) for job, future in futures]
+
+        scores = {}
+        for (name, _, group, group_questions, _), result in outcomes:
+            if isinstance(result, Exception):
+                logger.warning("%s scorer failed (%s), using %s", name, result, self.fallback)
+                fallback = get_scorer(self.fallback)
+                result = fallback.score(group, group_questions, fallback.prepare(group_questions.values()))
+            scores.update(result)
+        return scores
+
+    @staticmethod
+    def _run(scorer, answers, questions, context):
+        try:
+            return scorer.score(answers, questions, context)
+        except Exception as exc:
+            return exc
+
+
+
+def per_question_breakdown(submission_id):
+    """
+    Per-question scores of a submission, read from its Answer rows in one query.
+    Same shape as grading_details['per_question'] written in full mode.
+    """
+    rows = (
+        Answer.objects
+        .filter(submission_id=submission_id)
+        .order_by('id')
+        .values('question_id', 'score', 'question__max_score', 'feedback')
+    )
+    return [
+        {
+            'question_id': row['question_id'],
+            'score': float(row['score'] or 0),
+            'max_score': float(row['question__max_score']),
+            'feedback': (row['feedback'] or {}).get('feedback_text'),
+        }
+        for row in rows
+    ]
 
 
 
@@ -117,28 +414,72 @@ class MockGrader(BaseGrader):
 
 # LLM adapter 
 class LLMGrader(BaseGrader):
+    """
+    Scores short answers and essays by asking an LLM for a JSON verdict; MCQs are
+    still scored from the choice bitmasks. Used by the `llm` scorer (GRADER=llm routes
+    essays to it), which falls back to GRADER_FALLBACK when a call or its output fails.
+    """
     name = 'llm'
-    version = '0.1'
+    version = '0.2'
+
+    SYSTEM_PROMPT = (
+        "You grade student answers to exam questions. Compare the student's answer with the "
+        "reference answer and award between 0 and the maximum score; partial credit is allowed. "
+        'Reply with a JSON object only: {"score": <number>, "feedback": "<one or two sentences>"}.'
+    )
 
     def __init__(self, llm_client=None):
-        self.llm_client = llm_client or self._build_client()
+        self._llm_client = llm_client
+
+    @property
+    def llm_client(self):
+        # the SDK is imported on first use, so the mock backend never pays for it
+        if self._llm_client is None:
+            self._llm_client = self._build_client()
+        return self._llm_client
 
     def _build_client(self):
-        # build a client using openai 
-        return None
+        # build a client using openai (pip install -r requirements-llm.txt)
+        from openai import OpenAI
+        return OpenAI(timeout=getattr(settings, 'LLM_GRADER_TIMEOUT', 30))
 
-    def grade_submission(self, submission: Submission):
+    def score_answer(self, answer: Answer, question: Question, reference=None):
+        if question.type == Question.Types.MCQ:
+            return score_choice(answer, question)
+        if not (answer.answer_text or '').strip():
+            return 0.0, "No answer"
+
+        response = self.llm_client.chat.completions.create(
+            model=getattr(settings, 'LLM_GRADER_MODEL', 'gpt-4o-mini'),
+            temperature=0,
+            response_format={'type': 'json_object'},
+            messages=[
+                {'role': 'system', 'content': self.SYSTEM_PROMPT},
+                {'role': 'user', 'content': (
+                    f"Question: {question.text}\n"
+                    f"Reference answer: {question.reference_answer or '(none)'}\n"
+                    f"Maximum score: {float(question.max_score)}\n"
+                    f"Student answer: {answer.answer_text}"
+                )},
+            ],
+        )
+        return self.parse_verdict(response.choices[0].message.content, question.max_score)
+
+    @staticmethod
+    def parse_verdict(content, max_score):
         """
-        Example implementation:
-        - Prepare prompt with question reference answers and student answers
-        - Call LLM with a system prompt instructing to return structured JSON with per-question scores
-        - Parse and persist result
-        Note: real implementation must be robust against LLM hallucinations and timeouts.
+        (score, feedback) from the model's JSON reply, the score clamped to [0, max_score].
+        Raises ValueError on anything else, so the caller falls back to another scorer.
         """
-        # Pseudocode - keep synchronous for now; for production prefer asynchronous processing / background task
-        # 1) Gather inputs
-        # 2) Prepare prompt
-        # 3) Call LLM
-        # 4) Parse JSON response
-        # 5) Persist scores & feedback
-        raise NotImplementedError("LLMGrader is an adapter skeleton and not ready yet. please continue with mock implementation...")
\ No newline at end of file
+        try:
+            verdict = json.loads(content)
+            score = float(verdict['score'])
+        except (TypeError, ValueError, KeyError) as exc:
+            raise ValueError(f"Unusable LLM verdict: {content!r}") from exc
+        if not math.isfinite(score):
+            raise ValueError(f"Unusable LLM verdict: {content!r}")
+        score = min(max(score, 0.0), float(max_score))
+        return round(score, 2), str(verdict.get('feedback') or '')
+
+    def grade_submission(self, submission: Submission):
+        return self.grade_submissions([submission.pk])[submission.pk]
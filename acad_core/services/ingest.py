@@ -0,0 +1,300 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+# marks a student's exam as logged, until the drainer has applied it
+LOGGED_KEY = "ingest:logged:{student_id}:{exam_id}"
+LOGGED_TTL = 24 * 3600
+
+
+def mark_logged(student_id, exam_id):
+    """
+    Claim a student's exam for a logged submit. Returns False when it was already
+    logged, so submit rejects it; autosave checks is_logged(). The marker lives in the
+    default cache: with the in-process cache it only covers this process, and the
+    drainer's own checks (see apply_records) settle anything that gets past it.
+    """
+    return cache.add(LOGGED_KEY.format(student_id=student_id, exam_id=exam_id), True, LOGGED_TTL)
+
+
+def forget_logged(student_id, exam_id):
+    cache.delete(LOGGED_KEY.format(student_id=student_id, exam_id=exam_id))
+
+
+def is_logged(student_id, exam_id):
+    """ True while a logged submit of the student's exam waits for the drainer (log mode only). """
+    if getattr(settings, "SUBMISSION_INGEST_MODE", "direct") != "log":
+        return False
+    return cache.get(LOGGED_KEY.format(student_id=student_id, exam_id=exam_id)) is not None
+
+
+class SubmissionLog:
+    """
+    Append-only local log of validated submissions (write-behind ingestion).
+
+    `append` is a single locked write of one JSON line and touches no database, so the
+    submit endpoint never waits on a transaction. With fsync on, concurrent appends
+    share fsyncs (group commit): one writer syncs the file for everything written so
+    far while the others wait for it, outside the write lock. `drain` claims the active
+    log by renaming it, marks its submissions QUEUED, then bulk-applies its records in
+    batches.
+
+    Writers take an exclusive flock on the file and re-open it if the drainer
+    renamed it away meanwhile. The drainer takes the same lock on the renamed segment
+    before reading, so no append can land in a segment after it was consumed.
+    """
+
+    active_name = "submissions.log"
+
+    def __init__(self, directory=None, fsync=None):
+        self.directory = Path(directory or settings.SUBMISSION_LOG_DIR)
+        self.fsync = getattr(settings, "SUBMISSION_LOG_FSYNC", True) if fsync is None else fsync
+        self._fd = None
+        self._lock = threading.Lock()
+        # group commit: appends written / known durable, and whether a writer is syncing
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._sync_cond = threading.Condition()
+
+    @property
+    def path(self):
+        return self.directory / self.active_name
+
+    # -----------------------
+    # WRITE SIDE
+    # -----------------------
+    def append(self, record):
+        line = (json.dumps(record, cls=DjangoJSONEncoder, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            while True:
+                fd = self._open()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if self._is_current(fd):
+                    break
+                # drainer rotated the file between open and lock; what was written to it
+                # is synced before the descriptor goes
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                if self.fsync:
+                    os.fsync(fd)
+                os.close(fd)
+                self._fd = None
+            try:
+                os.write(fd, line)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._written += 1
+            seq = self._written
+        if self.fsync:
+            self._sync(seq)
+
+    def _sync(self, seq):
+        """ Return once append number `seq` is on disk, syncing for every waiting writer at once. """
+        with self._sync_cond:
+            while self._synced < seq:
+                if self._syncing:
+                    self._sync_cond.wait()
+                    continue
+                self._syncing = True
+                with self._lock:
+                    target = self._written
+                    # a duplicate, so a rotation can't close it under the fsync; without an
+                    # open file, the rotation already synced everything written
+                    fd = os.dup(self._fd) if self._fd is not None else None
+                self._sync_cond.release()
+                try:
+                    if fd is not None:
+                        os.fsync(fd)
+                finally:
+                    if fd is not None:
+                        os.close(fd)
+                    self._sync_cond.acquire()
+                    self._syncing = False
+                    self._sync_cond.notify_all()
+                self._synced = max(self._synced, target)
+
+    def _open(self):
+        if self._fd is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        return self._fd
+
+    def _is_current(self, fd):
+        try:
+            return os.fstat(fd).st_ino == os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return False
+
+    # -----------------------
+    # DRAIN SIDE
+    # -----------------------
+    def drain(self, batch_size=500, on_batch=None):
+        """
+        Apply every logged record to the database. A claimed segment is read twice: first
+        its submissions are marked QUEUED, so the deadline sweep and autosave leave them
+        alone, then its records are applied `batch_size` per transaction. Segments left
+        behind by an interrupted drain are replayed first; applying a record twice is
+        harmless. `on_batch`, e.g. grade_submissions, gets the ids each committed batch
+        finalized, so an interrupted drain leaves at most one batch ungraded. Returns the
+        ids of submissions finalized by this call.
+        """
+        try:
+            os.rename(self.path, self.directory / f"submissions.{time.time_ns()}.draining")
+        except FileNotFoundError:
+            pass  # nothing logged yet, or another drainer claimed it
+
+        finalized = []
+        for segment in sorted(self.directory.glob("submissions.*.draining")):
+            try:
+                fh = open(segment, "rb")
+            except FileNotFoundError:
+                continue  # consumed by a concurrent drainer
+            with fh:
+                # wait for appenders that opened the file before the rename
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                if not segment.exists():
+                    continue
+                for batch in self._batches(fh, segment, batch_size):
+                    queue_records(batch)
+                fh.seek(0)
+                for batch in self._batches(fh, segment, batch_size):
+                    applied = apply_records(batch)
+                    if applied and on_batch is not None:
+                        on_batch(applied)
+                    finalized += applied
+                segment.unlink()
+        return finalized
+
+    @staticmethod
+    def _batches(fh, segment, batch_size):
+        batch = []
+        for raw in fh:
+            try:
+                batch.append(json.loads(raw))
+            except ValueError:
+                logger.error("Skipping corrupt record in %s", segment)
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _first_records(records):
+    """ The first record of each student's exam: later ones are duplicate submits. """
+    by_key = {}
+    for record in records:
+        by_key.setdefault((record["student_id"], record["exam_id"]), record)
+    return by_key
+
+
+def queue_records(records):
+    """
+    Mark the submissions of logged records QUEUED, creating the rows of students who
+    never called start. Only PENDING submissions are claimed: one finalized meanwhile
+    (by a direct submit, the deadline sweep or an earlier drain) keeps its status, and
+    apply_records() skips its record.
+    """
+    from ..models import Submission
+
+    by_key = _first_records(records)
+    with transaction.atomic():
+        Submission.objects.bulk_create(
+            [
+                Submission(
+                    student_id=student_id,
+                    exam_id=exam_id,
+                    started_at=parse_datetime(r["started_at"]) if r.get("started_at") else None,
+                    status=Submission.Status.QUEUED,
+                )
+                for (student_id, exam_id), r in by_key.items()
+            ],
+            ignore_conflicts=True,
+        )
+        Submission.objects.filter(
+            pk__in=list(_submission_keys(by_key)), status=Submission.Status.PENDING,
+        ).update(status=Submission.Status.QUEUED)
+
+
+def _submission_keys(by_key):
+    """ {submission id: (student_id, exam_id)} of the records' submissions. """
+    from ..models import Submission
+
+    candidates = Submission.objects.filter(
+        student_id__in={k[0] for k in by_key},
+        exam_id__in={k[1] for k in by_key},
+    ).values_list("id", "student_id", "exam_id")
+    return {pk: (student_id, exam_id) for pk, student_id, exam_id in candidates if (student_id, exam_id) in by_key}
+
+
+def apply_records(records):
+    """
+    Bulk-apply logged submissions in one transaction: move their QUEUED rows (see
+    queue_records) to SUBMITTED with their autosaved drafts and logged answers.
+    The first record of a student's exam wins, within a batch as across batches and
+    segments; any other record, and one whose submission is not QUEUED (finalized
+    meanwhile, or replayed by an interrupted drain), is skipped.
+    Returns the ids of submissions that moved to SUBMITTED.
+    """
+    from ..models import Submission, Answer
+    from .autosave import apply_drafts
+
+    by_key = _first_records(records)
+    keys = _submission_keys(by_key)
+
+    with transaction.atomic():
+        # locked, like submit and the sweep do, so the status read here holds until commit
+        queued = (
+            Submission.objects
+            .select_for_update()
+            .filter(pk__in=list(keys), status=Submission.Status.QUEUED)
+            .only("id", "status", "submitted_at")
+            .order_by("pk")
+        )
+
+        finalized = []
+        answers = {}
+        for submission in queued:
+            record = by_key[keys[submission.id]]
+            submission.status = Submission.Status.SUBMITTED
+            submission.submitted_at = parse_datetime(record["submitted_at"])
+            finalized.append(submission)
+            for ans in record["answers"]:
+                answers[(submission.id, ans["question_id"])] = Answer(
+                    submission_id=submission.id,
+                    question_id=ans["question_id"],
+                    answer_text=ans.get("answer_text"),
+                    selected_choice_id=ans.get("selected_choice_id"),
+                    selected_mask=ans.get("selected_mask"),
+                )
+
+        if len(finalized) < len(records):
+            logger.info("Skipped %s record(s) of already applied submissions", len(records) - len(finalized))
+        Submission.objects.bulk_update(finalized, ["status", "submitted_at"], batch_size=500)
+        apply_drafts(s.id for s in finalized)
+        Answer.objects.bulk_create(
+            list(answers.values()),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["submission", "question"],
+            update_fields=["selected_choice", "selected_mask", "answer_text"],
+        )
+
+    return [s.id for s in finalized]
+
+
+submission_log = SubmissionLog()
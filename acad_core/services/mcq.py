@@ -0,0 +1,205 @@
+import json
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Exists, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+# every MCQ answer of the given submissions, scored in one statement from the selected and
+# correct choice bitmasks; same rules and rounding as score_mask()
+SCORE_MCQ_ANSWERS_SQL = """
+UPDATE acad_core_answer AS a
+SET score = CASE
+        WHEN x.selected = 0 THEN 0
+        WHEN NOT x.allow_multiple THEN CASE WHEN x.hits > 0 AND x.wrong = 0 THEN x.max_score ELSE 0 END
+        WHEN x.selected = x.correct THEN x.max_score
+        WHEN x.hits > x.wrong THEN round(x.max_score * (x.hits - x.wrong) / x.total, 2)
+        ELSE 0
+    END,
+    feedback = jsonb_build_object('feedback_text', CASE
+        WHEN x.selected = 0 THEN 'No choice selected'
+        WHEN NOT x.allow_multiple THEN CASE WHEN x.hits > 0 AND x.wrong = 0 THEN 'Correct' ELSE 'Incorrect' END
+        WHEN x.selected = x.correct THEN 'Correct'
+        WHEN x.hits > x.wrong THEN format('Partially correct (%%s of %%s)', x.hits, x.total)
+        ELSE 'Incorrect'
+    END)
+FROM (
+    SELECT y.id, y.max_score, y.allow_multiple, y.selected, y.correct,
+           bit_count((y.selected & y.correct)::bit(64)) AS hits,
+           bit_count((y.selected & ~y.correct)::bit(64)) AS wrong,
+           bit_count(y.correct::bit(64)) AS total
+    FROM (
+        SELECT a2.id, q.max_score, q.allow_multiple, q.correct_mask AS correct,
+               coalesce(a2.selected_mask, CAST(1 AS BIGINT) << c.ordinal, 0) AS selected
+        FROM acad_core_answer AS a2
+        JOIN acad_core_question AS q ON q.id = a2.question_id
+        LEFT JOIN acad_core_choice AS c ON c.id = a2.selected_choice_id
+        WHERE a2.submission_id = ANY(%(submission_ids)s)
+          AND q.type = 'MCQ'
+    ) AS y
+) AS x
+WHERE a.id = x.id
+"""
+
+# score and grading_details of each submission, aggregated from its answers;
+# same shape as BaseGrader.grade_submissions writes
+GRADE_SUBMISSIONS_SQL = """
+UPDATE acad_core_submission AS s
+SET score = t.score,
+    status = 'GRADED',
+    graded_at = %(graded_at)s,
+    grading_details = jsonb_build_object('total_marks', t.total_marks, 'grader', %(grader)s::jsonb)
+        || CASE WHEN %(compact)s THEN jsonb_build_object('answered', t.answered)
+                ELSE jsonb_build_object('per_question', t.per_question) END
+FROM (
+    SELECT i.id,
+           coalesce(round(sum(a.score), 2), 0) AS score,
+           coalesce(round(sum(q.max_score), 2), 0)::float AS total_marks,
+           count(a.id) AS answered,
+           coalesce(jsonb_agg(jsonb_build_object(
+               'question_id', q.id,
+               'score', a.score::float,
+               'max_score', q.max_score::float,
+               'feedback', a.feedback->>'feedback_text'
+           ) ORDER BY a.id) FILTER (WHERE a.id IS NOT NULL), '[]'::jsonb) AS per_question
+    FROM unnest(%(submission_ids)s::bigint[]) AS i(id)
+    LEFT JOIN acad_core_answer AS a ON a.submission_id = i.id
+    LEFT JOIN acad_core_question AS q ON q.id = a.question_id
+    GROUP BY i.id
+) AS t
+WHERE s.id = t.id
+RETURNING s.id, s.grading_details
+"""
+
+
+def choice_mask(ordinals):
+    """ Bitmask of a set of choice ordinals. """
+    mask = 0
+    for ordinal in ordinals:
+        mask |= 1 << ordinal
+    return mask
+
+
+def score_mask(selected, correct, allow_multiple, max_score):
+    """
+    Score an MCQ selection from bitmasks over choice ordinals; returns (score, feedback).
+
+    Single-select questions get full marks when the selection is a correct choice.
+    Multi-select questions get (correct picked - wrong picked) / correct choices
+    of the marks, never below zero, rounded half up to 2 decimals.
+    """
+    if not selected:
+        return 0.0, "No choice selected"
+    hits = (selected & correct).bit_count()
+    wrong = (selected & ~correct).bit_count()
+    if not allow_multiple:
+        return (float(max_score), "Correct") if hits and not wrong else (0.0, "Incorrect")
+    if selected == correct:
+        return float(max_score), "Correct"
+    total = correct.bit_count()
+    if hits > wrong:
+        score = (Decimal(str(max_score)) * (hits - wrong) / total).quantize(Decimal("0.01"), ROUND_HALF_UP)
+        return float(score), f"Partially correct ({hits} of {total})"
+    return 0.0, "Incorrect"
+
+
+def refresh_correct_masks(question_ids):
+    """ Recompute Question.correct_mask from the questions' choices, in one UPDATE. """
+    from ..models import Choice, Question
+
+    masks = (
+        Choice.objects
+        .filter(question=OuterRef('pk'), is_correct=True)
+        .order_by()
+        .values('question')
+        .annotate(mask=Sum(Value(1, output_field=BigIntegerField()).bitleftshift(F('ordinal'))))
+        .values('mask')
+    )
+    Question.objects.filter(pk__in=question_ids).update(
+        correct_mask=Coalesce(Subquery(masks, output_field=BigIntegerField()), 0)
+    )
+
+
+def free_ordinals(held):
+    """
+    Ordinals new choices may take, lowest first: {question_id: [ordinal, ...]} for
+    `held`, {question_id: ordinals of the choices the question keeps}.
+
+    A deleted choice's bit can still be set in saved answers' (or autosaved drafts')
+    selected masks, where it would count as a selection of any new choice given the same
+    ordinal; such ordinals are never handed out again.
+    """
+    from ..models import Answer, AnswerDraft, Choice
+
+    referenced = dict.fromkeys(held, 0)
+    for model in (Answer, AnswerDraft):
+        for question_id, mask in (
+            model.objects
+            .filter(question_id__in=list(held))
+            .exclude(selected_mask=None)
+            .values_list('question_id', 'selected_mask')
+            .distinct()
+        ):
+            referenced[question_id] |= mask
+    return {
+        question_id: [
+            ordinal for ordinal in range(Choice.MAX_PER_QUESTION)
+            if ordinal not in ordinals and not referenced[question_id] >> ordinal & 1
+        ]
+        for question_id, ordinals in held.items()
+    }
+
+
+def objective_submissions(submission_ids=None, exam_id=None):
+    """
+    Ids of the submissions with MCQ answers only, among `submission_ids`,
+    or among the SUBMITTED submissions of exam `exam_id`.
+    """
+    from ..models import Answer, Question, Submission
+
+    if submission_ids is not None:
+        submissions = Submission.objects.filter(pk__in=submission_ids)
+    else:
+        submissions = Submission.objects.filter(exam_id=exam_id, status=Submission.Status.SUBMITTED)
+    open_answers = Answer.objects.filter(submission=OuterRef('pk')).exclude(question__type=Question.Types.MCQ)
+    return list(submissions.filter(~Exists(open_answers)).order_by('pk').values_list('pk', flat=True))
+
+
+def grade_objective_submissions(submission_ids, grader_info):
+    """
+    Grade MCQ-only submissions inside the database (PostgreSQL 14+): one UPDATE ... FROM
+    scoring their answers from the choice bitmasks and Question.max_score, one aggregate
+    UPDATE of the submissions, then one INSERT of their grading events. No answer is
+    loaded into Python.
+    Returns {submission_id: grading_details}.
+    """
+    from django.conf import settings
+    from .audit import record_graded_in_database
+
+    if not submission_ids:
+        return {}
+    submission_ids = list(submission_ids)
+    graded_at = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(SCORE_MCQ_ANSWERS_SQL, {'submission_ids': submission_ids})
+        cursor.execute(GRADE_SUBMISSIONS_SQL, {
+            'submission_ids': submission_ids,
+            'graded_at': graded_at,
+            'grader': json.dumps(grader_info),
+            'compact': getattr(settings, 'GRADING_DETAILS_MODE', 'full') == 'compact',
+        })
+        rows = cursor.fetchall()
+        record_graded_in_database(submission_ids, grader_info, graded_at)
+    # psycopg decodes jsonb; other drivers may hand back text
+    return {pk: json.loads(details) if isinstance(details, str) else details for pk, details in rows}
+
+
+def grade_objective_exam(exam_id, grader_info, batch_size=1000):
+    """ Grade every SUBMITTED, MCQ-only submission of an exam in the database, in batches. """
+    submission_ids = objective_submissions(exam_id=exam_id)
+    results = {}
+    for i in range(0, len(submission_ids), batch_size):
+        results.update(grade_objective_submissions(submission_ids[i:i + batch_size], grader_info))
+    return results
@@ -0,0 +1,57 @@
+import random
+
+from .snapshot import get_exam_lookup
+
+_random = random.SystemRandom()
+
+
+def draw_paper(exam, rng=None):
+    """
+    Question ids of one student's paper: `exam.questions_per_paper` questions drawn
+    from the exam's pool, stratified by (type, metadata.difficulty) so every paper
+    keeps the pool's mix, listed in exam order. Returns None when the exam has no pool
+    (everyone gets all).
+
+    Each stratum gets its proportional share of the paper, rounded down; the seats
+    left over go to the strata with the largest remainders (ties broken at random).
+    """
+    k = exam.questions_per_paper
+    lookup = get_exam_lookup(exam.id, exam.version)
+    strata = lookup["strata"]
+    total = sum(len(ids) for ids in strata.values())
+    if not k or k >= total:
+        return None
+
+    rng = rng or _random
+    quotas, remainders = {}, []
+    for key, ids in strata.items():
+        share = k * len(ids) / total
+        quotas[key] = int(share)
+        remainders.append((share - int(share), rng.random(), key))
+    for _, _, key in sorted(remainders, reverse=True)[:k - sum(quotas.values())]:
+        quotas[key] += 1
+
+    drawn = set()
+    for key, ids in strata.items():
+        drawn.update(rng.sample(ids, quotas[key]))
+    return [question_id for question_id in lookup["questions"] if question_id in drawn]
+
+
+def page_exam_questions(exam_id, cursor, limit):
+    """
+    One page of an exam's question ids in exam order (position, then id), for students
+    who get every question: the ids after question `cursor` (the previous page's last),
+    read with a keyset query on the (exam, position, id) index. Returns (ids, has_more),
+    or None when `cursor` is not a question of the exam.
+    """
+    from django.db.models import Q
+    from ..models import Question
+
+    questions = Question.objects.filter(exam_id=exam_id)
+    if cursor is not None:
+        position = questions.filter(pk=cursor).values_list("position", flat=True).first()
+        if position is None:
+            return None
+        questions = questions.filter(Q(position__gt=position) | Q(position=position, id__gt=cursor))
+    ids = list(questions.order_by("position", "id").values_list("id", flat=True)[:limit + 1])
+    return ids[:limit], len(ids) > limit
@@ -0,0 +1,225 @@
+import json
+import logging
+from threading import Thread
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# single statement patching score, total_marks and the question's per_question entry
+# of every affected submission; deltas are passed as parallel arrays
+PATCH_SUBMISSIONS_SQL = """
+UPDATE acad_core_submission AS s
+SET score = s.score + d.delta,
+    graded_at = %(graded_at)s,
+    grading_details = CASE
+        WHEN s.grading_details ? 'per_question' THEN jsonb_set(
+            s.grading_details || jsonb_build_object(
+                'total_marks', round(
+                    (s.grading_details->>'total_marks')::numeric + %(max_score)s - coalesce((
+                        SELECT (e->>'max_score')::numeric
+                        FROM jsonb_array_elements(s.grading_details->'per_question') AS e
+                        WHERE (e->>'question_id')::bigint = %(question_id)s
+                    ), %(max_score)s), 2),
+                'regraded_at', %(now)s
+            ),
+            '{per_question}',
+            (
+                SELECT coalesce(jsonb_agg(
+                    CASE WHEN (t.e->>'question_id')::bigint = %(question_id)s
+                        THEN t.e || jsonb_build_object(
+                            'score', a.score::float,
+                            'max_score', %(max_score)s::float,
+                            'feedback', a.feedback->>'feedback_text'
+                        )
+                        ELSE t.e
+                    END ORDER BY t.ord
+                ), '[]'::jsonb)
+                FROM jsonb_array_elements(s.grading_details->'per_question') WITH ORDINALITY AS t(e, ord)
+            )
+        )
+        -- compact storage: no breakdown to patch, recompute total_marks from the answers
+        ELSE s.grading_details || jsonb_build_object(
+            'total_marks', (
+                SELECT coalesce(sum(q.max_score), 0)::float
+                FROM acad_core_answer AS a2
+                JOIN acad_core_question AS q ON q.id = a2.question_id
+                WHERE a2.submission_id = s.id
+            ),
+            'regraded_at', %(now)s
+        )
+    END
+FROM unnest(%(submission_ids)s::bigint[], %(deltas)s::numeric[]) AS d(submission_id, delta),
+     acad_core_answer AS a
+WHERE s.id = d.submission_id
+  AND a.submission_id = s.id
+  AND a.question_id = %(question_id)s
+RETURNING s.id, s.score
+"""
+
+
+def grading_fingerprint(question):
+    """ Everything about a question that can change how its answers are scored. """
+    return (
+        question.type,
+        question.allow_multiple,
+        question.reference_answer,
+        str(question.max_score),
+        json.dumps(question.metadata, sort_keys=True, default=str),
+        tuple(question.choices.order_by('id').values_list('id', 'ordinal', 'is_correct')),
+    )
+
+
+def regrade_question(question_id, submission_ids):
+    """
+    Rescore only the answers to one question within the given GRADED submissions,
+    then patch each submission's score and per-question breakdown with the difference,
+    and append a REGRADE event for each answer rescored.
+    Re-running it for the same question state changes no score, which makes chunks safe to retry.
+    Returns the number of answers whose score changed.
+    """
+    from ..models import Answer, GradingEvent, Question, Submission
+    from . import _get_grader
+    from .audit import grading_event, record_events
+
+    grader = _get_grader()
+    question = Question.objects.get(pk=question_id)
+
+    with transaction.atomic():
+        # locked until the patch commits: a concurrent regrade of the same question
+        # waits, then reads the new scores and finds no delta left to add
+        answers = list(
+            Answer.objects
+            .filter(
+                question_id=question_id,
+                submission_id__in=submission_ids,
+                submission__status=Submission.Status.GRADED,
+            )
+            .select_related('selected_choice')
+            .select_for_update(of=('self',))
+            .order_by('id')
+        )
+
+        scores = grader.score_answers(answers, {question.id: question})
+
+        deltas = {}
+        changed = []
+        for ans in answers:
+            score, fb = scores[ans.pk]
+            deltas[ans.submission_id] = round(score - float(ans.score or 0), 2)
+            if deltas[ans.submission_id] or ans.feedback != {'feedback_text': fb}:
+                changed.append(ans)
+            ans.score = score
+            ans.feedback = {'feedback_text': fb}
+
+        Answer.objects.bulk_update(changed, ['score', 'feedback'], batch_size=1000)
+        # every submission is patched, even with a zero delta: a new max_score changes
+        # total_marks and the breakdown of answers whose score stayed the same
+        totals = _patch_submissions(question, deltas, answers)
+        grader_info = grader.grader_info()
+        record_events([
+            grading_event(
+                ans.submission_id, question.exam_id, GradingEvent.Kinds.REGRADE, grader_info,
+                totals.get(ans.submission_id), [(question.id, ans.score)],
+            )
+            for ans in changed
+        ])
+
+    return sum(1 for delta in deltas.values() if delta)
+
+
+def _patch_submissions(question, deltas, answers):
+    """ Returns {submission_id: new score} of the patched submissions. """
+    from ..models import Answer, Submission
+
+    if not deltas:
+        return {}
+    graded_at = timezone.now()
+    now = graded_at.isoformat()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(PATCH_SUBMISSIONS_SQL, {
+                'question_id': question.id,
+                'max_score': question.max_score,
+                'now': now,
+                'graded_at': graded_at,
+                'submission_ids': list(deltas.keys()),
+                'deltas': list(deltas.values()),
+            })
+            return dict(cursor.fetchall())
+
+    # other databases: same patch, applied in Python
+    max_score = float(question.max_score)
+    by_submission = {ans.submission_id: ans for ans in answers}
+    submissions = Submission.objects.only('id', 'score', 'graded_at', 'grading_details').in_bulk(deltas.keys())
+    total_marks = dict(
+        Answer.objects
+        .filter(submission_id__in=deltas.keys())
+        .values('submission_id')
+        .annotate(total=Sum('question__max_score'))
+        .values_list('submission_id', 'total')
+    )
+    for pk, submission in submissions.items():
+        submission.score = round(float(submission.score or 0) + deltas[pk], 2)
+        details = submission.grading_details or {}
+        if 'per_question' not in details:
+            details['total_marks'] = float(total_marks.get(pk) or 0)
+        for entry in details.get('per_question', []):
+            if entry.get('question_id') == question.id:
+                answer = by_submission[pk]
+                details['total_marks'] = round(
+                    float(details.get('total_marks', 0)) - entry.get('max_score', max_score) + max_score, 2
+                )
+                entry.update(
+                    score=float(answer.score),
+                    max_score=max_score,
+                    feedback=answer.feedback['feedback_text'],
+                )
+        details['regraded_at'] = now
+        submission.grading_details = details
+        submission.graded_at = graded_at
+    Submission.objects.bulk_update(submissions.values(), ['score', 'graded_at', 'grading_details'], batch_size=500)
+    return {pk: submission.score for pk, submission in submissions.items()}
+
+
+def regrade_exam_question(question_id, batch_size=500):
+    """ Delta-regrade one question across every graded submission of its exam, in chunks. """
+    from ..models import Question, Submission
+
+    exam_id = Question.objects.values_list('exam_id', flat=True).get(pk=question_id)
+    submission_ids = list(
+        Submission.objects
+        .filter(exam_id=exam_id, status=Submission.Status.GRADED)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    changed = 0
+    for i in range(0, len(submission_ids), batch_size):
+        changed += regrade_question(question_id, submission_ids[i:i + batch_size])
+    return changed
+
+
+def regrade_question_async(question_id):
+    """
+    Background delta regrade after a question edit.
+    Runs in a separate thread; use `manage.py regrade` for very large exams.
+    """
+    regrade_questions_async([question_id])
+
+
+def regrade_questions_async(question_ids):
+    """ Background delta regrade of several edited questions, one after the other in a single thread. """
+    def run():
+        try:
+            for question_id in question_ids:
+                try:
+                    regrade_exam_question(question_id)
+                except Exception:
+                    logger.exception("Regrade of question %s failed", question_id)
+        finally:
+            close_old_connections()
+
+    Thread(target=run, daemon=True).start()
@@ -0,0 +1,162 @@
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class Rule:
+    label: str
+    weight: float
+    required: bool
+
+
+WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CompiledRubric:
+    """
+    A rubric compiled for a single pass over the answer, however many terms it has.
+
+    Keywords and their synonyms are indexed by their first word: the answer is split
+    into words once, and each word looks up only the phrases starting with it, so their
+    cost does not grow with the number of keywords.
+
+    Regex rules keep their own compiled pattern and are each searched once. `re` has no
+    multi-pattern matching: an alternation reports one alternative per position and
+    finditer skips overlapping matches, so a combined pattern would miss rules ("photo"
+    inside "photosynthesis"); it would also renumber the groups backreferences refer to.
+    """
+    phrases: dict  # first word -> ((words, rule index), ...)
+    patterns: tuple  # ((compiled regex, rule index), ...)
+    rules: tuple
+    total_weight: float
+    missing_required_cap: float
+
+    def match(self, text):
+        """ Indexes of the rules found in `text`. """
+        matched = set()
+        if not text:
+            return matched
+        words = WORD.findall(text.lower())
+        for i, word in enumerate(words):
+            for phrase, index in self.phrases.get(word, ()):
+                if len(phrase) == 1 or tuple(words[i:i + len(phrase)]) == phrase:
+                    matched.add(index)
+        for pattern, index in self.patterns:
+            if pattern.search(text):
+                matched.add(index)
+        return matched
+
+    def score(self, text, max_score):
+        """ Returns (score, feedback) for `text`, scaled to `max_score`. """
+        matched = self.match(text)
+        earned = sum(self.rules[i].weight for i in matched)
+        fraction = earned / self.total_weight if self.total_weight else 0.0
+        missing_required = [rule.label for i, rule in enumerate(self.rules) if rule.required and i not in matched]
+        if missing_required:
+            fraction = min(fraction, self.missing_required_cap)
+
+        feedback = f"Rubric {earned:g}/{self.total_weight:g}"
+        found = [self.rules[i].label for i in sorted(matched)]
+        missing = [rule.label for i, rule in enumerate(self.rules) if i not in matched]
+        if found:
+            feedback += "; matched: " + ", ".join(found)
+        if missing:
+            feedback += "; missing: " + ", ".join(missing)
+        if missing_required:
+            feedback += "; required not met: " + ", ".join(missing_required)
+        return round(fraction * float(max_score), 2), feedback
+
+
+def _weight(value):
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid rubric weight: {value!r}")
+    if weight < 0:
+        raise ValueError("rubric weights must not be negative")
+    return weight
+
+
+def _as_list(value):
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+@lru_cache(maxsize=1024)
+def _compile(rubric_json):
+    rubric = json.loads(rubric_json)
+    if not isinstance(rubric, dict):
+        raise ValueError("rubric must be an object")
+    synonyms = rubric.get("synonyms") or {}
+
+    rules, phrases, patterns = [], {}, []
+    for keyword in rubric.get("keywords") or []:
+        if isinstance(keyword, str):
+            keyword = {"term": keyword}
+        term = str(keyword.get("term") or "").strip()
+        if not term:
+            raise ValueError("rubric keywords need a term")
+        index = len(rules)
+        rules.append(Rule(term, _weight(keyword.get("weight", 1)), bool(keyword.get("required", False))))
+        # matched on whole words, case-insensitive; punctuation and spacing between words don't matter
+        for alternative in {term, *_as_list(keyword.get("synonyms")), *_as_list(synonyms.get(term))}:
+            words = tuple(WORD.findall(str(alternative).lower()))
+            if words:
+                phrases.setdefault(words[0], set()).add((words, index))
+
+    for item in rubric.get("patterns") or []:
+        if isinstance(item, str):
+            item = {"regex": item}
+        regex = item.get("regex")
+        if not regex or not isinstance(regex, str):
+            raise ValueError(f"rubric regex {regex!r} must be a non-empty string")
+        try:
+            patterns.append((re.compile(regex, re.IGNORECASE), len(rules)))
+        except re.error as exc:
+            raise ValueError(f"invalid rubric regex {regex!r}: {exc}")
+        rules.append(Rule(
+            str(item.get("label") or regex), _weight(item.get("weight", 1)), bool(item.get("required", False)),
+        ))
+
+    if not rules:
+        raise ValueError("rubric needs at least one keyword or pattern")
+
+    return CompiledRubric(
+        phrases={word: tuple(entries) for word, entries in phrases.items()},
+        patterns=tuple(patterns),
+        rules=tuple(rules),
+        total_weight=sum(rule.weight for rule in rules),
+        missing_required_cap=min(_weight(rubric.get("missing_required_cap", 0)), 1.0),
+    )
+
+
+def compile_rubric(rubric):
+    """
+    Compile a rubric (the "rubric" entry of Question.metadata); raises ValueError when invalid.
+
+        {
+          "keywords": ["chlorophyll", {"term": "light energy", "synonyms": ["sunlight"], "weight": 2, "required": true}],
+          "synonyms": {"chlorophyll": ["chlorophyl"]},
+          "patterns": [{"regex": "6\\s*co2", "label": "equation", "weight": 1}],
+          "missing_required_cap": 0.5
+        }
+
+    Every rule counts once, for its weight (default 1); the score is the matched share
+    of the total weight. When a required rule is missing, the share is capped at
+    missing_required_cap (default 0). Compiled rubrics are cached by content,
+    so an edited rubric gets compiled again and an unchanged one is reused.
+    """
+    return _compile(json.dumps(rubric, sort_keys=True))
+
+
+def question_rubric(question):
+    """ The question's compiled rubric, or None when its metadata has none. """
+    # kept on the instance: a grading batch shares one Question object per question
+    if "_rubric" not in question.__dict__:
+        rubric = (question.metadata or {}).get("rubric")
+        question._rubric = compile_rubric(rubric) if rubric else None
+    return question._rubric
@@ -0,0 +1,193 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from ..renderers import render_json
+from ..utils.compression import precompress
+
+
+def _serializer_class(kind):
+    from ..serializers import ExamPlayQuestionSerializer, QuestionSerializer
+    # students never receive correct flags or reference answers
+    return {"student": ExamPlayQuestionSerializer, "admin": QuestionSerializer}[kind]
+
+
+def snapshot_key(exam_id, version, kind):
+    return f"exam-snapshot:{exam_id}:v{version}:{kind}"
+
+
+def question_key(exam_id, version, question_id, kind):
+    return f"exam-question:{exam_id}:v{version}:{question_id}:{kind}"
+
+
+def details_key(exam_id, version):
+    return f"exam-details:{exam_id}:v{version}"
+
+
+def lookup_key(exam_id, version):
+    # f2: the maps include choice ordinals and multi-select questions
+    return f"exam-lookup:{exam_id}:v{version}:f2"
+
+
+def meta_key(exam_id):
+    return f"exam-meta:{exam_id}"
+
+
+def _ttl():
+    return getattr(settings, "EXAM_SNAPSHOT_TTL", 3600)
+
+
+def _get_or_build(key, build):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, _ttl())
+    return value
+
+
+def get_exam_meta(exam_id):
+    """
+    {"id", "created_by_id", "start_at", "end_at"} of an exam, or None when it does not exist.
+    Permission checks read it instead of loading the exam; missing exams are cached too.
+    """
+    from ..models import Exam
+
+    try:
+        exam_id = int(exam_id)
+    except (TypeError, ValueError):
+        return None
+    key = meta_key(exam_id)
+    meta = cache.get(key)
+    if meta is None:
+        meta = Exam.objects.filter(pk=exam_id).values("id", "created_by_id", "start_at", "end_at").first() or {}
+        cache.set(key, meta, getattr(settings, "EXAM_META_TTL", 60))
+    return meta or None
+
+
+def forget_exam_meta(exam_id):
+    cache.delete(meta_key(exam_id))
+
+
+def get_exam_snapshot(exam_id, version, kind="student"):
+    """
+    Serialized questions of an exam, cached per exam version.
+
+    Returns {"questions": [...], "body": bytes, "encodings": {encoding: bytes}} where
+    body is the rendered JSON list and encodings its pre-compressed variants, so a
+    response served from the snapshot is neither re-serialized nor re-compressed.
+    A version bump (any exam or question change) makes old snapshots unreachable.
+    """
+    return _get_or_build(snapshot_key(exam_id, version, kind), lambda: build_exam_snapshot(exam_id, kind))
+
+
+def build_exam_snapshot(exam_id, kind="student"):
+    from ..models import Question
+
+    questions = Question.objects.filter(exam_id=exam_id).prefetch_related("choices").order_by("position", "id")
+    data = list(_serializer_class(kind)(questions, many=True).data)
+    body = render_json(data)
+    return {
+        "questions": data,
+        "body": body,
+        "encodings": precompress(body),
+    }
+
+
+def get_exam_questions(exam_id, version, question_ids, kind="student"):
+    """
+    Serialized questions by id, in the given order, from per-question cache entries.
+    Only the misses are loaded from the database, so the cost of a page is bounded by
+    its size rather than by the size of the exam.
+    """
+    from ..models import Question
+
+    keys = {question_id: question_key(exam_id, version, question_id, kind) for question_id in question_ids}
+    cached = cache.get_many(list(keys.values()))
+    missing = [question_id for question_id, key in keys.items() if key not in cached]
+    if missing:
+        questions = Question.objects.filter(exam_id=exam_id, id__in=missing).prefetch_related("choices")
+        built = {
+            question_key(exam_id, version, data["id"], kind): data
+            for data in _serializer_class(kind)(questions, many=True).data
+        }
+        cache.set_many(built, _ttl())
+        cached.update(built)
+    return [cached[keys[question_id]] for question_id in question_ids if keys[question_id] in cached]
+
+
+def get_exam_details(exam_id, version):
+    """ The student-facing exam details (no questions), cached per exam version. """
+    from ..models import Exam
+
+    return _get_or_build(details_key(exam_id, version), lambda: build_exam_details(Exam.objects.get(pk=exam_id)))
+
+
+def build_exam_details(exam):
+    from ..serializers import ExamDetailsSerializer
+
+    data = dict(ExamDetailsSerializer(exam).data)
+    data["total_questions"] = exam.questions.count()
+    if exam.questions_per_paper:
+        # what each student gets when the exam draws from a pool
+        data["total_questions"] = min(data["total_questions"], exam.questions_per_paper)
+    return data
+
+
+def get_exam_lookup(exam_id, version):
+    """
+    Lookup maps of an exam, cached per version:
+      "questions": {question_id: type}, in exam order
+      "choices":   {choice_id: question_id}
+      "ordinals":  {choice_id: ordinal}, the choice's bit in answer masks
+      "multiple":  {question_id, ...}, MCQs accepting several choices
+      "strata":    {(type, difficulty): [question_id, ...]}, the pool index papers are drawn from
+    Answers are validated and papers drawn without querying questions and choices.
+    """
+    return _get_or_build(lookup_key(exam_id, version), lambda: build_exam_lookup(exam_id))
+
+
+def build_exam_lookup(exam_id):
+    from ..models import Choice, Question
+
+    questions, strata, multiple = {}, {}, set()
+    rows = (
+        Question.objects
+        .filter(exam_id=exam_id)
+        .order_by("position", "id")
+        .values_list("id", "type", "metadata__difficulty", "allow_multiple")
+    )
+    for question_id, question_type, difficulty, allow_multiple in rows:
+        questions[question_id] = question_type
+        strata.setdefault((question_type, str(difficulty or "")), []).append(question_id)
+        if allow_multiple:
+            multiple.add(question_id)
+    choices, ordinals = {}, {}
+    for choice_id, question_id, ordinal in (
+        Choice.objects.filter(question__exam_id=exam_id).values_list("id", "question_id", "ordinal")
+    ):
+        choices[choice_id] = question_id
+        ordinals[choice_id] = ordinal
+    return {
+        "questions": questions,
+        "choices": choices,
+        "ordinals": ordinals,
+        "multiple": multiple,
+        "strata": strata,
+    }
+
+
+def warm_exam_caches(exam):
+    """
+    Rebuild every cached representation of the exam's current version with a full TTL:
+    student snapshot, per-question entries, details and lookup maps.
+    """
+    snapshot = build_exam_snapshot(exam.id, "student")
+    entries = {
+        question_key(exam.id, exam.version, data["id"], "student"): data
+        for data in snapshot["questions"]
+    }
+    entries.update({
+        snapshot_key(exam.id, exam.version, "student"): snapshot,
+        details_key(exam.id, exam.version): build_exam_details(exam),
+        lookup_key(exam.id, exam.version): build_exam_lookup(exam.id),
+    })
+    cache.set_many(entries, _ttl())
@@ -0,0 +1,54 @@
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def exams_to_warm(minutes, now=None):
+    """
+    Exams starting within the next `minutes` or currently open, whose student snapshot
+    of the current version is not cached. A `--loop` pass therefore leaves warm exams
+    alone and only rebuilds those that were edited, expired or never warmed.
+    """
+    from ..models import Exam
+    from .snapshot import snapshot_key
+    now = now or timezone.now()
+    exams = list(
+        Exam.objects.filter(
+            Q(start_at__gt=now, start_at__lte=now + timedelta(minutes=minutes))
+            | Q(start_at__lte=now, end_at__gte=now)
+        ).order_by("start_at")
+    )
+    keys = {exam.id: snapshot_key(exam.id, exam.version, "student") for exam in exams}
+    cached = cache.get_many(list(keys.values()))
+    return [exam for exam in exams if keys[exam.id] not in cached]
+
+
+def warm_exam(exam):
+    """
+    Fill the caches the first wave of retrieve/start/autosave/submit requests would
+    otherwise build concurrently: the student snapshot, exam details, the question/choice
+    lookup maps and the reference-answer vectors used by the similarity grader.
+    """
+    from ..models import Question
+    from .grader import reference_vectors
+    from .snapshot import warm_exam_caches
+
+    warm_exam_caches(exam)
+    written = Question.objects.filter(exam=exam).exclude(type=Question.Types.MCQ).only("id", "reference_answer")
+    return len(reference_vectors(list(written), refresh=True))
+
+
+def warm_upcoming_exams(minutes):
+    """ Warm every exam returned by exams_to_warm(); returns {exam_id: reference vectors warmed}. """
+    warmed = {}
+    for exam in exams_to_warm(minutes):
+        try:
+            warmed[exam.id] = warm_exam(exam)
+        except Exception:
+            logger.exception("Warming exam %s failed", exam.id)
+    return warmed
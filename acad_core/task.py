@@ -1,13 +1,11 @@
-import asyncio
-from .services import grade_submission
+from .services.dispatcher import dispatcher, PRIORITY_NORMAL
 
 
-def grade_submission_async(submission_id: int):
+def grade_submission_async(submission_id: int, exam_id: int, priority: int = PRIORITY_NORMAL):
     """
     Background grading task.
-    Runs in a separate thread.
+    Queues the submission on the in-process grading dispatcher, whose worker
+    threads grade per-exam batches with priority and per-exam fairness.
     Celery or other task queues can be used in production.  
     """
-    grade_submission(submission_id)
-
-
+    dispatcher.submit(submission_id, exam_id, priority=priority)
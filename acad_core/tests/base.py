@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Exam, Question
+
+User = get_user_model()
+
+TEST_CACHES = {
+    alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": f"tests-{alias}"}
+    for alias in ("default", "throttle")
+}
+
+
+@override_settings(CACHES=TEST_CACHES, SUBMISSION_INGEST_MODE="direct")
+class ExamTestCase(TestCase):
+    """ An admin-owned exam open for the next hour, and API clients for the admin and a student. """
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        now = timezone.now()
+        self.admin = User.objects.create_user(username="admin", email="admin@example.com", is_staff=True)
+        self.student = User.objects.create_user(username="student", email="student@example.com")
+        self.exam = Exam.objects.create(
+            title="Biology", course="BIO101", created_by=self.admin,
+            start_at=now - timedelta(hours=1), end_at=now + timedelta(hours=1),
+        )
+        self.admin_client = self.client_for(self.admin)
+        self.student_client = self.client_for(self.student)
+
+    @staticmethod
+    def client_for(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def upload(self, questions):
+        response = self.admin_client.post(
+            f"/api/admin/exams/{self.exam.id}/upload-questions/", {"questions": questions}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return list(Question.objects.filter(exam=self.exam).order_by("position", "id"))
+
+    def mcq(self, text="2+2", texts="abc", correct="a"):
+        return {"type": "MCQ", "text": text, "choices": [{"text": t, "is_correct": t == correct} for t in texts]}
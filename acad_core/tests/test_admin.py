@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from django.test import Client
+
+from ..models import Exam, Submission
+from ..utils.pagination import EstimatedCountPaginator
+from .base import ExamTestCase, User
+
+
+class AdminChangelistTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        superuser = User.objects.create_superuser(username="root", email="root@example.com", password="x")
+        self.browser = Client()
+        self.browser.force_login(superuser)
+
+    def add_exams(self, count):
+        for i in range(Exam.objects.count() - 1, Exam.objects.count() - 1 + count):
+            exam = Exam.objects.create(title=f"Exam {i}", course="BIO", created_by=self.admin)
+            for j, (status, score) in enumerate([
+                (Submission.Status.GRADED, 2), (Submission.Status.GRADED, 3), (Submission.Status.SUBMITTED, None),
+            ]):
+                student = User.objects.create_user(username=f"e{exam.id}s{j}", email=f"e{exam.id}s{j}@example.com")
+                Submission.objects.create(student=student, exam=exam, status=status, score=score)
+
+    def changelist(self, model):
+        response = self.browser.get(f"/admin/acad_core/{model}/")
+        self.assertEqual(response.status_code, 200)
+        return response.context["cl"].result_list
+
+    def test_exam_counts_are_annotated(self):
+        self.add_exams(2)
+
+        exams = {exam.title: exam for exam in self.changelist("exam")}
+
+        self.assertEqual(
+            (exams["Exam 0"].submission_count, exams["Exam 0"].graded_count, exams["Exam 0"].average_score),
+            (3, 2, Decimal("2.5")),
+        )
+        self.assertEqual((exams["Biology"].submission_count, exams["Biology"].graded_count), (0, 0))
+        self.assertIsNone(exams["Biology"].average_score)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        # session, user, counts, the page and the list filter / date hierarchy values;
+        # no query per row for the exam statistics or the related exam and student
+        self.add_exams(2)
+        with self.assertNumQueries(6):
+            self.changelist("exam")
+        with self.assertNumQueries(6):
+            self.changelist("submission")
+
+        self.add_exams(3)
+        with self.assertNumQueries(6):
+            self.changelist("exam")
+        with self.assertNumQueries(6):
+            self.changelist("submission")
+
+
+class EstimatedCountPaginatorTests(ExamTestCase):
+
+    def test_exact_count_off_postgresql(self):
+        for i in range(3):
+            student = User.objects.create_user(username=f"p{i}", email=f"p{i}@example.com")
+            Submission.objects.create(student=student, exam=self.exam)
+        paginator = EstimatedCountPaginator(Submission.objects.order_by("pk"), 2)
+        paginator.estimate_threshold = 0
+
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from ..models import Answer, GradingEvent, Submission
+from ..services import grade_submissions
+from ..services.audit import pack_scores, unpack_scores
+from ..services.regrade import regrade_question
+from .base import ExamTestCase
+
+
+class PackScoresTests(SimpleTestCase):
+
+    def test_round_trip_in_hundredths(self):
+        scores = [(3, 1), (2 ** 40, 0.25), (7, None)]
+
+        question_ids, packed = pack_scores(scores)
+
+        self.assertEqual((len(question_ids), len(packed)), (24, 12))
+        # big-endian, as int8send/int4send write them in the database
+        self.assertEqual(question_ids[:8], (3).to_bytes(8, "big"))
+        self.assertEqual(packed[4:8], (25).to_bytes(4, "big"))
+        self.assertEqual(unpack_scores(memoryview(question_ids), packed), [(3, 1.0), (2 ** 40, 0.25), (7, 0.0)])
+
+
+class GradingEventTests(ExamTestCase):
+
+    def test_grading_and_regrade_append_events(self):
+        mcq, short = self.upload([self.mcq(), {"type": "SHORT", "text": "mitosis", "reference_answer": "cell division"}])
+        submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.SUBMITTED)
+        Answer.objects.create(submission=submission, question=mcq, selected_choice=mcq.choices.get(ordinal=0), selected_mask=1)
+        Answer.objects.create(submission=submission, question=short, answer_text="cell division")
+
+        grade_submissions([submission.id])
+        mcq.choices.filter(ordinal=0).update(is_correct=False)
+        mcq.choices.filter(ordinal=1).update(is_correct=True)
+        mcq.correct_mask = 2
+        mcq.save(update_fields=["correct_mask"])
+        regrade_question(mcq.id, [submission.id])
+
+        grade, regrade = GradingEvent.objects.filter(submission=submission).order_by("created_at", "id")
+        self.assertEqual((grade.kind, regrade.kind), (GradingEvent.Kinds.GRADE, GradingEvent.Kinds.REGRADE))
+        self.assertEqual(grade.exam_id, self.exam.id)
+        self.assertIn("/", grade.grader)
+        self.assertEqual(dict(unpack_scores(grade.question_ids, grade.scores))[mcq.id], 1.0)
+        self.assertEqual(dict(unpack_scores(regrade.question_ids, regrade.scores))[mcq.id], 0.0)
+        submission.refresh_from_db()
+        self.assertEqual(regrade.score, submission.score)
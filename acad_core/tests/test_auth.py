@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from ..authenticator import get_or_rotate_token
+from .base import TEST_CACHES, User
+
+
+@override_settings(CACHES=TEST_CACHES, PASSWORD_HASH_ITERATIONS=1000)
+class LoginTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="ada", email="Ada@Example.com", password="s3cret-pass")
+        self.client = APIClient()
+
+    def login(self, email="ada@example.COM", password="s3cret-pass"):
+        return self.client.post("/api/auth/login/", {"email": email, "password": password}, format="json")
+
+    def test_email_is_matched_case_insensitively(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login(password="wrong").status_code, 401)
+
+    def test_fresh_token_is_reused_and_stale_one_rotated(self):
+        first = get_or_rotate_token(self.user)
+        self.assertEqual(get_or_rotate_token(self.user).key, first.key)
+
+        # less than TOKEN_REUSE_MIN_REMAINING_HOURS left to live
+        Token.objects.filter(pk=first.pk).update(created=first.created - timedelta(hours=20))
+        rotated = get_or_rotate_token(self.user)
+
+        self.assertNotEqual(rotated.key, first.key)
+        self.assertEqual(Token.objects.filter(user=self.user).count(), 1)
+
+    def test_login_rehashes_to_the_configured_cost(self):
+        self.assertEqual(identify_hasher(self.user.password).decode(self.user.password)["iterations"], 1000)
+
+        with self.settings(PASSWORD_HASH_ITERATIONS=1200):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).decode(self.user.password)["iterations"], 1200)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from ..models import Answer, AnswerDraft, Exam, Submission
+from ..services.autosave import save_drafts
+from ..services.deadlines import sweep_expired_submissions
+from .base import ExamTestCase
+
+
+class AutosaveSubmitTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.q_mcq, self.q_short = self.upload([
+            self.mcq(), {"type": "SHORT", "text": "mitosis", "reference_answer": "cell division"},
+        ])
+        self.right, self.wrong, _ = self.q_mcq.choices.order_by("ordinal")
+        response = self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.submission = Submission.objects.get(student=self.student, exam=self.exam)
+
+    def autosave(self, answers):
+        return self.student_client.post(f"/api/user/exams/{self.exam.id}/autosave/", {"answers": answers}, format="json")
+
+    def submit(self, answers):
+        with mock.patch("acad_core.task.grade_submission_async") as grade:
+            response = self.student_client.post(f"/api/user/exams/{self.exam.id}/submit/", {"answers": answers}, format="json")
+        return response, grade
+
+    def test_drafts_are_kept_apart_until_submit(self):
+        self.autosave([{"question_id": self.q_mcq.id, "selected_choice_id": self.wrong.id}])
+        self.autosave([{"question_id": self.q_mcq.id, "selected_choice_id": self.right.id},
+                       {"question_id": self.q_short.id, "answer_text": "draft"}])
+
+        self.assertEqual(AnswerDraft.objects.filter(submission=self.submission).count(), 2)
+        self.assertFalse(Answer.objects.filter(submission=self.submission).exists())
+
+    def test_submit_applies_drafts_then_submitted_answers(self):
+        self.autosave([{"question_id": self.q_mcq.id, "selected_choice_id": self.right.id},
+                       {"question_id": self.q_short.id, "answer_text": "draft"}])
+
+        response, grade = self.submit([{"question_id": self.q_short.id, "answer_text": "cell division"}])
+
+        self.assertEqual(response.status_code, 201, response.data)
+        grade.assert_called_once_with(self.submission.id, self.exam.id)
+        answers = {a.question_id: a for a in Answer.objects.filter(submission=self.submission)}
+        self.assertEqual(answers[self.q_mcq.id].selected_choice_id, self.right.id)
+        self.assertEqual(answers[self.q_short.id].answer_text, "cell division")
+        self.assertFalse(AnswerDraft.objects.filter(submission=self.submission).exists())
+
+    def test_autosave_after_submit_is_rejected(self):
+        self.submit([{"question_id": self.q_short.id, "answer_text": "cell division"}])
+
+        response = self.autosave([{"question_id": self.q_short.id, "answer_text": "late"}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Answer.objects.get(submission=self.submission, question=self.q_short).answer_text, "cell division")
+
+    def test_save_drafts_refuses_finalized_submissions(self):
+        # an autosave validated before the submit committed
+        Submission.objects.filter(pk=self.submission.pk).update(status=Submission.Status.GRADED)
+
+        saved = save_drafts(self.submission.id, [{"question_id": self.q_short.id, "answer_text": "late"}])
+
+        self.assertFalse(saved)
+        self.assertFalse(AnswerDraft.objects.filter(submission=self.submission).exists())
+
+    def test_second_submit_is_rejected(self):
+        self.submit([{"question_id": self.q_short.id, "answer_text": "cell division"}])
+
+        response, grade = self.submit([{"question_id": self.q_short.id, "answer_text": "again"}])
+
+        self.assertEqual(response.status_code, 400)
+        grade.assert_not_called()
+        self.assertEqual(Answer.objects.get(submission=self.submission, question=self.q_short).answer_text, "cell division")
+
+    def test_sweep_applies_drafts_of_expired_submissions(self):
+        self.autosave([{"question_id": self.q_mcq.id, "selected_choice_id": self.right.id}])
+        end_at = timezone.now() - timedelta(minutes=5)
+        Exam.objects.filter(pk=self.exam.pk).update(end_at=end_at)
+
+        swept = sweep_expired_submissions(now=timezone.now())
+
+        self.assertEqual(swept, {self.exam.id: 1})
+        self.submission.refresh_from_db()
+        self.assertNotEqual(self.submission.status, Submission.Status.PENDING)
+        self.assertEqual(Answer.objects.get(submission=self.submission).selected_choice_id, self.right.id)
+        self.assertFalse(AnswerDraft.objects.filter(submission=self.submission).exists())
@@ -0,0 +1,31 @@
+from ..models import Choice, Exam, Question
+from .base import ExamTestCase
+
+
+class CloneTests(ExamTestCase):
+
+    def test_clone_maps_choices_to_the_new_questions(self):
+        self.upload([
+            self.mcq("m0", correct="b"), self.mcq("m1", texts="abcd", correct="d"),
+            {"type": "SHORT", "text": "s0", "reference_answer": "x"},
+        ])
+
+        response = self.admin_client.post(f"/api/admin/exams/{self.exam.id}/clone/", {"title": "Biology II"}, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data["questions_copied"], response.data["choices_copied"]), (3, 7))
+        copy = Exam.objects.get(pk=response.data["id"])
+        self.assertEqual(copy.title, "Biology II")
+        self.assertEqual(self.shape(copy), self.shape(self.exam))
+        # every copied choice hangs off a copied question of the same text
+        for choice in Choice.objects.filter(question__exam=copy).select_related("question"):
+            self.assertTrue(Question.objects.filter(exam=self.exam, text=choice.question.text).exists())
+        self.assertEqual(Choice.objects.filter(question__exam=self.exam).count(), 7)
+
+    @staticmethod
+    def shape(exam):
+        return sorted(
+            (q.type, q.text, q.position, q.correct_mask,
+             sorted((c.ordinal, c.text, c.is_correct) for c in q.choices.all()))
+            for q in Question.objects.filter(exam=exam).prefetch_related("choices")
+        )
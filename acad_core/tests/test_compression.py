@@ -0,0 +1,57 @@
+import gzip
+import json
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from ..renderers import ORJSONRenderer
+from ..utils.compression import negotiate_encoding
+from .base import ExamTestCase
+
+
+class NegotiateEncodingTests(SimpleTestCase):
+
+    def test_gzip_is_picked_unless_refused(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(negotiate_encoding(None))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+
+    def test_output_matches_drf(self):
+        data = {
+            "score": Decimal("2.50"), "at": datetime(2026, 1, 2, 3, 4, 5, 600, tzinfo=dt_timezone.utc),
+            "text": "line\u2028separator", 7: [None, True, 1.5],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class CompressionMiddlewareTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.upload([
+            {"type": "SHORT", "text": f"question {i} " + "lorem ipsum " * 20, "reference_answer": "x"} for i in range(10)
+        ])
+        self.url = f"/api/admin/exams/{self.exam.id}/questions/"
+
+    def test_large_responses_are_gzipped_with_a_weak_etag(self):
+        plain = self.admin_client.get(self.url)
+        compressed = self.admin_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertEqual(compressed["ETag"], "W/" + plain["ETag"])
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), json.loads(plain.content))
+
+    def test_small_responses_are_left_alone(self):
+        response = self.student_client.get(f"/api/user/exams/{self.exam.id}/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
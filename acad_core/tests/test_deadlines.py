@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from ..models import Exam, Submission
+from ..services.deadlines import next_deadline, recover_ungraded_submissions, sweep_expired_submissions
+from .base import ExamTestCase, User
+
+
+class DeadlineSweepTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.upload([{"type": "SHORT", "text": "mitosis", "reference_answer": "cell division"}])
+        self.now = timezone.now()
+
+    def pending(self, n, started_at=None):
+        submission_ids = []
+        for _ in range(n):
+            i = User.objects.count()
+            student = User.objects.create_user(username=f"d{i}", email=f"d{i}@example.com")
+            submission_ids.append(Submission.objects.create(
+                student=student, exam=self.exam, status=Submission.Status.PENDING, started_at=started_at,
+            ).id)
+        return submission_ids
+
+    def test_expired_submissions_are_graded_in_slices(self):
+        submission_ids = self.pending(5)
+        Exam.objects.filter(pk=self.exam.pk).update(end_at=self.now - timedelta(minutes=1))
+
+        with mock.patch("acad_core.services.grade_submissions") as grade:
+            swept = sweep_expired_submissions(now=self.now, batch_size=2)
+
+        self.assertEqual(swept, {self.exam.id: 5})
+        self.assertEqual([call.args[0] for call in grade.call_args_list],
+                         [submission_ids[0:2], submission_ids[2:4], submission_ids[4:]])
+        self.assertEqual(
+            set(Submission.objects.values_list("status", flat=True)), {Submission.Status.SUBMITTED}
+        )
+
+    def test_duration_deadline_and_grace(self):
+        Exam.objects.filter(pk=self.exam.pk).update(duration=timedelta(minutes=30))
+        (late,) = self.pending(1, started_at=self.now - timedelta(minutes=31))
+        (on_time,) = self.pending(1, started_at=self.now - timedelta(minutes=10))
+
+        with self.settings(DEADLINE_SWEEP_GRACE=120):
+            self.assertEqual(sweep_expired_submissions(now=self.now), {})
+            # the late submission's deadline passed a minute ago: it is due when its grace period ends
+            self.assertEqual(next_deadline(now=self.now), self.now + timedelta(minutes=-1, seconds=120))
+
+        with self.settings(DEADLINE_SWEEP_GRACE=15):
+            self.assertEqual(sweep_expired_submissions(now=self.now), {self.exam.id: 1})
+            # next up is the other one, 20 minutes from now
+            self.assertEqual(next_deadline(now=self.now), self.now + timedelta(minutes=20, seconds=15))
+        statuses = dict(Submission.objects.values_list("id", "status"))
+        self.assertEqual(statuses[late], Submission.Status.GRADED)
+        self.assertEqual(statuses[on_time], Submission.Status.PENDING)
+
+    def test_lost_grading_jobs_are_recovered(self):
+        (stuck,) = self.pending(1)
+        (recent,) = self.pending(1)
+        Submission.objects.filter(pk=stuck).update(
+            status=Submission.Status.SUBMITTED, submitted_at=self.now - timedelta(minutes=10),
+        )
+        Submission.objects.filter(pk=recent).update(status=Submission.Status.SUBMITTED, submitted_at=self.now)
+
+        self.assertEqual(recover_ungraded_submissions(now=self.now), 1)
+
+        statuses = dict(Submission.objects.values_list("id", "status"))
+        self.assertEqual((statuses[stuck], statuses[recent]), (Submission.Status.GRADED, Submission.Status.SUBMITTED))
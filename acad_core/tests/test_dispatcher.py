@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..services.dispatcher import PRIORITY_HIGH, PRIORITY_LOW, GradingDispatcher
+
+
+@mock.patch.object(GradingDispatcher, "_ensure_workers")
+class GradingDispatcherTests(SimpleTestCase):
+
+    def batches(self, dispatcher, n):
+        order = []
+        for _ in range(n):
+            exam_id, batch = dispatcher._next_batch()
+            dispatcher._done(exam_id, len(batch))
+            order.append((exam_id, batch))
+        return order
+
+    def test_small_exam_does_not_wait_behind_a_large_backlog(self, _):
+        dispatcher = GradingDispatcher(workers=1, batch_size=2)
+        for submission_id in range(100, 110):
+            dispatcher.submit(submission_id, exam_id=1)
+        dispatcher.submit(200, exam_id=2)
+        dispatcher.submit(300, exam_id=3)
+        dispatcher.submit(301, exam_id=3)
+
+        order = self.batches(dispatcher, 4)
+
+        # equal virtual times go to the shorter queue
+        self.assertEqual(order, [(2, [200]), (3, [300, 301]), (1, [100, 101]), (1, [102, 103])])
+
+    def test_priorities_are_strict_and_weights_share_the_workers(self, _):
+        dispatcher = GradingDispatcher(workers=1, batch_size=1)
+        dispatcher.set_weight(2, 2)
+        for submission_id in range(4):
+            dispatcher.submit(10 + submission_id, exam_id=1)
+            dispatcher.submit(20 + submission_id, exam_id=2)
+        dispatcher.submit(30, exam_id=3, priority=PRIORITY_LOW)
+        dispatcher.submit(40, exam_id=4, priority=PRIORITY_HIGH)
+
+        order = [exam_id for exam_id, _ in self.batches(dispatcher, 10)]
+
+        self.assertEqual(order[0], 4)
+        self.assertEqual(order[-1], 3)
+        # exam 2 gets two batches for each of exam 1's while both are queued
+        self.assertEqual(order[1:7].count(2), 4)
+
+    def test_stats_report_depth_and_in_flight(self, _):
+        dispatcher = GradingDispatcher(workers=1, batch_size=2)
+        for submission_id in range(3):
+            dispatcher.submit(submission_id, exam_id=7)
+        dispatcher._next_batch()
+
+        stats = dispatcher.stats()[7]
+
+        self.assertEqual((stats["depth"], stats["in_flight"], stats["priorities"]), (1, 2, [1]))
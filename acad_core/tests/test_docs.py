@@ -0,0 +1,79 @@
+import importlib
+import json
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import Resolver404, clear_url_caches, resolve
+
+import acad_engine.urls
+from acad_engine.urls import lazy_view
+
+from .base import ExamTestCase
+
+
+class LazyViewTests(SimpleTestCase):
+
+    def test_view_is_imported_on_its_first_request(self):
+        view = mock.Mock(return_value="response")
+        with mock.patch("acad_engine.urls.import_string") as import_string:
+            import_string.return_value.as_view.return_value = view
+            dispatch = lazy_view("some.View", url_name="schema")
+            import_string.assert_not_called()
+
+            request = RequestFactory().get("/")
+            self.assertEqual(dispatch(request, pk=1), "response")
+            dispatch(request)
+
+        import_string.assert_called_once_with("some.View")
+        import_string.return_value.as_view.assert_called_once_with(url_name="schema")
+        view.assert_called_with(request)
+
+
+class DocsTests(ExamTestCase):
+
+    def test_docs_pages_render(self):
+        for url in ("/api/docs/", "/api/redoc/"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIn(b"/api/schema/", response.content)
+
+    def test_deferred_annotations_reach_the_schema(self):
+        quiet = {**settings.SPECTACULAR_SETTINGS, "DISABLE_ERRORS_AND_WARNINGS": True}
+        with override_settings(SPECTACULAR_SETTINGS=quiet):
+            response = self.client.get("/api/schema/", {"format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        paths = json.loads(response.content)["paths"]
+        created = paths["/api/auth/register/"]["post"]["responses"]["201"]["content"]["application/json"]["schema"]
+        self.assertEqual(set(created["properties"]), {"message", "user_id"})
+        # @extend_schema(exclude=True)
+        self.assertNotIn("/api/auth/verify-email/", paths)
+
+    def test_docs_urls_are_dropped_when_disabled(self):
+        def reload_urls():
+            importlib.reload(acad_engine.urls)
+            clear_url_caches()
+
+        self.addCleanup(reload_urls)
+        with override_settings(API_DOCS_ENABLED=False):
+            reload_urls()
+            for url in ("/api/schema/", "/api/docs/", "/api/redoc/"):
+                with self.assertRaises(Resolver404, msg=url):
+                    resolve(url)
+            self.assertEqual(resolve("/api/user/exams/").url_name, "user-exam-list")
+
+
+class StartupProfileTests(SimpleTestCase):
+
+    def test_reports_import_time_per_module(self):
+        out = StringIO()
+
+        call_command("startup_profile", "--module", "acad_core.utils.schema", "--limit", "3", "--packages", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertRegex(lines[0], r"^\d+ modules imported, [\d.]+ ms of import time")
+        self.assertIn("module", lines[1])
+        self.assertIn("package", out.getvalue())
@@ -0,0 +1,86 @@
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Answer, Exam, Submission
+from ..services import grade_submissions
+from .base import ExamTestCase
+
+
+class ETagTests(ExamTestCase):
+
+    def get(self, client, url, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return client.get(url, **headers)
+
+    def test_exam_details_revalidate_until_the_exam_changes(self):
+        url = f"/api/user/exams/{self.exam.id}/"
+        first = self.get(self.student_client, url)
+        etag = first["ETag"]
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.get(self.student_client, url, etag).status_code, 304)
+        self.assertEqual(self.get(self.student_client, url, f"W/{etag}").status_code, 304)
+
+        self.exam.title = "Biology (revised)"
+        self.exam.save()
+        changed = self.get(self.student_client, url, etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_admin_question_list_changes_with_its_questions(self):
+        url = f"/api/admin/exams/{self.exam.id}/questions/"
+        etag = self.get(self.admin_client, url)["ETag"]
+        self.assertEqual(self.get(self.admin_client, url, etag).status_code, 304)
+
+        self.upload([{"type": "SHORT", "text": "q", "reference_answer": "x"}])
+
+        self.assertEqual(self.get(self.admin_client, url, etag).status_code, 200)
+
+    def test_results_change_once_graded(self):
+        (question,) = self.upload([{"type": "SHORT", "text": "q", "reference_answer": "x"}])
+        submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.SUBMITTED)
+        Answer.objects.create(submission=submission, question=question, answer_text="x")
+        url = f"/api/user/exams/{self.exam.id}/results/"
+
+        waiting = self.get(self.student_client, url)
+        self.assertEqual(waiting.status_code, 202)
+        self.assertEqual(self.get(self.student_client, url, waiting["ETag"]).status_code, 304)
+
+        grade_submissions([submission.id])
+
+        graded = self.get(self.student_client, url, waiting["ETag"])
+        self.assertEqual(graded.status_code, 200)
+        self.assertEqual(self.get(self.student_client, url, graded["ETag"]).status_code, 304)
+
+    def test_revalidated_results_poll_skips_the_grading_details(self):
+        (question,) = self.upload([{"type": "SHORT", "text": "q", "reference_answer": "x"}])
+        submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.SUBMITTED)
+        Answer.objects.create(submission=submission, question=question, answer_text="x")
+        grade_submissions([submission.id])
+        url = f"/api/user/exams/{self.exam.id}/results/"
+        etag = self.get(self.student_client, url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(self.student_client, url, etag).status_code, 304)
+
+        self.assertFalse([q["sql"] for q in queries.captured_queries if "grading_details" in q["sql"]])
+
+
+class ExamVersionTests(ExamTestCase):
+
+    def test_save_bumps_the_version_in_its_update(self):
+        version = self.exam.version
+
+        with self.assertNumQueries(1):
+            self.exam.save()
+        self.assertEqual(self.exam.version, version + 1)
+
+    def test_failed_save_keeps_the_version(self):
+        Exam.objects.create(title="Chemistry", course=self.exam.course, created_by=self.admin)
+        version = self.exam.version
+        self.exam.title = "Chemistry"
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.exam.save()
+
+        self.assertEqual(self.exam.version, version)
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..models import Answer, Submission
+from ..services import grade_submissions
+from ..services.grader import AnswerScorer, LLMGrader, RoutedGrader
+from .base import ExamTestCase
+
+
+class FailingScorer(AnswerScorer):
+
+    def score(self, answers, questions, context):
+        raise RuntimeError("scorer down")
+
+
+def fake_llm(content):
+    """ An OpenAI-shaped client whose completions all reply `content`. """
+    reply = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=mock.Mock(return_value=reply))))
+
+
+class RoutedGraderTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mcq, self.essay = self.upload([
+            self.mcq(),
+            {"type": "ESSAY", "text": "Explain mitosis", "reference_answer": "cell division", "max_score": 4},
+        ])
+        self.submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.SUBMITTED)
+        right = self.mcq.choices.get(is_correct=True)
+        Answer.objects.create(submission=self.submission, question=self.mcq, selected_choice=right, selected_mask=1 << right.ordinal)
+        Answer.objects.create(submission=self.submission, question=self.essay, answer_text="mitosis is cell division")
+
+    def scores(self):
+        return {a.question_id: (float(a.score), a.feedback["feedback_text"]) for a in self.submission.answers.all()}
+
+    def grade(self, essay_route):
+        grader = RoutedGrader(routes={"MCQ": "choice", "ESSAY": essay_route}, fallback="similarity")
+        return grader.grade_submissions([self.submission.id])[self.submission.id]
+
+    def test_failing_route_falls_back(self):
+        details = self.grade("acad_core.tests.test_grader.FailingScorer")
+
+        scores = self.scores()
+        self.assertEqual(scores[self.mcq.id], (1.0, "Correct"))
+        self.assertTrue(scores[self.essay.id][1].startswith("Similarity"))
+        self.assertEqual(details["grader"]["routes"]["ESSAY"], "acad_core.tests.test_grader.FailingScorer")
+
+    def test_llm_route_scores_essays(self):
+        client = fake_llm('{"score": 3.5, "feedback": "Mostly right."}')
+        with mock.patch.object(LLMGrader, "_build_client", return_value=client):
+            self.grade("llm")
+
+        self.assertEqual(self.scores()[self.essay.id], (3.5, "Mostly right."))
+        # only the essay went to the model
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+
+    def test_submission_without_answers_is_graded(self):
+        Answer.objects.filter(submission=self.submission).delete()
+
+        details = grade_submissions([self.submission.id])[self.submission.id]
+
+        self.submission.refresh_from_db()
+        self.assertEqual((self.submission.status, float(self.submission.score)), (Submission.Status.GRADED, 0.0))
+        self.assertEqual(details["per_question"], [])
+
+
+class LLMVerdictTests(SimpleTestCase):
+
+    def test_scores_are_clamped(self):
+        self.assertEqual(LLMGrader.parse_verdict('{"score": 7, "feedback": "ok"}', 4), (4.0, "ok"))
+        self.assertEqual(LLMGrader.parse_verdict('{"score": -1}', 4), (0.0, ""))
+
+    def test_unusable_replies_raise(self):
+        for content in ("not json", '{"feedback": "no score"}', '{"score": "NaN"}', '{"score": null}'):
+            with self.subTest(content=content), self.assertRaises(ValueError):
+                LLMGrader.parse_verdict(content, 4)
@@ -0,0 +1,166 @@
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import Answer, AnswerDraft, Submission
+from ..services.ingest import SubmissionLog
+from .base import ExamTestCase, User
+
+
+class SubmissionLogTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.question,) = self.upload([{"type": "SHORT", "text": "mitosis", "reference_answer": "cell division"}])
+        self.students = [
+            User.objects.create_user(username=f"s{i}", email=f"s{i}@example.com") for i in range(3)
+        ]
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.log = SubmissionLog(directory=directory, fsync=False)
+
+    def record(self, student, text):
+        return {
+            "student_id": student.id, "exam_id": self.exam.id, "started_at": None, "submitted_at": timezone.now(),
+            "answers": [{"question_id": self.question.id, "answer_text": text}],
+        }
+
+    def test_drain_applies_records_in_batches(self):
+        Submission.objects.create(student=self.students[0], exam=self.exam, status=Submission.Status.PENDING)
+        for student in self.students:
+            self.log.append(self.record(student, "cell division"))
+        batches = []
+
+        finalized = self.log.drain(batch_size=2, on_batch=batches.append)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(sorted(finalized), sorted(Submission.objects.filter(exam=self.exam).values_list("id", flat=True)))
+        self.assertEqual(
+            set(Submission.objects.filter(exam=self.exam).values_list("status", flat=True)), {Submission.Status.SUBMITTED}
+        )
+        self.assertEqual(Answer.objects.filter(question=self.question, answer_text="cell division").count(), 3)
+
+    def test_segment_is_queued_before_it_is_applied(self):
+        pending = Submission.objects.create(student=self.students[0], exam=self.exam, status=Submission.Status.PENDING)
+        for student in self.students[:2]:
+            self.log.append(self.record(student, "cell division"))
+        statuses = []
+
+        def on_batch(ids):
+            statuses.append(Submission.objects.get(student=self.students[1]).status)
+
+        self.log.drain(batch_size=1, on_batch=on_batch)
+
+        # the second record's submission was already claimed when the first batch committed
+        self.assertEqual(statuses, [Submission.Status.QUEUED, Submission.Status.SUBMITTED])
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, Submission.Status.SUBMITTED)
+
+    def test_first_record_wins_within_and_across_batches(self):
+        student = self.students[0]
+
+        for batch_size in (500, 1):
+            with self.subTest(batch_size=batch_size):
+                Submission.objects.filter(student=student).delete()
+                for text in ("first", "second", "third"):
+                    self.log.append(self.record(student, text))
+
+                (submission_id,) = self.log.drain(batch_size=batch_size)
+
+                self.assertEqual(Answer.objects.get(submission_id=submission_id).answer_text, "first")
+
+    def test_finalized_submissions_are_left_untouched(self):
+        graded = Submission.objects.create(student=self.students[0], exam=self.exam, status=Submission.Status.GRADED, score=1)
+        Answer.objects.create(submission=graded, question=self.question, answer_text="final", score=1)
+        self.log.append(self.record(self.students[0], "logged"))
+
+        self.assertEqual(self.log.drain(), [])
+
+        graded.refresh_from_db()
+        self.assertEqual(graded.status, Submission.Status.GRADED)
+        self.assertEqual(Answer.objects.get(submission=graded).answer_text, "final")
+
+    def test_replayed_segment_is_harmless(self):
+        self.log.append(self.record(self.students[0], "cell division"))
+        self.log.drain()
+        # a segment left behind by an interrupted drain, replayed by the next one
+        self.log.append(self.record(self.students[0], "replayed"))
+        self.log.path.rename(self.log.directory / "submissions.1.draining")
+        batches = []
+
+        self.assertEqual(self.log.drain(on_batch=batches.append), [])
+
+        self.assertEqual(batches, [])
+        self.assertEqual(Submission.objects.filter(exam=self.exam).count(), 1)
+        self.assertEqual(Answer.objects.get(question=self.question).answer_text, "cell division")
+        self.assertEqual(list(self.log.directory.iterdir()), [])
+
+    def test_concurrent_appends_share_fsyncs(self):
+        log = SubmissionLog(directory=self.log.directory, fsync=True)
+        with mock.patch("acad_core.services.ingest.os.fsync") as fsync:
+            threads = [
+                threading.Thread(target=log.append, args=(self.record(student, "x"),)) for student in self.students * 10
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertGreaterEqual(fsync.call_count, 1)
+        self.assertLessEqual(fsync.call_count, len(threads))
+        self.assertEqual((log._written, log._synced), (len(threads), len(threads)))
+        self.assertEqual(len(log.path.read_bytes().splitlines()), len(threads))
+
+
+class LogModeSubmitTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.question,) = self.upload([{"type": "SHORT", "text": "mitosis", "reference_answer": "cell division"}])
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.log = SubmissionLog(directory=directory, fsync=False)
+        patcher = mock.patch("acad_core.services.ingest.submission_log", self.log)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, action, text):
+        with override_settings(SUBMISSION_INGEST_MODE="log"):
+            return self.student_client.post(
+                f"/api/user/exams/{self.exam.id}/{action}/",
+                {"answers": [{"question_id": self.question.id, "answer_text": text}]}, format="json",
+            )
+
+    def answer_text(self):
+        return Answer.objects.get(question=self.question).answer_text
+
+    def test_submit_touches_no_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post("submit", "cell division")
+
+        # validation reads the exam and the student's submission; nothing is written
+        self.assertTrue(all(q["sql"].startswith("SELECT") for q in queries.captured_queries), queries.captured_queries)
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual((response.data["submission_id"], response.data["status"]), (None, "QUEUED"))
+        self.assertFalse(Submission.objects.exists())
+        (submission_id,) = self.log.drain()
+        self.assertEqual(Submission.objects.get(pk=submission_id).student, self.student)
+        self.assertEqual(self.answer_text(), "cell division")
+
+    def test_logged_submission_rejects_autosave_and_submit(self):
+        self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+        self.post("autosave", "draft")
+        self.assertEqual(self.post("submit", "submitted").status_code, 202)
+
+        self.assertEqual(self.post("autosave", "late").status_code, 400)
+        self.assertEqual(self.post("submit", "again").status_code, 400)
+
+        self.assertEqual(len(self.log.drain()), 1)
+        self.assertEqual(self.answer_text(), "submitted")
+        self.assertFalse(AnswerDraft.objects.exists())
@@ -0,0 +1,104 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+from ..models import Answer, Choice, Question, Submission
+from ..services import grade_submissions
+from ..services.mcq import choice_mask, refresh_correct_masks, score_mask
+from .base import ExamTestCase, User
+
+
+class ScoreMaskTests(SimpleTestCase):
+
+    def test_single_and_multi_select(self):
+        correct = choice_mask([0, 2, 3])
+        cases = [
+            (choice_mask([2]), False, (3.0, "Correct")),
+            (choice_mask([1]), False, (0.0, "Incorrect")),
+            (correct, True, (3.0, "Correct")),
+            (choice_mask([0, 2]), True, (2.0, "Partially correct (2 of 3)")),
+            (choice_mask([0, 2, 1]), True, (1.0, "Partially correct (2 of 3)")),
+            (choice_mask([0, 1]), True, (0.0, "Incorrect")),
+            (0, True, (0.0, "No choice selected")),
+        ]
+        for selected, allow_multiple, expected in cases:
+            with self.subTest(selected=bin(selected), allow_multiple=allow_multiple):
+                self.assertEqual(score_mask(selected, correct, allow_multiple, 3), expected)
+
+    def test_partial_credit_rounds_half_up(self):
+        self.assertEqual(score_mask(0b001, 0b111, True, 1), (0.33, "Partially correct (1 of 3)"))
+        self.assertEqual(score_mask(0b011, 0b111, True, 1), (0.67, "Partially correct (2 of 3)"))
+
+
+class MultiSelectSubmitTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.multi, self.single = self.upload([
+            {**self.mcq("pick two", texts="abcd"), "allow_multiple": True, "max_score": 2,
+             "choices": [{"text": t, "is_correct": t in "ac"} for t in "abcd"]},
+            self.mcq("pick one"),
+        ])
+        self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+
+    def submit(self, answers):
+        with mock.patch("acad_core.task.grade_submission_async"):
+            return self.student_client.post(f"/api/user/exams/{self.exam.id}/submit/", {"answers": answers}, format="json")
+
+    def test_selected_choices_are_stored_as_a_mask_and_scored(self):
+        a, b, c, _ = self.multi.choices.order_by("ordinal")
+
+        response = self.submit([{"question_id": self.multi.id, "selected_choice_ids": [a.id, b.id, c.id]}])
+
+        self.assertEqual(response.status_code, 201, response.data)
+        answer = Answer.objects.get(question=self.multi)
+        self.assertEqual((answer.selected_mask, answer.selected_choice_id), (choice_mask([0, 1, 2]), None))
+        grade_submissions([response.data["submission_id"]])
+        answer.refresh_from_db()
+        # 2 correct picks minus 1 wrong, over 2 correct choices
+        self.assertEqual(float(answer.score), 1.0)
+
+    def test_single_select_questions_take_one_choice(self):
+        a, b, _ = self.single.choices.order_by("ordinal")
+
+        response = self.submit([{"question_id": self.single.id, "selected_choice_ids": [a.id, b.id]}])
+
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(connection.vendor == "postgresql", "MCQ answers are scored in SQL on PostgreSQL only")
+class ScoreMaskParityTests(ExamTestCase):
+
+    def test_sql_scoring_matches_score_mask(self):
+        from .services.grader import RoutedGrader
+        from .services.mcq import grade_objective_submissions
+
+        cases = []  # (question, selected mask)
+        for allow_multiple, correct in ((False, {1}), (True, {0, 2}), (True, {0, 1, 2, 62})):
+            question = Question.objects.create(
+                exam=self.exam, text=f"q{len(cases)}", type=Question.Types.MCQ, max_score=3, allow_multiple=allow_multiple,
+            )
+            Choice.objects.bulk_create([
+                Choice(question=question, text=str(ordinal), ordinal=ordinal, is_correct=ordinal in correct)
+                for ordinal in (0, 1, 2, 3, 62)
+            ])
+            for selected in ({1}, {3}, {0, 2}, {0, 3}, {0, 1, 2}, {0, 2, 62}, {0, 1, 2, 3, 62}):
+                cases.append((question, choice_mask(selected)))
+        refresh_correct_masks(Question.objects.filter(exam=self.exam).values_list("id", flat=True))
+        cases.append((cases[0][0], None))  # nothing selected
+        cases.append((cases[0][0], 0))
+
+        answers = []
+        for i, (question, selected) in enumerate(cases):
+            student = User.objects.create_user(username=f"p{i}", email=f"p{i}@example.com")
+            submission = Submission.objects.create(student=student, exam=self.exam, status=Submission.Status.SUBMITTED)
+            answers.append(Answer.objects.create(submission=submission, question=question, selected_mask=selected))
+
+        grade_objective_submissions([a.submission_id for a in answers], RoutedGrader().grader_info())
+
+        for answer, (question, selected) in zip(answers, cases):
+            question.refresh_from_db()
+            answer.refresh_from_db()
+            expected = score_mask(selected or 0, question.correct_mask, question.allow_multiple, question.max_score)
+            self.assertEqual((float(answer.score), answer.feedback["feedback_text"]), expected, (question.text, selected))
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from ..models import Question
+from .base import ExamTestCase
+
+
+class QuestionPagingTests(ExamTestCase):
+
+    def test_cursor_pages_follow_the_paper_order(self):
+        questions = self.upload([{"type": "SHORT", "text": f"q{i}", "reference_answer": "x"} for i in range(7)])
+        response = self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+        self.assertNotIn("questions", response.data)
+        self.assertEqual(response.data["total_questions"], 7)
+
+        url, seen, pages = response.data["questions_url"] + "?limit=3", [], 0
+        while url:
+            body = self.student_client.get(url).json()
+            self.assertEqual(body["count"], 7)
+            seen += [q["id"] for q in body["results"]]
+            url, pages = body["next"], pages + 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [q.id for q in questions])
+
+    def test_bad_cursor_is_rejected(self):
+        self.upload([{"type": "SHORT", "text": "q", "reference_answer": "x"}])
+        self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+
+        response = self.student_client.get(f"/api/user/exams/{self.exam.id}/questions/?cursor=abc")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_pages_are_read_without_the_exam_lookup(self):
+        questions = self.upload([{"type": "SHORT", "text": f"q{i}", "reference_answer": "x"} for i in range(5)])
+        # tied positions fall back to id order
+        Question.objects.filter(pk__in=[q.id for q in questions[1:3]]).update(position=1)
+        self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+        url = f"/api/user/exams/{self.exam.id}/questions/?limit=2&cursor={questions[1].id}"
+
+        with mock.patch("acad_core.views.get_exam_lookup") as lookup:
+            body = self.student_client.get(url).json()
+
+        lookup.assert_not_called()
+        self.assertEqual([q["id"] for q in body["results"]], [questions[2].id, questions[3].id])
+        self.assertEqual(body["count"], 5)
+        self.assertIsNotNone(body["next"])
@@ -0,0 +1,50 @@
+import random
+from collections import Counter
+
+from ..models import Exam
+from ..services.papers import draw_paper
+from .base import ExamTestCase
+
+
+class PaperDrawTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        questions = (
+            [{"type": "SHORT", "text": f"easy {i}", "reference_answer": "x", "metadata": {"difficulty": "easy"}} for i in range(6)]
+            + [{"type": "SHORT", "text": f"hard {i}", "reference_answer": "x", "metadata": {"difficulty": "hard"}} for i in range(3)]
+            + [self.mcq(f"m{i}") for i in range(3)]
+        )
+        self.questions = {q.id: q for q in self.upload(questions)}
+        self.exam.questions_per_paper = 4
+        self.exam.save()
+
+    def stratum(self, question_id):
+        question = self.questions[question_id]
+        return question.type, question.metadata.get("difficulty")
+
+    def test_papers_keep_the_pool_mix_in_exam_order(self):
+        for seed in range(20):
+            paper = draw_paper(self.exam, rng=random.Random(seed))
+
+            self.assertEqual(Counter(map(self.stratum, paper)),
+                             {("SHORT", "easy"): 2, ("SHORT", "hard"): 1, ("MCQ", None): 1})
+            self.assertEqual(paper, sorted(paper, key=lambda pk: self.questions[pk].position))
+
+    def test_no_pool_when_the_paper_covers_the_exam(self):
+        Exam.objects.filter(pk=self.exam.pk).update(questions_per_paper=12)
+        self.exam.refresh_from_db()
+
+        self.assertIsNone(draw_paper(self.exam))
+
+    def test_students_only_get_and_answer_their_paper(self):
+        response = self.student_client.post(f"/api/user/exams/{self.exam.id}/start/")
+        paper = [q["id"] for q in response.data["questions"]]
+        outside = next(pk for pk in self.questions if pk not in paper)
+
+        self.assertEqual(len(paper), 4)
+        response = self.student_client.post(
+            f"/api/user/exams/{self.exam.id}/autosave/",
+            {"answers": [{"question_id": outside, "answer_text": "x"}]}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from ..models import Exam, Submission
+from .base import ExamTestCase, User
+
+
+class ExamOwnerTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other_admin = User.objects.create_user(username="other", email="other@example.com", is_staff=True)
+        self.other_client = self.client_for(self.other_admin)
+
+    def test_another_admins_exam_is_not_found(self):
+        for url in (f"/api/admin/exams/{self.exam.id}/", f"/api/admin/exams/{self.exam.id}/questions/"):
+            response = self.other_client.get(url)
+            self.assertEqual(response.status_code, 404, url)
+            self.assertEqual(response.data["detail"], "Exam not found.")
+
+        self.assertEqual(self.admin_client.get(f"/api/admin/exams/{self.exam.id}/").status_code, 200)
+
+    def test_owner_is_read_from_cached_meta(self):
+        self.admin_client.get(f"/api/admin/exams/{self.exam.id}/questions/")
+        # a queryset update bypasses Exam.save, so the cached owner stays in place
+        Exam.objects.filter(pk=self.exam.pk).update(created_by=self.other_admin)
+
+        self.assertEqual(self.other_client.get(f"/api/admin/exams/{self.exam.id}/questions/").status_code, 404)
+
+        self.exam.forget_meta()
+        self.assertEqual(self.other_client.get(f"/api/admin/exams/{self.exam.id}/questions/").status_code, 200)
+
+
+class ExamWindowTests(ExamTestCase):
+
+    def move_window(self, start, end):
+        now = timezone.now()
+        self.exam.start_at, self.exam.end_at = now + start, now + end
+        self.exam.save()
+
+    def test_start_outside_the_window_is_a_bad_request(self):
+        self.move_window(timedelta(hours=1), timedelta(hours=2))
+
+        response = self.student_client.post(f"/api/user/exams/{self.exam.id}/start/")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"non_field_errors": ["Exam not yet available."]})
+        self.assertFalse(Submission.objects.exists())
+
+    def test_submit_after_the_end_is_a_bad_request(self):
+        self.student_client.post(f"/api/user/exams/{self.exam.id}/start/?include_questions=false")
+        self.move_window(timedelta(hours=-2), timedelta(minutes=-1))
+
+        with mock.patch("acad_core.task.grade_submission_async") as grade:
+            response = self.student_client.post(f"/api/user/exams/{self.exam.id}/submit/", {"answers": []}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"non_field_errors": ["Exam has ended."]})
+        grade.assert_not_called()
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from ..models import Answer, Submission
+from ..services.mcq import choice_mask
+from .base import ExamTestCase
+
+
+class ChoiceDiffTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.question,) = self.upload([self.mcq("m")])
+        self.a, self.b, self.c = self.question.choices.order_by("ordinal")
+        # b's bit is still set in a saved answer
+        submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.GRADED)
+        Answer.objects.create(submission=submission, question=self.question, selected_choice=self.b, selected_mask=2)
+
+    def choices(self):
+        return list(self.question.choices.order_by("ordinal").values_list("id", "ordinal", "text", "is_correct"))
+
+    def test_bulk_patch_keeps_ids_and_skips_referenced_ordinals(self):
+        response = self.admin_client.patch(f"/api/admin/exams/{self.exam.id}/questions/", {"questions": [
+            {"id": self.question.id, "choices": [{"id": self.a.id, "text": "a!"}, {"text": "d", "is_correct": True}]},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 200, response.data)
+        (d,) = self.question.choices.filter(text="d")
+        # ordinal 1 is still selected in an answer; 2 is not and is taken again
+        self.assertEqual(self.choices(), [(self.a.id, 0, "a!", True), (d.id, 2, "d", True)])
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.correct_mask, choice_mask([0, 2]))
+
+    def test_put_diffs_choices_by_id(self):
+        response = self.admin_client.put(f"/api/admin/exams/{self.exam.id}/questions/{self.question.id}/", {
+            "text": "m", "type": "MCQ",
+            "choices": [{"id": self.c.id, "text": "c"}, {"id": self.b.id, "text": "b2", "is_correct": True}, {"text": "d"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 200, response.data)
+        (d,) = self.question.choices.filter(text="d")
+        self.assertEqual(self.choices(), [(d.id, 0, "d", False), (self.b.id, 1, "b2", True), (self.c.id, 2, "c", False)])
+
+    def test_foreign_choice_ids_are_rejected(self):
+        (other,) = self.upload([self.mcq("other")])[1:]
+
+        response = self.admin_client.put(f"/api/admin/exams/{self.exam.id}/questions/{self.question.id}/", {
+            "text": "m", "type": "MCQ", "choices": [{"id": other.choices.first().id, "is_correct": True}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.choices()), 3)
+
+    def test_put_regrades_only_when_scoring_changes(self):
+        url = f"/api/admin/exams/{self.exam.id}/questions/{self.question.id}/"
+        choices = [{"id": c.id, "text": c.text, "is_correct": c.is_correct} for c in (self.a, self.b, self.c)]
+
+        with mock.patch("acad_core.views.regrade_question_async") as regrade, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.admin_client.put(url, {"text": "m (reworded)", "type": "MCQ", "choices": choices}, format="json")
+            regrade.assert_not_called()
+            choices[1]["is_correct"] = True
+            self.admin_client.put(url, {"text": "m (reworded)", "type": "MCQ", "choices": choices}, format="json")
+
+        regrade.assert_called_once_with(self.question.id)
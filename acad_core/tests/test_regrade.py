@@ -0,0 +1,106 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from ..models import Answer, Question, Submission
+from ..services import grade_submissions
+from ..services.mcq import choice_mask
+from ..services.regrade import regrade_question
+from .base import ExamTestCase, User
+
+
+class RegradeTests(ExamTestCase):
+
+    def test_delta_regrade_matches_full_regrade(self):
+        questions = self.upload([
+            self.mcq("m0"), self.mcq("m1"),
+            {"type": "SHORT", "text": "s0", "reference_answer": "cell division", "max_score": 3},
+        ])
+        short = questions[-1]
+        words = ["cell", "division", "nucleus", "mitosis", "chromosome", "identical"]
+        submissions = []
+        for i in range(6):
+            student = User.objects.create_user(username=f"r{i}", email=f"r{i}@example.com")
+            submission = Submission.objects.create(student=student, exam=self.exam, status=Submission.Status.SUBMITTED)
+            for question in questions[:2]:
+                choice = question.choices.get(ordinal=i % 3)
+                Answer.objects.create(submission=submission, question=question, selected_choice=choice,
+                                      selected_mask=choice_mask([choice.ordinal]))
+            Answer.objects.create(submission=submission, question=short, answer_text=" ".join(words[i:i + 3]))
+            submissions.append(submission.id)
+        grade_submissions(submissions)
+        Question.objects.filter(pk=short.id).update(reference_answer="nucleus mitosis chromosome", max_score=5)
+
+        changed = regrade_question(short.id, submissions)
+        patched = self.scores(submissions)
+        self.assertEqual(regrade_question(short.id, submissions), 0)
+        grade_submissions(submissions)
+
+        self.assertGreater(changed, 0)
+        self.assertEqual(patched, self.scores(submissions))
+
+    def scores(self, submission_ids):
+        return {
+            submission.id: (
+                round(float(submission.score), 2),
+                float(submission.grading_details["total_marks"]),
+                sorted((e["question_id"], e["score"], e["feedback"]) for e in submission.grading_details["per_question"]),
+            )
+            for submission in Submission.objects.filter(pk__in=submission_ids)
+        }
+
+
+class RegradeCommandTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.question,) = self.upload([{"type": "SHORT", "text": "s0", "reference_answer": "cell division"}])
+        self.submissions = []
+        for i in range(5):
+            student = User.objects.create_user(username=f"c{i}", email=f"c{i}@example.com")
+            submission = Submission.objects.create(student=student, exam=self.exam, status=Submission.Status.SUBMITTED)
+            Answer.objects.create(submission=submission, question=self.question, answer_text="nucleus")
+            self.submissions.append(submission.id)
+        grade_submissions(self.submissions)
+        Question.objects.filter(pk=self.question.id).update(reference_answer="nucleus")
+        self.checkpoints = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoints)
+
+    def regrade(self):
+        out = StringIO()
+        with override_settings(REGRADE_CHECKPOINT_DIR=self.checkpoints):
+            call_command("regrade", exam=self.exam.id, workers=1, batch_size=2, stdout=out)
+        return out.getvalue()
+
+    def scores(self):
+        return dict(Submission.objects.values_list("id", "score"))
+
+    def test_regrades_every_chunk_and_removes_the_checkpoint(self):
+        out = self.regrade()
+
+        self.assertIn("in 3 chunk(s)", out)
+        self.assertIn("5 answer score(s) changed", out)
+        self.assertEqual(set(self.scores().values()), {1})
+        self.assertEqual(list(Path(self.checkpoints).iterdir()), [])
+
+    def test_resumes_from_a_checkpoint(self):
+        # an interrupted run that finished the first chunk
+        self.regrade()
+        Question.objects.filter(pk=self.question.id).update(reference_answer="mitosis")
+        question = Question.objects.get(pk=self.question.id)
+        with override_settings(REGRADE_CHECKPOINT_DIR=self.checkpoints):
+            from ..management.commands.regrade import Command
+            checkpoint = Command()._checkpoint_path(self.exam, [question])
+        checkpoint.write_text(json.dumps({"done": [self.submissions[:2]]}))
+
+        out = self.regrade()
+
+        self.assertIn("1 chunk(s) already regraded", out)
+        self.assertIn("3 answer score(s) changed", out)
+        scores = self.scores()
+        self.assertEqual([scores[pk] for pk in self.submissions], [1, 1, 0, 0, 0])
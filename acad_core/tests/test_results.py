@@ -0,0 +1,37 @@
+from ..models import Answer, Submission
+from ..services import grade_submissions
+from .base import ExamTestCase
+
+
+class CompactGradingDetailsTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mcq, self.short = self.upload([
+            self.mcq(), {"type": "SHORT", "text": "mitosis", "reference_answer": "cell division", "max_score": 2},
+        ])
+        self.submission = Submission.objects.create(student=self.student, exam=self.exam, status=Submission.Status.SUBMITTED)
+        right = self.mcq.choices.get(is_correct=True)
+        Answer.objects.create(submission=self.submission, question=self.mcq, selected_choice=right, selected_mask=1 << right.ordinal)
+        Answer.objects.create(submission=self.submission, question=self.short, answer_text="cell division")
+
+    def results(self):
+        response = self.student_client.get(f"/api/user/exams/{self.exam.id}/results/")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_compact_mode_serves_the_same_results(self):
+        with self.settings(GRADING_DETAILS_MODE="full"):
+            grade_submissions([self.submission.id])
+        full = self.results()
+
+        with self.settings(GRADING_DETAILS_MODE="compact"):
+            grade_submissions([self.submission.id])
+        self.submission.refresh_from_db()
+        self.assertNotIn("per_question", self.submission.grading_details)
+        self.assertEqual(self.submission.grading_details["answered"], 2)
+        compact = self.results()
+
+        self.assertEqual(compact["user_score"], full["user_score"])
+        self.assertEqual(compact["total_marks"], full["total_marks"])
+        self.assertEqual(compact["grading_details"]["per_question"], full["grading_details"]["per_question"])
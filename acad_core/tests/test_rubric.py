@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from ..services.rubric import compile_rubric
+
+
+class RubricTests(TestCase):
+
+    def test_overlapping_patterns_all_match(self):
+        rubric = compile_rubric({"patterns": ["photo", "photosynthesis"]})
+
+        self.assertEqual(rubric.match("Photosynthesis"), {0, 1})
+
+    def test_backreferences_keep_their_group_numbers(self):
+        rubric = compile_rubric({"patterns": [r"(\w+) and \1", r"(\d) \1"]})
+
+        self.assertEqual(rubric.match("light and light"), {0})
+        self.assertEqual(rubric.match("7 7"), {1})
+
+    def test_invalid_patterns_are_rejected(self):
+        for patterns in (["x(?i)"], ["(unclosed"], [""]):
+            with self.subTest(patterns=patterns), self.assertRaises(ValueError):
+                compile_rubric({"patterns": patterns})
+
+    def test_keywords_phrases_and_required_cap(self):
+        rubric = compile_rubric({
+            "keywords": ["chlorophyll", {"term": "light energy", "synonyms": ["sunlight"], "weight": 2, "required": True}],
+            "missing_required_cap": 0.25,
+        })
+
+        self.assertEqual(rubric.score("Chlorophyll absorbs SUNLIGHT.", 3)[0], 3.0)
+        self.assertEqual(rubric.score("light, energy and chlorophyll", 3)[0], 3.0)
+        # 1/3 of the weight, capped by the missing required keyword
+        self.assertEqual(rubric.score("chlorophyll energy light", 4)[0], 1.0)
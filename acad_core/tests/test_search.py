@@ -0,0 +1,52 @@
+from unittest import skipUnless
+
+from django.db import connection
+
+from ..models import Exam
+from .base import ExamTestCase, User
+
+
+class QuestionBankSearchTests(ExamTestCase):
+
+    url = "/api/admin/exams/question-bank/"
+
+    def test_query_is_required(self):
+        response = self.admin_client.get(self.url, {"q": "  "})
+
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(connection.vendor == "postgresql", "search_vector is maintained by a PostgreSQL trigger")
+    def test_ranks_text_above_reference_answer_and_scopes_to_owner(self):
+        in_answer, in_text, _ = self.upload([
+            {"type": "SHORT", "text": "What do plants need?", "reference_answer": "chlorophyll and light"},
+            {"type": "SHORT", "text": "Where is chlorophyll found?", "reference_answer": "chloroplasts"},
+            {"type": "ESSAY", "text": "Describe mitosis", "reference_answer": "cell division"},
+        ])
+        other_admin = User.objects.create_user(username="other", email="other@example.com", is_staff=True)
+        other = Exam.objects.create(title="Botany", course="BIO102", created_by=other_admin)
+        other.questions.create(type="SHORT", text="chlorophyll colour", reference_answer="green")
+
+        response = self.admin_client.get(self.url, {"q": "chlorophyll"})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([q["id"] for q in response.data], [in_text.id, in_answer.id])
+        self.assertEqual(
+            self.admin_client.get(self.url, {"q": "chlorophyll", "type": "essay"}).data, []
+        )
+
+    @skipUnless(connection.vendor != "postgresql", "PostgreSQL uses the full-text search")
+    def test_substring_fallback_off_postgresql(self):
+        in_answer, in_text, _ = self.upload([
+            {"type": "SHORT", "text": "What do plants need?", "reference_answer": "Chlorophyll and light"},
+            {"type": "SHORT", "text": "Where is chlorophyll found?", "reference_answer": "chloroplasts"},
+            {"type": "ESSAY", "text": "Describe mitosis", "reference_answer": "cell division"},
+        ])
+        other_admin = User.objects.create_user(username="other", email="other@example.com", is_staff=True)
+        other = Exam.objects.create(title="Botany", course="BIO102", created_by=other_admin)
+        other.questions.create(type="SHORT", text="chlorophyll colour", reference_answer="green")
+
+        response = self.admin_client.get(self.url, {"q": "chlorophyll"})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([q["id"] for q in response.data], [in_text.id, in_answer.id])
+        self.assertEqual(self.admin_client.get(self.url, {"q": "chlorophyll", "type": "essay"}).data, [])
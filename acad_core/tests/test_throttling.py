@@ -0,0 +1,95 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ..throttling import ExamActionThrottle, SlidingWindowThrottle
+from ..views import ExamViewSet, LoginAPIView
+from .base import TEST_CACHES
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SlidingWindowThrottleTests(TestCase):
+
+    def setUp(self):
+        caches["throttle"].clear()
+        self.factory = APIRequestFactory()
+
+    def exam_view(self, pk=1):
+        view = ExamViewSet()
+        view.action, view.kwargs = "submit", {"pk": pk}
+        return view
+
+    def throttle(self, rate, now):
+        throttle = SlidingWindowThrottle()
+        throttle.get_rate = lambda: rate
+        throttle.timer = lambda: now
+        return throttle
+
+    def test_token_header_variants_share_a_key(self):
+        throttle = ExamActionThrottle()
+        throttle.scope = "exam_submit"
+        keys = {
+            throttle.get_cache_key(self.factory.post("/", HTTP_AUTHORIZATION=header), self.exam_view())
+            for header in ("Bearer abc", "bearer  abc", "BEARER abc ")
+        }
+
+        self.assertEqual(len(keys), 1)
+        self.assertNotEqual(
+            keys, {throttle.get_cache_key(self.factory.post("/", HTTP_AUTHORIZATION="Bearer abd"), self.exam_view())}
+        )
+        self.assertNotEqual(
+            keys, {throttle.get_cache_key(self.factory.post("/", HTTP_AUTHORIZATION="Bearer abc"), self.exam_view(2))}
+        )
+
+    def test_views_without_authentication_key_by_ip(self):
+        throttle = SlidingWindowThrottle()
+        throttle.scope = "auth_login"
+        keys = {
+            throttle.get_cache_key(self.factory.post("/", HTTP_AUTHORIZATION=f"Bearer junk{i}"), LoginAPIView())
+            for i in range(3)
+        }
+
+        self.assertEqual(len(keys), 1)
+
+    def test_login_limit_ignores_rotating_headers(self):
+        client = APIClient()
+        codes = [
+            client.post("/api/auth/login/", {"email": "x@example.com", "password": "x"}, format="json",
+                        HTTP_AUTHORIZATION=f"Bearer junk{i}").status_code
+            for i in range(21)
+        ]
+
+        self.assertNotIn(429, codes[:20])
+        self.assertEqual(codes[20], 429)
+
+    def test_previous_window_counts_by_its_overlap(self):
+        request, view = self.factory.get("/"), LoginAPIView()
+        start = 60 * 1000
+        for _ in range(4):
+            self.assertTrue(self.throttle("4/min", start).allow_request(request, view))
+        denied = self.throttle("4/min", start + 30)
+        self.assertFalse(denied.allow_request(request, view))
+        self.assertEqual(denied.wait(), 30)
+
+        # halfway through the next window, half of the previous window's 4 still count
+        halfway = start + 90
+        self.assertTrue(self.throttle("4/min", halfway).allow_request(request, view))
+        self.assertTrue(self.throttle("4/min", halfway).allow_request(request, view))
+        self.assertFalse(self.throttle("4/min", halfway).allow_request(request, view))
+        self.assertTrue(self.throttle("4/min", start + 180).allow_request(request, view))
+
+
+@override_settings(CACHES={
+    "default": TEST_CACHES["default"],
+    "throttle": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "acad_throttle_cache"},
+})
+class DatabaseThrottleCacheTests(TestCase):
+
+    def test_default_database_cache_counts_requests(self):
+        caches["throttle"].clear()
+        request, view = APIRequestFactory().get("/"), LoginAPIView()
+        throttle = SlidingWindowThrottle()
+        throttle.get_rate = lambda: "3/min"
+        throttle.timer = lambda: 60 * 1000
+
+        self.assertEqual([throttle.allow_request(request, view) for _ in range(4)], [True, True, True, False])
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import Exam
+from ..services.snapshot import get_exam_lookup, snapshot_key
+from ..services.warmup import exams_to_warm, warm_upcoming_exams
+from .base import ExamTestCase
+
+
+class WarmExamsTests(ExamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.upload([{"type": "SHORT", "text": "q", "reference_answer": "cell division"}])
+        self.upcoming = Exam.objects.create(
+            title="Chemistry", course="CHM101", created_by=self.admin,
+            start_at=now + timedelta(minutes=10), end_at=now + timedelta(hours=2),
+        )
+        Exam.objects.create(
+            title="Physics", course="PHY101", created_by=self.admin,
+            start_at=now + timedelta(hours=3), end_at=now + timedelta(hours=4),
+        )
+
+    def test_warms_open_and_upcoming_exams_once(self):
+        self.assertEqual({e.id for e in exams_to_warm(15)}, {self.exam.id, self.upcoming.id})
+
+        self.assertEqual(warm_upcoming_exams(15), {self.exam.id: 1, self.upcoming.id: 0})
+
+        self.exam.refresh_from_db()  # the upload bumped its version
+        self.assertIsNotNone(cache.get(snapshot_key(self.exam.id, self.exam.version, "student")))
+        self.assertEqual(list(get_exam_lookup(self.exam.id, self.exam.version)["questions"]),
+                         list(self.exam.questions.values_list("id", flat=True)))
+        # a second pass finds everything warm
+        self.assertEqual(exams_to_warm(15), [])
+
+    def test_edited_exam_is_warmed_again(self):
+        warm_upcoming_exams(15)
+
+        self.exam.title = "Biology (revised)"
+        self.exam.save()
+
+        self.assertEqual([e.id for e in exams_to_warm(15)], [self.exam.id])
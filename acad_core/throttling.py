@@ -0,0 +1,136 @@
+import hashlib
+
+from django.core.cache import caches
+from rest_framework.authentication import get_authorization_header
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Scoped rate limit kept in the shared "throttle" cache, using a sliding-window counter.
+
+    DRF's throttles store every request timestamp of a client in one cache entry
+    and rewrite that list on each request. Here a client has one integer counter per
+    fixed window; the rate over the last `duration` seconds is estimated from the
+    current window plus the previous one, weighted by how much of it still overlaps.
+    A check is one get_many, plus one add (or incr) when the request is accepted.
+
+    With Redis, add and incr are atomic (SET NX, INCRBY), so every accepted request
+    is counted. The database cache's add is atomic through the key's primary key, but
+    its incr is a read followed by a write: concurrent requests of one client can lose
+    increments and get a few requests past the limit.
+
+    Clients are identified by a hash of their token key, so the check never loads the
+    user and can run before authentication. Views without authentication classes, and
+    requests without a well-formed token header, are identified by IP.
+    The scope comes from the view's `throttle_scope`, as with ScopedRateThrottle.
+    """
+
+    cache_alias = "throttle"
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        # scope and rate are resolved per request, from the view
+        pass
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_scope(self, view):
+        return getattr(view, "throttle_scope", None)
+
+    def get_client_ident(self, request, view):
+        """
+        The header is split as TokenAuthentication splits it, so variants of the same
+        token (keyword case, extra whitespace) share a counter. A view that doesn't
+        authenticate never reads the header, so any value would make a fresh client.
+        """
+        keywords = {
+            auth_class.keyword.lower().encode()
+            for auth_class in getattr(view, "authentication_classes", ())
+            if getattr(auth_class, "keyword", None)
+        }
+        if keywords:
+            auth = get_authorization_header(request).split()
+            if len(auth) == 2 and auth[0].lower() in keywords:
+                return hashlib.sha256(auth[1]).hexdigest()[:32]
+        return self.get_ident(request)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_client_ident(request, view)}
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.num_requests is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        current_key, previous_key = f"{key}:{window}", f"{key}:{window - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        current, previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+        elapsed = now - window * self.duration
+
+        if previous * (1 - elapsed / self.duration) + current >= self.num_requests:
+            self.wait_seconds = self._wait(previous, current, elapsed)
+            return False
+
+        # counters live for two windows: the current one, then as the previous one
+        if not self.cache.add(current_key, 1, timeout=self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # expired between add() and incr()
+                self.cache.set(current_key, 1, timeout=self.duration * 2)
+        return True
+
+    def _wait(self, previous, current, elapsed):
+        """ Seconds until the estimate drops below the limit, assuming no further requests. """
+        duration, limit = self.duration, self.num_requests
+        if current < limit and previous:
+            # the previous window's share decays within the current window
+            return max(duration * (1 - (limit - current) / previous) - elapsed, 0)
+        # wait for the next window, then for this window's share to decay
+        return (duration - elapsed) + duration * max(1 - limit / current, 0)
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class ExamActionThrottle(SlidingWindowThrottle):
+    """
+    Per client and per exam. The scope is picked by viewset action from
+    `view.action_throttle_scopes`; actions not listed there are not throttled.
+    """
+
+    def get_scope(self, view):
+        return getattr(view, "action_throttle_scopes", {}).get(getattr(view, "action", None))
+
+    def get_cache_key(self, request, view):
+        return f"{super().get_cache_key(request, view)}:exam:{view.kwargs.get('pk')}"
+
+
+class EarlyThrottleMixin:
+    """
+    Checks `early_throttle_classes` before authentication, permissions and the
+    regular throttles, so a rejected request costs no query beyond the throttle
+    cache's own (none with Redis). Early throttles must not touch request.user.
+    """
+
+    early_throttle_classes = ()
+
+    def initial(self, request, *args, **kwargs):
+        for throttle_class in self.early_throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+        super().initial(request, *args, **kwargs)
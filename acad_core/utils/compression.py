@@ -0,0 +1,46 @@
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip only
+    brotli = None
+
+
+def available_encodings():
+    """ Content-encodings this server can produce, most preferred first. """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding):
+    """ Pick the best encoding the client accepts (q=0 means refused), or None. """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5))
+    # mtime=0 keeps the output deterministic, so equal bodies compress identically
+    return gzip.compress(body, compresslevel=getattr(settings, "COMPRESSION_GZIP_LEVEL", 6), mtime=0)
+
+
+def precompress(body):
+    """ Every available encoding of `body`, for responses served from a cache. """
+    if len(body) < getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+        return {}
+    return {encoding: compress(body, encoding) for encoding in available_encodings()}
@@ -0,0 +1,30 @@
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag("-".join(str(p) for p in parts))
+
+
+def not_modified_response(request, etag):
+    """
+    304 response when the request's If-None-Match matches `etag`, otherwise None.
+    Lets a view answer polling clients from a cheap version lookup before
+    loading or serializing anything.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return None
+    etags = parse_etags(header)
+    # weak comparison, as required for If-None-Match
+    if "*" in etags or etag.removeprefix("W/") in [e.removeprefix("W/") for e in etags]:
+        return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return None
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    # clients may keep the body but must revalidate before reusing it
+    response["Cache-Control"] = "private, no-cache"
+    return response
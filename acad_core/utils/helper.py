@@ -1,2 +1,14 @@
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+
+
 def normalize_text(text: str) -> str:
     return " ".join(text.lower().split())
+
+
+def users_by_email(email: str):
+    """
+    Case-insensitive email lookup that can use the LOWER(email) index
+    (migration 0008); email__iexact compiles to UPPER(...) on Postgres and cannot.
+    """
+    return get_user_model().objects.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
@@ -1,6 +1,63 @@
 from rest_framework import permissions
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
 from django.utils import timezone
 
+
+def exam_meta(request, view):
+    """
+    Cached owner and availability window of the exam in the URL (view.kwargs["pk"]),
+    or None on list routes. Read once per request, whatever the number of checks.
+    Raises NotFound when the exam does not exist.
+    """
+    from ..services.snapshot import get_exam_meta
+
+    pk = view.kwargs.get("pk")
+    if pk is None:
+        return None
+    if getattr(request, "_exam_meta_pk", None) != pk:
+        request._exam_meta = get_exam_meta(pk)
+        request._exam_meta_pk = pk
+    if request._exam_meta is None:
+        raise NotFound("Exam not found.")
+    return request._exam_meta
+
+
+def check_exam_window(start_at, end_at):
+    """
+    Raises a 400 outside an exam's availability window, shaped like the submit
+    serializer's validation errors whether it is raised there or by CanSubmitExam.
+    """
+    now = timezone.now()
+    if start_at and start_at > now:
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Exam not yet available."]})
+    if end_at and end_at < now:
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Exam has ended."]})
+
+
+class IsExamOwner(permissions.BasePermission):
+    """
+    Only the admin who created an exam may manage it, its questions and submissions.
+    Checked from cached exam metadata before the view runs, and again on any object
+    the view loads (an Exam, or anything with an `exam`) at no query cost.
+    Another admin's exam is a 404, as if it did not exist.
+    """
+
+    def has_permission(self, request, view):
+        meta = exam_meta(request, view)
+        # list and create routes are scoped by the view's queryset
+        if meta is not None and meta["created_by_id"] != request.user.id:
+            raise NotFound("Exam not found.")
+        return True
+
+    def has_object_permission(self, request, view, obj):
+        from ..models import Exam
+        exam = obj if isinstance(obj, Exam) else obj.exam
+        if exam.created_by_id != request.user.id:
+            raise NotFound("Exam not found.")
+        return True
+
+
 class IsOwnerOfSubmission(permissions.BasePermission):
     """
     Only allow owners of a Submission to view it (or staff).
@@ -17,15 +74,22 @@ class IsOwnerOfSubmission(permissions.BasePermission):
 
 class CanSubmitExam(permissions.BasePermission):
     """
-    Allow a student to submit an exam if:
+    Allow a student to start, autosave or submit an exam if:
     - they are authenticated
-    - exam is currently available (start/end check)
-    - they don't already have a submission to forbids duplicates
+    - exam is currently available (start/end check, from cached exam metadata)
+    Duplicate submissions are refused by the serializers, with the lookup they make anyway.
+    The cached window may lag an edit by up to EXAM_META_TTL in other processes, so start,
+    autosave and submit check it again on the exam row they load.
     """
 
     def has_permission(self, request, view):
-        # Allow POST (create) if authenticated
-        return request.user and request.user.is_authenticated
+        if not (request.user and request.user.is_authenticated):
+            return False
+        meta = exam_meta(request, view)
+        if meta is not None:
+            check_exam_window(meta["start_at"], meta["end_at"])
+        return True
 
     def has_object_permission(self, request, view, obj):
-        return True
\ No newline at end of file
+        # obj is the student's Submission
+        return obj.student_id == request.user.id
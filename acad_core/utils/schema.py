@@ -0,0 +1,25 @@
+_pending = []
+
+
+def extend_schema(**kwargs):
+    """
+    Deferred drf_spectacular.utils.extend_schema.
+
+    The real decorator resolves the schema class while the view module is being
+    imported, which loads the whole OpenAPI generator (and django.test with it) in
+    every worker. This one only records the annotation; `apply_schema_annotations`
+    replays them when a schema is actually generated.
+    """
+    def decorator(view):
+        _pending.append((view, kwargs))
+        return view
+    return decorator
+
+
+def apply_schema_annotations():
+    from drf_spectacular.utils import extend_schema as spectacular_extend_schema
+
+    # replayed in registration order: methods before their class, like regular decorators
+    while _pending:
+        view, kwargs = _pending.pop(0)
+        spectacular_extend_schema(**kwargs)(view)
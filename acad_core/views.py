@@ -1,41 +1,53 @@
-import asyncio
+import logging
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.generics import GenericAPIView
 from rest_framework.viewsets import ViewSet
-from django.db.models.functions import Upper, Replace
 from rest_framework.response import Response
-from django.db.models import Value
+from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.core.exceptions import ValidationError
-from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, Http404
 from django.utils.html import escape
 from rest_framework.permissions import IsAuthenticated
-from .models import Exam, Submission, EmailVerification, Question, Choice, Answer
+from .models import Exam, Submission, EmailVerification, Question
+from .authenticator import get_or_rotate_token, token_expires_at
+from .services.clone import clone_questions
+from .services.papers import draw_paper, page_exam_questions
+from .services.regrade import grading_fingerprint, regrade_question_async, regrade_questions_async
+from .services.snapshot import get_exam_details, get_exam_lookup, get_exam_questions, get_exam_snapshot
+from .utils.etag import make_etag, not_modified_response, with_etag
+from .utils.helper import users_by_email
+from .utils.permissions import CanSubmitExam, IsExamOwner, IsOwnerOfSubmission, check_exam_window
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from rest_framework.throttling import ScopedRateThrottle
+from .throttling import EarlyThrottleMixin, ExamActionThrottle, SlidingWindowThrottle
 from django.conf import settings
 from .serializers import (
     SubmissionCreateSerializer, 
+    AutosaveSerializer,
     RegisterSerializer,
     ExamCreateSerializer,
     BulkQuestionCreateSerializer,
+    QuestionBulkUpdateSerializer,
     QuestionSerializer,
-    ExamDetailsSerializer,
+    QuestionBankSerializer,
     ExamListSerializer,
     LoginSerializer,
     LoginResponseSerializer,
 )
-from drf_spectacular.utils import extend_schema
-from threading import Thread
+from .utils.schema import extend_schema
 
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 
@@ -49,7 +61,7 @@ class RegisterAPIView(GenericAPIView):
     serializer_class = RegisterSerializer
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowThrottle]
     throttle_scope = "auth_register"
 
     @extend_schema(
@@ -99,7 +111,7 @@ class VerifyEmailAPIView(APIView):
     """
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowThrottle]
     throttle_scope = "auth_verify"
 
     def get(self, request, *args, **kwargs):
@@ -200,13 +212,14 @@ class LoginAPIView(GenericAPIView):
     Login API view.
 
     Login using email and password.
-    Returns a Bearer token that expires after 24 hours.
+    Returns a Bearer token that expires after 24 hours;
+    logging in again returns the same token while it is still fresh.
     """
 
     serializer_class = LoginSerializer
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowThrottle]
     throttle_scope = "auth_login"
 
     @extend_schema(
@@ -226,13 +239,14 @@ class LoginAPIView(GenericAPIView):
         password = serializer.validated_data["password"]
 
         try:
-            user = User.objects.get(email__iexact=email)
+            user = users_by_email(email).get()
         except User.DoesNotExist:
             return Response(
                 {"detail": "Invalid credentials"},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
+        # rehashes the password if PASSWORD_HASH_ITERATIONS changed since it was stored
         if not user.check_password(password):
             return Response(
                 {"detail": "Invalid credentials"},
@@ -245,14 +259,15 @@ class LoginAPIView(GenericAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Rotate token
-        Token.objects.filter(user=user).delete()
-        token = Token.objects.create(user=user)
+        # Reuse the current token unless it is about to expire
+        token = get_or_rotate_token(user)
+        expires_at = token_expires_at(token)
 
         return Response(
             {
                 "token": token.key,
-                "expires_in_hours": getattr(settings, "TOKEN_EXPIRE_HOURS", 24),
+                "expires_in_hours": round((expires_at - timezone.now()).total_seconds() / 3600),
+                "expires_at": expires_at,
             },
             status=status.HTTP_200_OK,
         )
@@ -274,16 +289,21 @@ class AdminExamViewSet(viewsets.ModelViewSet):
     They can also bulk upload questions to an exam and manage individual questions.
     """
     serializer_class = ExamCreateSerializer
-    permission_classes = [permissions.IsAdminUser]
+    # ownership of the exam in the URL is checked from cached exam metadata, see utils.permissions
+    permission_classes = [permissions.IsAdminUser, IsExamOwner]
 
     def get_serializer_class(self):
         if self.action == "bulk_upload_questions":
             return BulkQuestionCreateSerializer
+        if self.action == "bulk_update_questions":
+            return QuestionBulkUpdateSerializer
         if self.action in [
             "list_questions",
             "question_detail"
         ]:
             return QuestionSerializer
+        if self.action == "search_question_bank":
+            return QuestionBankSerializer
         
         return self.serializer_class
 
@@ -303,6 +323,10 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         except IntegrityError:
             raise ValidationError({"detail": "This exam already exists."})
 
+    def perform_update(self, serializer):
+        # Exam.save() bumps the version
+        serializer.save()
+
 
 
     @action(
@@ -324,6 +348,7 @@ class AdminExamViewSet(viewsets.ModelViewSet):
             "reference_answer": "", # Not required for MCQ \n
             "max_score": 1.0, \n
             "metadata": {"difficulty": "easy"}, \n
+            "allow_multiple": false, # true: students pick every correct choice, scored with partial credit \n
             "choices": [ \n
                 {"text": "Option 1", "is_correct": false},\n
                 {"text": "Option 2", "is_correct": true},\n
@@ -331,13 +356,7 @@ class AdminExamViewSet(viewsets.ModelViewSet):
                 {"text": "Option 4", "is_correct": false}\n
             ]} \n
         """
-        exam = get_object_or_404(Exam, id=pk)
-
-        if exam.created_by != request.user:
-            return Response(
-                {"detail": "You do not have permission to modify this exam."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+        exam = self.get_object()
 
         serializer_class = self.get_serializer_class()
 
@@ -347,6 +366,8 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         result = serializer.save()
+        if result.get("created"):
+            exam.bump_version()
 
         return Response(
             {
@@ -358,6 +379,43 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         )
 
 
+    # -----------------------------------
+    # CLONE AN EXAM WITH ITS QUESTIONS
+    # -----------------------------------
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="clone",
+    )
+    @transaction.atomic
+    def clone(self, request, pk=None):
+        """
+        Copy this exam with all its questions and choices, e.g. to run it again next semester. \n
+        The copy keeps the exam's settings; any of them can be overridden in the request data, \n
+        and the title defaults to "<title> (copy)". \n
+        Example request data: \n
+            {"title": "Biology 101 - Spring", "start_at": "2027-02-01T09:00:00Z", "end_at": "2027-02-01T11:00:00Z"} \n
+        """
+        exam = self.get_object()
+
+        data = {**self.get_serializer(exam).data, "title": f"{exam.title} (copy)"}
+        data.pop("id")
+        data.update(request.data)
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        copy = serializer.save(created_by=request.user)
+        questions, choices = clone_questions(exam.id, copy.id)
+
+        return Response(
+            {
+                **serializer.data,
+                "questions_copied": questions,
+                "choices_copied": choices,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
     # -----------------------------------
     # LIST QUESTIONS FOR AN EXAM
     # -----------------------------------
@@ -370,16 +428,168 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         """
         List all questions under this exam. \n 
         """
-        exam = get_object_or_404(Exam, id=pk, created_by=request.user)
+        exam = get_object_or_404(self.get_queryset().only("id", "version"), pk=pk)
+
+        etag = make_etag("exam-questions", exam.id, exam.version)
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
+        # rendered and pre-compressed once per exam version
+        snapshot = get_exam_snapshot(exam.id, exam.version, kind="admin")
+        response = HttpResponse(snapshot["body"], content_type="application/json")
+        response.precompressed = snapshot["encodings"]
+        return with_etag(response, etag)
+
+
+    # -----------------------------------
+    # BULK EDIT / REORDER QUESTIONS
+    # -----------------------------------
+    @list_questions.mapping.patch
+    @transaction.atomic
+    def bulk_update_questions(self, request, pk=None):
+        """
+        Edit many questions of this exam in one request, and/or reorder them. \n
+        Only the fields sent are changed. "choices" is the full list of the question's choices: \n
+        with an id the choice is updated in place, without one it is added, and choices left out are deleted. \n
+        "order" lists every question id of the exam in the new order. \n
+        Example request data: \n
+            { \n
+            "questions": [ \n
+                {"id": 12, "max_score": 2, "choices": [ \n
+                    {"id": 40, "is_correct": true}, \n
+                    {"id": 41, "text": "Reworded option", "is_correct": false}, \n
+                    {"text": "New option", "is_correct": false} \n
+                ]}, \n
+                {"id": 15, "reference_answer": "Photosynthesis"} \n
+            ], \n
+            "order": [15, 12, 13, 14] \n
+            } \n
+        Answers to questions whose scoring changed are regraded in the background.
+        """
+        exam = get_object_or_404(self.get_queryset().only("id", "version"), pk=pk)
 
-        questions = Question.objects.filter(exam=exam).prefetch_related("choices")
         serializer_class = self.get_serializer_class()
-        serializer = serializer_class(questions, many=True)
+        serializer = serializer_class(data=request.data, context={"exam": exam})
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                result = serializer.save()
+        except IntegrityError:
+            return Response(
+                {"detail": "Questions of the same type must have different texts within an exam."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if result["updated"] or result["reordered"]:
+            exam.bump_version()
+        regrade = result.pop("regrade")
+        if regrade:
+            transaction.on_commit(lambda: regrade_questions_async(regrade))
+
+        return Response(
+            {
+                "message": "Questions updated successfully",
+                **result,
+                "regrade_scheduled": regrade,
+            },
+            status=status.HTTP_200_OK,
+        )
     
 
 
+    # -----------------------------------
+    # GRADING QUEUE STATUS
+    # -----------------------------------
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="grading-queue",
+    )
+    def grading_queue(self, request):
+        """
+        Grading backlog of this admin's exams: submissions waiting (depth), \n
+        age of the oldest waiting submission and submissions currently being graded. \n
+        Figures are for the grading dispatcher of the server process answering the request.
+        """
+        from .services.dispatcher import dispatcher
+        stats = dispatcher.stats()
+        owned = set(
+            Exam.objects.filter(created_by=request.user, id__in=stats.keys()).values_list("id", flat=True)
+        )
+        return Response(
+            [
+                {"exam_id": exam_id, **entry}
+                for exam_id, entry in sorted(stats.items())
+                if exam_id in owned
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
+
+    # -----------------------------------
+    # SEARCH QUESTION BANK ACROSS EXAMS
+    # -----------------------------------
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="question-bank",
+    )
+    def search_question_bank(self, request):
+        """
+        Full-text search over the questions of every exam created by this admin. \n
+        Matches question text and reference answer, ranked by relevance. \n
+        Query params: \n
+            q: search terms (required, supports "quoted phrases", OR and -exclusions) \n
+            course: restrict to exams of this course (optional) \n
+            type: MCQ | SHORT | ESSAY (optional) \n
+            limit: max results, default 20, max 100 (optional) \n
+        Off PostgreSQL, q is matched as a plain substring instead. \n
+        """
+        terms = (request.query_params.get("q") or "").strip()
+        if not terms:
+            return Response(
+                {"detail": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 100)
+        except ValueError:
+            limit = 20
+
+        questions = Question.objects.filter(exam__created_by=request.user)
+        if connection.vendor == "postgresql":
+            query = SearchQuery(terms, search_type="websearch", config="english")
+            questions = questions.filter(search_vector=query).annotate(rank=SearchRank(F("search_vector"), query))
+        else:
+            # search_vector is maintained by a PostgreSQL trigger; elsewhere match the
+            # query as a substring, text matches ranked above reference answer ones
+            questions = questions.filter(Q(text__icontains=terms) | Q(reference_answer__icontains=terms)).annotate(
+                rank=Case(When(text__icontains=terms, then=Value(1.0)), default=Value(0.5), output_field=FloatField())
+            )
+
+        course = request.query_params.get("course")
+        if course:
+            questions = questions.filter(exam__course=course)
+        q_type = request.query_params.get("type")
+        if q_type:
+            questions = questions.filter(type=q_type.upper())
+
+        questions = (
+            questions
+            .select_related("exam")
+            .prefetch_related("choices")
+            .order_by("-rank", "id")[:limit]
+        )
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(questions, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+
     @action(
     detail=True,
     methods=["get", "put", "delete"],
@@ -390,8 +600,13 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         """
         Retrieve, update or delete a specific question for an exam.
         """
-        exam = get_object_or_404(Exam, id=pk, created_by=request.user)
-        question = get_object_or_404(Question, id=question_id, exam=exam)
+        questions = Question.objects.select_related("exam")
+        if request.method == "PUT":
+            # concurrent edits of the question queue up, as with the bulk PATCH
+            questions = questions.select_for_update(of=("self",))
+        question = get_object_or_404(questions, id=question_id, exam_id=pk)
+        self.check_object_permissions(request, question)
+        exam = question.exam
         serializer_class = self.get_serializer_class()
 
         # -----------------------
@@ -410,17 +625,21 @@ class AdminExamViewSet(viewsets.ModelViewSet):
                 data=request.data,
             )
             serializer.is_valid(raise_exception=True)
+            before = grading_fingerprint(question)
+            # choices are matched by id: listed ones are kept, the others deleted
             serializer.save()
+            exam.bump_version()
 
-            if question.type == Question.Types.MCQ:
-                Choice.objects.filter(question=question).delete()
-                choices = request.data.get("choices", [])
-                Choice.objects.bulk_create(
-                    [Choice(question=question, **c) for c in choices]
-                )
+            # rescore only this question's answers in already graded submissions
+            regrade = grading_fingerprint(question) != before
+            if regrade:
+                transaction.on_commit(lambda: regrade_question_async(question.id))
 
             return Response(
-                {"message": "Question updated successfully"},
+                {
+                    "message": "Question updated successfully",
+                    "regrade_scheduled": regrade,
+                },
                 status=status.HTTP_200_OK,
             )
 
@@ -429,6 +648,7 @@ class AdminExamViewSet(viewsets.ModelViewSet):
         # -----------------------
         if request.method == "DELETE":
             question.delete()
+            exam.bump_version()
             return Response(
                 {"message": "Question deleted successfully"},
                 status=status.HTTP_204_NO_CONTENT,
@@ -443,17 +663,38 @@ class AdminExamViewSet(viewsets.ModelViewSet):
 ############################### STUDENT VIEWS #######################################
 
 
-class ExamViewSet(ViewSet):
+class ExamViewSet(EarlyThrottleMixin, ViewSet):
     """
     ViewSet for managing Exams. \n
     Students can list available exams and retrieve exam details. \n
     They can also start and submit exams.
     """
     permission_classes = [IsAuthenticated]
+    # polling and retries are limited per student and exam before any auth query
+    early_throttle_classes = [ExamActionThrottle]
+    action_throttle_scopes = {
+        "results": "exam_results",
+        "autosave": "exam_autosave",
+        "submit": "exam_submit",
+    }
+    # checked from cached exam metadata and from the submission the action loads anyway
+    action_permission_classes = {
+        "start": [IsAuthenticated, CanSubmitExam],
+        "autosave": [IsAuthenticated, CanSubmitExam],
+        "submit": [IsAuthenticated, CanSubmitExam],
+        "questions": [IsAuthenticated, IsOwnerOfSubmission],
+        "results": [IsAuthenticated, IsOwnerOfSubmission],
+    }
+
+    def get_permissions(self):
+        classes = self.action_permission_classes.get(self.action, self.permission_classes)
+        return [permission() for permission in classes]
 
     def get_serializer_class(self):
         if self.action == "submit":
             return SubmissionCreateSerializer
+        if self.action == "autosave":
+            return AutosaveSerializer
         return None 
 
     # List all available exams
@@ -485,47 +726,75 @@ class ExamViewSet(ViewSet):
         """
         API view to retrieve details of a specific exam.
         """
-        exam = get_object_or_404(Exam, id=pk)
-
-        serializer = ExamDetailsSerializer(exam)
-        data = serializer.data.copy()
-        data.pop("questions", None)
-
+        version = Exam.objects.filter(id=pk).values_list("version", flat=True).first()
+        if version is None:
+            raise Http404
+        etag = make_etag("exam", pk, version)
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
+        data = dict(get_exam_details(pk, version))
         data.update({
-            "total_questions": exam.questions.count(),
-            "message": f"{exam.course.upper()} exam details retrieved successfully.",
+            "message": f"{data['course'].upper()} exam details retrieved successfully.",
             "developer_note": "Questions are not included, Send POST request to start endpoint to begin the exam."
         })
 
-        return Response(data)
+        return with_etag(Response(data), etag)
     
 
 
     @action(detail=True, methods=["get"], url_path="results", url_name="exam-results")
     def results(self, request, pk=None):
         """
-        Retrieve the authenticated student's result for a given exam.
+        Retrieve the authenticated student's result for a given exam. \n
+        Send the returned ETag back in If-None-Match while polling; an unchanged result answers 304.
         """
-        submission = get_object_or_404(
-            Submission,
-            exam_id=pk,
-            student=request.user
+        # the 304 check reads three columns; the row itself is only loaded for a body
+        state = (
+            Submission.objects
+            .filter(exam_id=pk, student=request.user)
+            .values_list("id", "exam_id", "status", "graded_at")
+            .first()
         )
+        if state is None:
+            raise Http404
+        submission_id, exam_id, submission_status, graded_at = state
+        etag = make_etag(
+            "submission", submission_id, submission_status,
+            graded_at.timestamp() if graded_at else "",
+        )
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
 
         # grading still in progress
-        if submission.status != Submission.Status.GRADED:
-            return Response(
+        if submission_status != Submission.Status.GRADED:
+            return with_etag(Response(
                 {
-                    "submission_id": submission.id,
-                    "exam_id": submission.exam_id,
-                    "status": submission.status,
+                    "submission_id": submission_id,
+                    "exam_id": exam_id,
+                    "status": submission_status,
                     "message": "Grading in progress. Please check back shortly."
                 },
                 status=status.HTTP_202_ACCEPTED
-            )
+            ), etag)
+
+        submission = Submission.objects.get(pk=submission_id)
+        self.check_object_permissions(request, submission)
+        grading_details = submission.grading_details
+        if "per_question" not in grading_details:
+            # compact storage: the breakdown lives on the Answer rows
+            from .services.grader import per_question_breakdown
+            per_question = per_question_breakdown(submission.id)
+            grading_details = {
+                **grading_details,
+                "total_marks": round(sum(q["max_score"] for q in per_question), 2),
+                "per_question": per_question,
+            }
 
         # grading completed
-        return Response(
+        return with_etag(Response(
             {
                 "message": "Grading completed successfully.",
                 "submission_id": submission.id,
@@ -535,12 +804,12 @@ class ExamViewSet(ViewSet):
                 "submitted_at": submission.submitted_at,
                 "graded_at": submission.graded_at,
                 "user_score": submission.score,
-                "total_marks": submission.grading_details.get("total_marks"),
-                "grading_details": submission.grading_details,
+                "total_marks": grading_details.get("total_marks"),
+                "grading_details": grading_details,
                 
             },
             status=status.HTTP_200_OK
-        )
+        ), etag)
 
     
 
@@ -551,42 +820,179 @@ class ExamViewSet(ViewSet):
         API view to start an exam for a student.
 
         """
-        exam = get_object_or_404(
-            Exam.objects.prefetch_related("questions__choices"),
-            id=pk
-        )
-
-        submission, _ = Submission.objects.get_or_create(
-            student=request.user,
-            exam=exam,
-            status=Submission.Status.PENDING,
-            defaults={"started_at": timezone.now()}
-        )
-
-        serializer = ExamDetailsSerializer(exam)
+        # a returning student costs this one query
+        submission = Submission.objects.select_related("exam").filter(student=request.user, exam_id=pk).first()
+        exam = submission.exam if submission is not None else get_object_or_404(Exam, id=pk)
+        # CanSubmitExam checked the cached window; confirm it on the row
+        check_exam_window(exam.start_at, exam.end_at)
+        if submission is None:
+            try:
+                with transaction.atomic():
+                    submission = Submission.objects.create(
+                        student=request.user,
+                        exam=exam,
+                        status=Submission.Status.PENDING,
+                        started_at=timezone.now(),
+                        # drawn from the cached pool index; None when the exam has no pool
+                        question_ids=draw_paper(exam),
+                    )
+            except IntegrityError:
+                # a concurrent start of the same student won
+                submission = Submission.objects.select_related("exam").get(student=request.user, exam_id=pk)
+        self.check_object_permissions(request, submission)
+        if submission.status != Submission.Status.PENDING:
+            return Response(
+                {"detail": "This exam has already been submitted."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        exam = submission.exam
+
+        if request.query_params.get("include_questions", "true").lower() in ("false", "0"):
+            # large exams: fetch the questions page by page from the questions endpoint
+            total = submission.question_ids
+            if total is None:
+                total = get_exam_lookup(exam.id, exam.version)["questions"]
+            return Response({
+                "submission_id": submission.id,
+                "started_at": submission.started_at,
+                "ends_at": submission.exam.end_at,
+                "message": "Exam started. Proceed to answer questions.",
+                "total_questions": len(total),
+                "questions_url": request.build_absolute_uri(
+                    reverse("user-exam-questions", kwargs={"pk": exam.id})
+                ),
+            })
+
+        # questions without answers/correct flags, serialized once per exam version
+        questions = get_exam_snapshot(exam.id, exam.version, kind="student")["questions"]
+        if submission.question_ids is not None:
+            paper = set(submission.question_ids)
+            questions = [q for q in questions if q["id"] in paper]
 
         return Response({
             "submission_id": submission.id,
             "started_at": submission.started_at,
             "ends_at": submission.exam.end_at,
             "message": "Exam started. Proceed to answer questions.",
-            "total_questions": exam.questions.count(),
-            "questions": serializer.data.get("questions", [])
+            "total_questions": len(questions),
+            "questions": questions
         })
 
 
+    @action(detail=True, methods=["get"], url_path="questions", url_name="questions")
+    def questions(self, request, pk=None):
+        """
+        Questions of the student's paper, one page at a time (for very large exams).
+
+        Cursor-based: ?limit= (default 20, max 100) and ?cursor= taken from the previous
+        page's "next" link. A page's ids come from a keyset query (or the student's drawn
+        paper) and its questions from per-question cache entries, so memory per request
+        depends on the page size, not on the size of the exam.
+        """
+        submission = (
+            Submission.objects
+            .select_related("exam")
+            .only("id", "status", "question_ids", "exam__id", "exam__version")
+            .filter(student=request.user, exam_id=pk)
+            .first()
+        )
+        if submission is None or submission.status != Submission.Status.PENDING:
+            return Response(
+                {"detail": "No exam in progress. Start the exam first."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        self.check_object_permissions(request, submission)
+        exam = submission.exam
+
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+            cursor = request.query_params.get("cursor")
+            cursor = int(cursor) if cursor else None
+        except ValueError:
+            return Response({"detail": "Invalid limit or cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"detail": "Invalid limit or cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # question ids in exam order; the cursor is the last id of the previous page
+        question_ids = submission.question_ids
+        if question_ids is None:
+            paged = page_exam_questions(exam.id, cursor, limit)
+            if paged is None:
+                return Response({"detail": "Invalid limit or cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            page, has_more = paged
+            count = Question.objects.filter(exam_id=exam.id).count()
+        else:
+            # a drawn paper: its ids are already on the submission row
+            try:
+                start = question_ids.index(cursor) + 1 if cursor is not None else 0
+            except ValueError:
+                return Response({"detail": "Invalid limit or cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            page = question_ids[start:start + limit]
+            has_more = start + limit < len(question_ids)
+            count = len(question_ids)
+
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", page[-1])
+
+        return Response({
+            "count": count,
+            "next": next_url,
+            "results": get_exam_questions(exam.id, exam.version, page),
+        })
+
+
+    # Autosave answers while the exam is in progress
+    @action(detail=True, methods=["post"], url_path="autosave")
+    def autosave(self, request, pk=None):
+        """
+        API view to save answers while an exam is in progress. \n
+        Send only the answers that changed since the last autosave; the latest value per question wins. \n
+        The exam must have been started (POST start) and not yet submitted. \n
+        Example request data: \n
+            { \n
+            "answers": [ \n
+                { \n
+                    "question_id": 1, \n
+                    "selected_choice_id": 3, # for MCQ type \n
+                    "selected_choice_ids": [3, 5], # instead, for MCQs with allow_multiple \n
+                    "answer_text": "Your answer text here" # for SHORT and ESSAY types \n
+                } \n
+            ] }\n
+        """
+        serializer_class = self.get_serializer_class()
+
+        serializer = serializer_class(
+            data=request.data,
+            context={
+                "request": request,
+                "exam_id": pk
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        submission = serializer.save()
+
+        return Response({
+            "submission_id": submission.id,
+            "saved": len(serializer.validated_data["answers"]),
+            "message": "Answers saved."
+        }, status=status.HTTP_202_ACCEPTED)
+
+
     # Submit exam
     @action(detail=True, methods=["post"], url_path="submit" )
     def submit(self, request, pk=None):
         """
         Api view to submit an exam for grading. \n
         Request data should include answers to the exam questions. \n
+        If the exam was started, answers already sent to autosave are kept and "answers" may be omitted or contain only the remaining ones. \n
         Example request data: \n
             { \n
             "answers": [ \n
                 { \n
                     "question_id": 1, \n
                     "selected_choice_id": 3, # for MCQ type \n
+                    "selected_choice_ids": [3, 5], # instead, for MCQs with allow_multiple (partial credit) \n
                     "answer_text": "Your answer text here" # for SHORT and ESSAY types leave it blank for MCQ \n
                 }, \n
                 ... \n
@@ -604,16 +1010,22 @@ class ExamViewSet(ViewSet):
             }
         )
         serializer.is_valid(raise_exception=True)
+
+        if getattr(settings, "SUBMISSION_INGEST_MODE", "direct") == "log":
+            # write-behind: persisted and graded by the drain_submissions command
+            submission = serializer.enqueue()
+            return Response({
+                "submission_id": submission.id if submission else None,
+                "status": Submission.Status.QUEUED,
+                "message": "Exam submitted. Grading will start shortly."
+            }, status=status.HTTP_202_ACCEPTED)
+
         submission = serializer.save()
-        print("Submission saved, triggering async grading...", submission.id, submission.status)
+        logger.debug("Submission %s saved (%s), triggering async grading", submission.id, submission.status)
 
         # async grading trigger
         from .task import grade_submission_async
-        Thread(
-            target=grade_submission_async,
-            args=(submission.id,),
-            daemon=True
-        ).start()
+        grade_submission_async(submission.id, submission.exam_id)
 
         return Response({
             "submission_id": submission.id,
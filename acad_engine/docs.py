@@ -0,0 +1,8 @@
+from drf_spectacular.views import SpectacularAPIView
+from drf_spectacular.utils import extend_schema
+
+
+class HiddenSchemaView(SpectacularAPIView):
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,11 @@
+from drf_spectacular.generators import SchemaGenerator as BaseSchemaGenerator
+
+from acad_core.utils.schema import apply_schema_annotations
+
+
+class SchemaGenerator(BaseSchemaGenerator):
+    """ Applies the view annotations deferred by acad_core.utils.schema before generating. """
+
+    def get_schema(self, request=None, public=False):
+        apply_schema_annotations()
+        return super().get_schema(request=request, public=public)
@@ -2,21 +2,38 @@ from django.urls import path, include
 from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
-from drf_spectacular.utils import extend_schema
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 
 
-class HiddenSchemaView(SpectacularAPIView):
-    @extend_schema(exclude=True)
-    def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+def lazy_view(view_path, **initkwargs):
+    """
+    Import a class-based view on its first request.
+    Keeps drf_spectacular's views and schema generator out of startup;
+    only the docs endpoints use them.
+    """
+    view = None
 
+    @csrf_exempt
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
 
-urlpatterns = [
-    path('api/schema/', HiddenSchemaView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    return dispatch
 
+
+urlpatterns = []
+
+if settings.API_DOCS_ENABLED:
+    urlpatterns += [
+        path('api/schema/', lazy_view('acad_engine.docs.HiddenSchemaView'), name='schema'),
+        path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
+        path('api/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc'),
+    ]
+
+urlpatterns += [
     path('admin/', admin.site.urls),
     path('api/', include("acad_core.urls")),
 ]